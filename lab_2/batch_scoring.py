@@ -0,0 +1,62 @@
+"""
+Plagiarism scores for many short pairs of sentences at once
+"""
+from lab_2.main import TOKEN_SEQUENCES
+
+
+def find_lcs_length_bit_parallel(first_sentence_tokens: tuple, second_sentence_tokens: tuple) -> int:
+    """
+    Finds a length of the longest common subsequence with the bit-vector algorithm (Hyyrö):
+    a whole row of the lcs matrix is kept as bits of one int and updated by a few arithmetic operations
+    :param first_sentence_tokens: a tuple of tokens
+    :param second_sentence_tokens: a tuple of tokens
+    :return: a length of the longest common subsequence
+    """
+    matches = {}
+    for index, token in enumerate(first_sentence_tokens):
+        matches[token] = matches.get(token, 0) | 1 << index
+    mask = (1 << len(first_sentence_tokens)) - 1
+    row = mask
+    for token in second_sentence_tokens:
+        row_matches = row & matches.get(token, 0)
+        row = ((row + row_matches) | (row - row_matches)) & mask
+    return len(first_sentence_tokens) - bin(row).count('1')
+
+
+def find_lcs_lengths(sentence_pairs: tuple) -> tuple:
+    """
+    Finds lengths of the longest common subsequences for pairs of sentences
+    :param sentence_pairs: a tuple of pairs (original sentence, suspicious sentence)
+    :return: a tuple of lengths, -1 for an incorrect pair
+    """
+    if not isinstance(sentence_pairs, tuple):
+        return ()
+    lcs_lengths = []
+    for pair in sentence_pairs:
+        if not isinstance(pair, tuple) or len(pair) != 2 or \
+                not isinstance(pair[0], TOKEN_SEQUENCES) or not isinstance(pair[1], TOKEN_SEQUENCES):
+            lcs_lengths.append(-1)
+        else:
+            lcs_lengths.append(find_lcs_length_bit_parallel(pair[0], pair[1]))
+    return tuple(lcs_lengths)
+
+
+def calculate_plagiarism_scores(sentence_pairs: tuple, plagiarism_threshold: float = 0.3) -> tuple:
+    """
+    Calculates plagiarism scores for pairs of sentences
+    as find_lcs_length with calculate_plagiarism_score do for each pair
+    :param sentence_pairs: a tuple of pairs (original sentence, suspicious sentence)
+    :param plagiarism_threshold: a threshold
+    :return: a tuple of scores from 0 to 1, -1 for an incorrect pair
+    """
+    if not isinstance(plagiarism_threshold, float) or not 0 <= plagiarism_threshold <= 1:
+        return ()
+    scores = []
+    for pair, lcs_length in zip(sentence_pairs, find_lcs_lengths(sentence_pairs)):
+        if lcs_length == -1:
+            scores.append(-1)
+        elif not pair[1] or lcs_length / len(pair[1]) < plagiarism_threshold:
+            scores.append(0.0)
+        else:
+            scores.append(lcs_length / len(pair[1]))
+    return tuple(scores)
@@ -0,0 +1,50 @@
+"""
+Tests batch plagiarism scoring
+"""
+
+import random
+import unittest
+from lab_2.main import find_lcs_length, calculate_plagiarism_score
+from lab_2.batch_scoring import find_lcs_length_bit_parallel, find_lcs_lengths, calculate_plagiarism_scores
+
+
+class BatchScoringTest(unittest.TestCase):
+    """
+    Checks for find_lcs_length_bit_parallel, find_lcs_lengths and calculate_plagiarism_scores functions
+    """
+
+    def setUp(self):
+        generator = random.Random(35)
+        self.sentence_pairs = tuple((tuple(generator.choice('abcdef') for _ in range(generator.randint(1, 80))),
+                                     tuple(generator.choice('abcdef') for _ in range(generator.randint(1, 80))))
+                                    for _ in range(200))
+
+    def test_find_lcs_length_bit_parallel_ideal(self):
+        """
+        Tests that the bit-vector algorithm finds the same lengths as the lcs matrix
+        """
+        for first, second in self.sentence_pairs:
+            self.assertEqual(find_lcs_length(first, second, 0.0), find_lcs_length_bit_parallel(first, second))
+        self.assertEqual(0, find_lcs_length_bit_parallel((), ('a',)))
+
+    def test_calculate_plagiarism_scores_ideal(self):
+        """
+        Tests that scores of the batch equal scores of pairs
+        """
+        expected = tuple(calculate_plagiarism_score(find_lcs_length(first, second, 0.3), second)
+                         for first, second in self.sentence_pairs)
+        self.assertEqual(expected, calculate_plagiarism_scores(self.sentence_pairs, 0.3))
+
+    def test_calculate_plagiarism_scores_incorrect_pairs(self):
+        """
+        Tests that incorrect pairs get -1 and do not stop the batch
+        """
+        sentence_pairs = ((('the', 'cat'), ('the', 'dog')), None, (('a',),), (('a',), ()), ([], ('a',)))
+        self.assertEqual((1, -1, -1, 0, -1), find_lcs_lengths(sentence_pairs))
+        self.assertEqual((0.5, -1, -1, 0.0, -1), calculate_plagiarism_scores(sentence_pairs, 0.3))
+        self.assertEqual((), find_lcs_lengths([]))
+        self.assertEqual((), calculate_plagiarism_scores(sentence_pairs, 2.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
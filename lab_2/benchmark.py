@@ -0,0 +1,231 @@
+"""
+Benchmark of the lcs functions and plagiarism scores on synthetic texts
+Run from the root of the repository:
+    python -m lab_2.benchmark --sizes 100 1000 --output results.json --baseline lab_2/benchmark_baseline.json
+The committed baseline was saved with the default arguments:
+    python -m lab_2.benchmark --save-baseline
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import timeit
+import tracemalloc
+
+from lab_2.main import tokenize_big_file, find_lcs_length, find_lcs_length_optimized, fill_lcs_matrix, find_lcs, \
+    calculate_plagiarism_score, calculate_text_plagiarism_score, accumulate_diff_stats
+from lab_2.big_file_tokenizer import tokenize_big_file_bytes, tokenize_big_file_parallel, tokenize_block, \
+    tokenize_text
+from lab_2.batch_scoring import find_lcs_length_bit_parallel, calculate_plagiarism_scores
+from lab_2.edit_script import accumulate_diff_stats_by_edit_script
+from lab_2.common_substrings import calculate_verbatim_plagiarism_score
+from lab_2.pruned_lcs import find_lcs_length_pruned, find_lcs_length_banded
+from lab_2.token_ids import calculate_text_plagiarism_score_by_ids
+from lab_2.wavefront_lcs import find_lcs_length_wavefront
+
+
+def generate_sentence(generator: random.Random, vocabulary_size: int, length: int) -> tuple:
+    """
+    Generates a sentence of synthetic tokens, frequent tokens have small numbers as in natural texts
+    """
+    return tuple('w{}'.format(int(vocabulary_size ** generator.random()) - 1) for _ in range(length))
+
+
+DEFAULT_RATES = {'overlap': 0.5, 'reordering': 0.1, 'paraphrase': 0.1}
+
+
+def generate_text_pair(sentences: int, sentence_length: int, rates: dict = None, seed: int = 0) -> tuple:
+    """
+    Generates an original text and a suspicious text, the same for the same arguments
+    Rates:
+        overlap – a share of suspicious sentences copied from the original ones,
+        reordering – a probability to swap a copied token with the next one,
+        paraphrase – a probability to replace a copied token with a random one
+    :param sentences: a number of sentences in each text
+    :param sentence_length: a number of tokens in each sentence
+    :param rates: a dictionary of rates, DEFAULT_RATES for missing ones
+    :param seed: a seed of the generator
+    :return: a tuple of the original text and the suspicious text, both are tuples of sentences with tokens
+    """
+    rates = dict(DEFAULT_RATES, **(rates or {}))
+    overlap, reordering, paraphrase = rates['overlap'], rates['reordering'], rates['paraphrase']
+    generator = random.Random(seed)
+    vocabulary_size = 10 * sentence_length
+    original_text = tuple(generate_sentence(generator, vocabulary_size, sentence_length) for _ in range(sentences))
+    suspicious_text = []
+    for original_sentence in original_text:
+        if generator.random() >= overlap:
+            suspicious_text.append(generate_sentence(generator, vocabulary_size, sentence_length))
+            continue
+        sentence = [token if generator.random() >= paraphrase else generate_sentence(generator, vocabulary_size, 1)[0]
+                    for token in original_sentence]
+        for index in range(len(sentence) - 1):
+            if generator.random() < reordering:
+                sentence[index], sentence[index + 1] = sentence[index + 1], sentence[index]
+        suspicious_text.append(tuple(sentence))
+    return original_text, tuple(suspicious_text)
+
+
+def _score_pairs_one_by_one(sentence_pairs: tuple) -> list:
+    return [calculate_plagiarism_score(find_lcs_length(original, suspicious, 0.3), suspicious)
+            for original, suspicious in sentence_pairs]
+
+
+# functions of two long sequences of tokens
+SEQUENCE_FUNCTIONS = {
+    'find_lcs_length': lambda first, second: find_lcs_length(first, second, 0.0),
+    'find_lcs_length_optimized': lambda first, second: find_lcs_length_optimized(first, second, 0.0),
+    'find_lcs_length_pruned': lambda first, second: find_lcs_length_pruned(first, second, 0.3),
+    'find_lcs_length_banded': lambda first, second: find_lcs_length_banded(first, second, len(first) // 4),
+    'find_lcs_length_bit_parallel': find_lcs_length_bit_parallel,
+    'find_lcs_length_wavefront': lambda first, second: find_lcs_length_wavefront(first, second, 0.0, 1),
+    'find_lcs': lambda first, second: find_lcs(first, second, fill_lcs_matrix(first, second)),
+    'find_lcs_compact': lambda first, second: find_lcs(first, second, fill_lcs_matrix(first, second, True)),
+}
+
+# functions of two texts split into sentences
+TEXT_FUNCTIONS = {
+    'calculate_text_plagiarism_score': calculate_text_plagiarism_score,
+    'calculate_text_plagiarism_score_by_ids': calculate_text_plagiarism_score_by_ids,
+    'accumulate_diff_stats': accumulate_diff_stats,
+    'accumulate_diff_stats_by_edit_script': accumulate_diff_stats_by_edit_script,
+    'calculate_verbatim_plagiarism_score': calculate_verbatim_plagiarism_score,
+    'score_pairs_one_by_one': lambda original, suspicious: _score_pairs_one_by_one(tuple(zip(original, suspicious))),
+    'calculate_plagiarism_scores': lambda original, suspicious: calculate_plagiarism_scores(tuple(zip(original,
+                                                                                                      suspicious))),
+}
+
+
+def measure(function, *arguments) -> dict:
+    """
+    Measures running time and the peak of memory allocated by a function
+    Time and memory are measured in separate runs: tracing allocations slows the function down
+    :return: a dictionary with seconds and the peak in KiB
+    """
+    start = timeit.default_timer()
+    function(*arguments)
+    seconds = timeit.default_timer() - start
+    tracemalloc.start()
+    function(*arguments)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': seconds, 'peak_kib': peak / 1024}
+
+
+def run_benchmarks(sizes: tuple, seed: int = 0, processes: tuple = ()) -> dict:
+    """
+    Runs every function for every size
+    A size is the length of sequences for SEQUENCE_FUNCTIONS
+    and the number of sentences of 15 tokens for TEXT_FUNCTIONS
+    :param sizes: sizes of inputs
+    :param seed: a seed of the generator
+    :param processes: numbers of processes to measure find_lcs_length_wavefront with
+    :return: a dictionary name: {size: measurements}
+    """
+    results = {}
+    for size in sizes:
+        original_text, suspicious_text = generate_text_pair(size, 15, seed=seed)
+        first, second = (tuple(token for sentence in text for token in sentence)[:size]
+                         for text in generate_text_pair(size // 15 + 1, 15, seed=seed))
+        for name, function in SEQUENCE_FUNCTIONS.items():
+            results.setdefault(name, {})[str(size)] = measure(function, first, second)
+        for number in processes:
+            name = 'find_lcs_length_wavefront_{}_processes'.format(number)
+            results.setdefault(name, {})[str(size)] = measure(find_lcs_length_wavefront, first, second, 0.0,
+                                                              number, max(1, size // (2 * number)))
+        for name, function in TEXT_FUNCTIONS.items():
+            results.setdefault(name, {})[str(size)] = measure(function, original_text, suspicious_text)
+    return results
+
+
+def _tokenize_decoded_block(block: bytes) -> list:
+    return [token.encode('ascii') for token in tokenize_text(block.decode('UTF-8'))]
+
+
+def run_tokenizer_benchmarks(lines: int, processes: tuple, seed: int = 0) -> dict:
+    """
+    Measures tokenize_big_file, tokenize_big_file_bytes and tokenize_big_file_parallel on a synthetic file,
+    the ratio of times for different numbers of processes shows how tokenization scales with cores.
+    tokenize_block is measured on the text with a non-ASCII token in every thousandth line
+    next to decoding the whole block as tokenize_block did before windows
+    :param lines: a number of lines of 15 tokens in the file
+    :param processes: numbers of processes
+    :param seed: a seed of the generator
+    :return: a dictionary name: {lines: measurements}
+    """
+    results = {}
+    original_text = generate_text_pair(lines, 15, seed=seed)[0]
+    directory = tempfile.mkdtemp()
+    current_directory = os.getcwd()
+    try:
+        os.chdir(directory)  # tokenize_big_file writes its vocabulary to the current directory
+        with open('text.txt', 'w', encoding='utf-8') as text_file:
+            text = '\n'.join(' '.join(sentence) for sentence in original_text)
+            text_file.write(text.translate(str.maketrans('0123456789', 'abcdefghij')))  # digits are not tokens
+        results['tokenize_big_file'] = {str(lines): measure(tokenize_big_file, 'text.txt')}
+        mixed_block = '\n'.join(line + ' naïve' * (number % 1000 == 0)
+                                 for number, line in enumerate(text.split('\n'))).encode('UTF-8')
+        results['tokenize_block_mixed'] = {str(lines): measure(tokenize_block, mixed_block)}
+        results['tokenize_block_decoded_mixed'] = {str(lines): measure(_tokenize_decoded_block, mixed_block)}
+        results['tokenize_big_file_bytes'] = {str(lines): measure(tokenize_big_file_bytes, 'text.txt')}
+        for number in processes:
+            name = 'tokenize_big_file_parallel_{}_processes'.format(number)
+            results[name] = {str(lines): measure(tokenize_big_file_parallel, 'text.txt', number)}
+    finally:
+        os.chdir(current_directory)
+        shutil.rmtree(directory)
+    return results
+
+
+def create_comparison_table(results: dict, baseline: dict) -> str:
+    """
+    Creates a table of results next to the baseline ones
+    :param results: a dictionary name: {size: measurements}
+    :param baseline: a dictionary of the same structure
+    :return: a table with a line per function and size
+    """
+    lines = ['{:<42} {:>7} {:>10} {:>10} {:>7} {:>11}'.format('function', 'size', 'seconds', 'baseline',
+                                                              'ratio', 'peak KiB')]
+    for name, measurements in results.items():
+        for size, measurement in measurements.items():
+            baseline_seconds = baseline.get(name, {}).get(size, {}).get('seconds')
+            if baseline_seconds:
+                baseline_column = '{:>10.4f} {:>7.2f}'.format(baseline_seconds,
+                                                              measurement['seconds'] / baseline_seconds)
+            else:
+                baseline_column = '{:>10} {:>7}'.format('-', '-')
+            lines.append('{:<42} {:>7} {:>10.4f} {} {:>11.1f}'.format(name, size, measurement['seconds'],
+                                                                     baseline_column, measurement['peak_kib']))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measures lcs functions and plagiarism scores on synthetic texts')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500], help='Sizes of inputs')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the generator')
+    parser.add_argument('--processes', type=int, nargs='*', default=[], help='Numbers of wavefront processes')
+    parser.add_argument('--tokenizer-lines', type=int, default=0,
+                        help='Lines of a synthetic file to measure tokenization with --processes, 0 to skip')
+    parser.add_argument('--output', type=str, default='benchmark_results.json', help='Path to the results')
+    parser.add_argument('--baseline', type=str, default='lab_2/benchmark_baseline.json', help='Path to the baseline')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline')
+    args: argparse.Namespace = parser.parse_args()
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error('the baseline {} does not exist, create it with --save-baseline'.format(args.baseline))
+
+    benchmark_results = run_benchmarks(tuple(args.sizes), args.seed, tuple(args.processes))
+    if args.tokenizer_lines:
+        benchmark_results.update(run_tokenizer_benchmarks(args.tokenizer_lines, tuple(args.processes) or (1,),
+                                                          args.seed))
+    with open(args.output, 'w', encoding='utf-8') as results_file:
+        json.dump(benchmark_results, results_file, indent=2)
+    baseline_results = {}
+    if not args.save_baseline or os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline_results = json.load(baseline_file)
+    print(create_comparison_table(benchmark_results, baseline_results))
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as baseline_file:
+            json.dump(benchmark_results, baseline_file, indent=2)
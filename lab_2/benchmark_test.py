@@ -0,0 +1,76 @@
+"""
+Tests the synthetic texts and the tables of the benchmark
+"""
+
+import unittest
+from lab_2.benchmark import generate_text_pair, run_benchmarks, run_tokenizer_benchmarks, \
+    create_comparison_table, SEQUENCE_FUNCTIONS, TEXT_FUNCTIONS
+
+
+class BenchmarkTest(unittest.TestCase):
+    """
+    Checks for generate_text_pair, run_benchmarks and create_comparison_table functions
+    """
+
+    def test_generate_text_pair_is_deterministic(self):
+        """
+        Tests that the same seed gives the same texts and another seed does not
+        """
+        self.assertEqual(generate_text_pair(20, 10, seed=1), generate_text_pair(20, 10, seed=1))
+        self.assertNotEqual(generate_text_pair(20, 10, seed=1), generate_text_pair(20, 10, seed=2))
+        original_text, suspicious_text = generate_text_pair(20, 10)
+        self.assertEqual(20, len(original_text))
+        self.assertEqual(20, len(suspicious_text))
+        self.assertTrue(all(len(sentence) == 10 for sentence in original_text + suspicious_text))
+
+    def test_generate_text_pair_rates(self):
+        """
+        Tests that a full overlap without changes copies the text and a zero overlap does not
+        """
+        original_text, suspicious_text = generate_text_pair(20, 10, {'overlap': 1.0, 'reordering': 0.0,
+                                                                     'paraphrase': 0.0})
+        self.assertEqual(original_text, suspicious_text)
+        original_text, suspicious_text = generate_text_pair(20, 10, {'overlap': 1.0, 'reordering': 1.0,
+                                                                     'paraphrase': 0.0})
+        self.assertEqual([sorted(sentence) for sentence in original_text],
+                         [sorted(sentence) for sentence in suspicious_text])
+        self.assertNotEqual(original_text, suspicious_text)
+        original_text, suspicious_text = generate_text_pair(20, 10, {'overlap': 0.0})
+        self.assertTrue(all(first != second for first, second in zip(original_text, suspicious_text)))
+
+    def test_run_benchmarks_measures_every_function(self):
+        """
+        Tests that every function is measured for every size
+        """
+        results = run_benchmarks((30, 45))
+        self.assertEqual(set(SEQUENCE_FUNCTIONS) | set(TEXT_FUNCTIONS), set(results))
+        for measurements in results.values():
+            self.assertEqual({'30', '45'}, set(measurements))
+            self.assertTrue(all(measurement['seconds'] >= 0 and measurement['peak_kib'] >= 0
+                                for measurement in measurements.values()))
+
+    def test_run_tokenizer_benchmarks(self):
+        """
+        Tests that the serial tokenizers, mixed blocks and every number of processes are measured
+        """
+        results = run_tokenizer_benchmarks(50, (1, 2))
+        self.assertEqual({'tokenize_big_file', 'tokenize_big_file_bytes', 'tokenize_big_file_parallel_1_processes',
+                          'tokenize_big_file_parallel_2_processes', 'tokenize_block_mixed',
+                          'tokenize_block_decoded_mixed'}, set(results))
+        self.assertTrue(all(set(measurements) == {'50'} for measurements in results.values()))
+
+    def test_create_comparison_table(self):
+        """
+        Tests that the table shows ratios to the baseline and dashes without it
+        """
+        results = {'find_lcs': {'100': {'seconds': 0.5, 'peak_kib': 10.0}},
+                   'find_lcs_length': {'100': {'seconds': 0.2, 'peak_kib': 1.0}}}
+        baseline = {'find_lcs': {'100': {'seconds': 1.0, 'peak_kib': 10.0}}}
+        lines = create_comparison_table(results, baseline).split('\n')
+        self.assertEqual(3, len(lines))
+        self.assertEqual(['find_lcs', '100', '0.5000', '1.0000', '0.50', '10.0'], lines[1].split())
+        self.assertEqual(['find_lcs_length', '100', '0.2000', '-', '-', '1.0'], lines[2].split())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Tokenization of big files by blocks of bytes and in parallel processes
+"""
+import os
+import re
+from array import array
+from collections import defaultdict
+from multiprocessing import Pool
+
+# uppercase letters are lowered and '\r' is a line break, every byte except letters, spaces and line breaks is deleted
+_TRANSLATION_TABLE = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ\r', b'abcdefghijklmnopqrstuvwxyz\n')
+_DELETED_BYTES = bytes(byte for byte in range(256)
+                       if not chr(byte).isascii() or not (chr(byte).isalpha() or chr(byte) in ' \n\r'))
+# a block with non-ASCII bytes is checked by windows of whole lines of about this size
+_WINDOW_SIZE = 1 << 12
+
+
+def split_into_chunks(path_to_file: str, chunks: int) -> tuple:
+    """
+    Splits a file into parts of about the same size, every part ends with a line break or the end of the file
+    :param path_to_file: a path
+    :param chunks: a number of parts
+    :return: a tuple of pairs (start, end) in bytes
+    """
+    file_size = os.path.getsize(path_to_file)
+    borders = [0]
+    with open(path_to_file, 'rb') as file:
+        for number in range(1, chunks):
+            position = max(borders[-1], file_size * number // chunks)
+            if position:
+                file.seek(position - 1)
+                file.readline()
+            borders.append(file.tell())
+    borders.append(file_size)
+    return tuple((start, end) for start, end in zip(borders, borders[1:]) if start < end)
+
+
+def tokenize_text(text: str) -> list:
+    """
+    Tokenizes a text as tokenize_big_file does with every line
+    :param text: a text of whole lines
+    :return: a list of tokens
+    """
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return re.sub('[^a-z \n]', '', text.lower()).split()
+
+
+def tokenize_block(block: bytes) -> list:
+    """
+    Tokenizes whole lines of UTF-8 bytes as tokenize_text does
+    ASCII bytes are lowered and filtered by bytes.translate without decoding,
+    only windows of lines with non-ASCII bytes are decoded: lowering some non-ASCII letters gives ASCII ones
+    :param block: bytes of whole lines
+    :return: a list of tokens as bytes
+    """
+    if block.isascii():
+        return block.translate(_TRANSLATION_TABLE, _DELETED_BYTES).split()
+    tokens = []
+    start = 0
+    while start < len(block):
+        end = block.find(b'\n', start + _WINDOW_SIZE) + 1 or len(block)
+        window = block[start:end]
+        if window.isascii():
+            tokens.extend(window.translate(_TRANSLATION_TABLE, _DELETED_BYTES).split())
+        else:
+            tokens.extend(token.encode('ascii') for token in tokenize_text(window.decode('UTF-8')))
+        start = end
+    return tokens
+
+
+def read_blocks(file, block_size: int):
+    """
+    Reads a binary file by blocks of whole lines
+    :param file: a file opened in the binary mode
+    :param block_size: a number of bytes to read before completing the last line
+    :return: a generator of blocks
+    """
+    while True:
+        block = file.read(block_size)
+        if not block:
+            return
+        yield block + file.readline()
+
+
+def tokenize_big_file_bytes(path_to_file: str, vocabulary: dict = None, block_size: int = 1 << 20) -> tuple:
+    """
+    Reads, tokenizes and transforms a big file into a numeric form by blocks of bytes
+    Tokens are looked up as bytes, the ids equal the ones of tokenize_big_file for a new vocabulary
+    :param path_to_file: a path
+    :param vocabulary: a dictionary token: id to extend, a new one by default
+    :param block_size: a number of bytes to read at once
+    :return: a tuple with ids
+    """
+    if not isinstance(path_to_file, str) or not os.path.isfile(path_to_file) or \
+            not isinstance(vocabulary, (dict, type(None))):
+        return ()
+    if not isinstance(block_size, int) or isinstance(block_size, bool) or block_size < 1:
+        return ()
+    if vocabulary is None:
+        vocabulary = {}
+    # a new token gets the size of the vocabulary as its id, so the lookup of every token stays in C
+    bytes_vocabulary = defaultdict(None, ((token.encode('UTF-8'), token_id) for token, token_id in vocabulary.items()))
+    bytes_vocabulary.default_factory = bytes_vocabulary.__len__
+    token_ids = array('I')
+    with open(path_to_file, 'rb') as file:
+        for block in read_blocks(file, block_size):
+            token_ids.extend(map(bytes_vocabulary.__getitem__, tokenize_block(block)))
+    vocabulary.update((token.decode('UTF-8'), token_id) for token, token_id in bytes_vocabulary.items())
+    return tuple(token_ids)
+
+
+def tokenize_chunk(path_to_file: str, start: int, end: int) -> tuple:
+    """
+    Tokenizes a part of a file with a local vocabulary
+    :param path_to_file: a path
+    :param start: the first byte of the part
+    :param end: the byte after the part
+    :return: a tuple of local ids and tokens in the order of their local ids
+    """
+    with open(path_to_file, 'rb') as file:
+        file.seek(start)
+        block = file.read(end - start)
+    local_vocabulary = defaultdict()
+    local_vocabulary.default_factory = local_vocabulary.__len__
+    local_ids = array('I', map(local_vocabulary.__getitem__, tokenize_block(block)))
+    return local_ids, tuple(token.decode('ascii') for token in local_vocabulary)
+
+
+def merge_chunks(tokenized_chunks, vocabulary: dict) -> array:
+    """
+    Replaces local ids of parts with global ids following the order of parts
+    A token gets a global id when it is met in a part for the first time,
+    tokens of a part are met in the order of local ids, so global ids follow the first occurrence in the file
+    :param tokenized_chunks: pairs of local ids and local tokens in the order of the file
+    :param vocabulary: a dictionary token: id to extend
+    :return: an array of global ids
+    """
+    token_ids = array('I')
+    for local_ids, local_tokens in tokenized_chunks:
+        global_ids = [vocabulary.setdefault(token, len(vocabulary)) for token in local_tokens]
+        token_ids.extend(map(global_ids.__getitem__, local_ids))
+    return token_ids
+
+
+def tokenize_big_file_parallel(path_to_file: str, processes: int = None, chunks: int = None,
+                               vocabulary: dict = None) -> tuple:
+    """
+    Reads, tokenizes and transforms a big file into a numeric form in parallel processes
+    The ids equal the ones of tokenize_big_file for a new vocabulary
+    :param path_to_file: a path
+    :param processes: a number of processes, all cores by default, 1 – no processes are started
+    :param chunks: a number of parts of the file, 4 per process by default
+    :param vocabulary: a dictionary token: id to extend, a new one by default
+    :return: a tuple with ids
+    """
+    if not isinstance(path_to_file, str) or not os.path.isfile(path_to_file):
+        return ()
+    if not isinstance(processes, (int, type(None))) or isinstance(processes, bool) or \
+            not isinstance(chunks, (int, type(None))) or isinstance(chunks, bool) or \
+            not isinstance(vocabulary, (dict, type(None))):
+        return ()
+    if processes is not None and processes < 1:
+        return ()
+    if vocabulary is None:
+        vocabulary = {}
+    if chunks is None:
+        chunks = 4 * (processes or os.cpu_count() or 1)
+    parts = split_into_chunks(path_to_file, max(1, chunks))
+    if processes == 1:
+        token_ids = merge_chunks((tokenize_chunk(path_to_file, *part) for part in parts), vocabulary)
+    else:
+        with Pool(processes) as pool:
+            token_ids = merge_chunks(pool.starmap(tokenize_chunk, ((path_to_file,) + part for part in parts)),
+                                     vocabulary)
+    return tuple(token_ids)
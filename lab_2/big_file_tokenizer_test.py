@@ -0,0 +1,137 @@
+"""
+Tests tokenization of big files by blocks of bytes and in parallel processes
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from lab_2.main import tokenize_big_file
+from lab_2.big_file_tokenizer import split_into_chunks, tokenize_text, tokenize_block, tokenize_big_file_bytes, \
+    tokenize_big_file_parallel
+
+
+class BigFileTokenizerTest(unittest.TestCase):
+    """
+    Checks for split_into_chunks, tokenize_block, tokenize_big_file_bytes and tokenize_big_file_parallel functions
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'text.txt')
+        generator = random.Random(37)
+        words = ['The', 'cat', 'dog,', 'sleeps.', 'Über', 'naïve', 'x-ray', "don't", '42', 'A', 'end!']
+        lines = [' '.join(generator.choice(words) for _ in range(generator.randint(0, 12))) for _ in range(300)]
+        with open(self.path, 'w', encoding='utf-8', newline='') as out:
+            out.write('\r\n'.join(lines[:100]) + '\n' + '\n'.join(lines[100:]) + '\rlast\rline')
+        self.current_directory = os.getcwd()
+        os.chdir(self.directory)
+
+    def tearDown(self):
+        os.chdir(self.current_directory)
+        shutil.rmtree(self.directory)
+
+    def test_split_into_chunks_ideal(self):
+        """
+        Tests that parts cover the file and end with line breaks
+        """
+        parts = split_into_chunks(self.path, 7)
+        self.assertEqual(0, parts[0][0])
+        self.assertEqual(os.path.getsize(self.path), parts[-1][1])
+        with open(self.path, 'rb') as file:
+            content = file.read()
+        for (_, end), (start, _) in zip(parts, parts[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(b'\n', content[end - 1:end])
+        self.assertEqual(1, len(split_into_chunks(self.path, 1)))
+
+    def test_tokenize_block_ideal(self):
+        """
+        Tests that ASCII and non-ASCII blocks give the same tokens as the text
+        """
+        self.assertEqual([b'the', b'catsdont', b'sleep', b'xray'],
+                         tokenize_block(b"The cat's\tdon't\r\nSLEEP 42 x-ray!\n"))
+        self.assertEqual([b'ber', b'nave', b'kelvin', b'i'],
+                         tokenize_block('Über naïve \u212aelvin İ\n'.encode('UTF-8')))
+        self.assertEqual([b'a', b'b'], tokenize_block(b'a\rb'))
+        self.assertEqual([], tokenize_block(b''))
+
+    def test_tokenize_block_mixed_windows(self):
+        """
+        Tests that a long block with a few non-ASCII lines gives the same tokens as the decoded text
+        """
+        with open(self.path, 'rb') as file:
+            block = file.read() * 20
+        self.assertEqual([token.encode('ascii') for token in tokenize_text(block.decode('UTF-8'))],
+                         tokenize_block(block))
+        ascii_block = b'the cat\r\n' * 1000
+        mixed_block = ascii_block + 'Über \u212aelvin\n'.encode('UTF-8') + ascii_block
+        self.assertEqual([b'the', b'cat'] * 1000 + [b'ber', b'kelvin'] + [b'the', b'cat'] * 1000,
+                         tokenize_block(mixed_block))
+
+    def test_tokenize_big_file_bytes_ideal(self):
+        """
+        Tests that ids equal the ones of tokenize_big_file for any size of blocks
+        """
+        expected = tokenize_big_file(self.path)
+        self.assertEqual(expected, tokenize_big_file_bytes(self.path))
+        self.assertEqual(expected, tokenize_big_file_bytes(self.path, block_size=1))
+        self.assertEqual(expected, tokenize_big_file_bytes(self.path, block_size=100))
+
+    def test_tokenize_big_file_bytes_extends_vocabulary(self):
+        """
+        Tests that new tokens continue ids of the given vocabulary
+        """
+        with open(self.path, 'w', encoding='utf-8') as out:
+            out.write('the cat\nthe dog\n')
+        vocabulary = {'dog': 0}
+        self.assertEqual((1, 2, 1, 0), tokenize_big_file_bytes(self.path, vocabulary))
+        self.assertEqual({'dog': 0, 'the': 1, 'cat': 2}, vocabulary)
+
+    def test_tokenize_big_file_bytes_incorrect_inputs(self):
+        """
+        Tests that tokenize_big_file_bytes can handle incorrect inputs
+        """
+        for bad_input in [None, 1, [], 'no_such_file.txt']:
+            self.assertEqual((), tokenize_big_file_bytes(bad_input))
+        for bad_input in [0, -1, True, 1.5, None]:
+            self.assertEqual((), tokenize_big_file_bytes(self.path, block_size=bad_input))
+        self.assertEqual((), tokenize_big_file_bytes(self.path, []))
+
+    def test_tokenize_big_file_parallel_ideal(self):
+        """
+        Tests that ids equal the ones of tokenize_big_file
+        """
+        expected = tokenize_big_file(self.path)
+        self.assertEqual(expected, tokenize_big_file_parallel(self.path, 1, 1))
+        self.assertEqual(expected, tokenize_big_file_parallel(self.path, 1, 13))
+        self.assertEqual(expected, tokenize_big_file_parallel(self.path, 2))
+
+    def test_tokenize_big_file_parallel_extends_vocabulary(self):
+        """
+        Tests that new tokens continue ids of the given vocabulary
+        """
+        with open(self.path, 'w', encoding='utf-8') as out:
+            out.write('the cat\nthe dog\n')
+        vocabulary = {'dog': 0}
+        self.assertEqual((1, 2, 1, 0), tokenize_big_file_parallel(self.path, 1, 2, vocabulary))
+        self.assertEqual({'dog': 0, 'the': 1, 'cat': 2}, vocabulary)
+
+    def test_tokenize_big_file_parallel_incorrect_inputs(self):
+        """
+        Tests that tokenize_big_file_parallel can handle incorrect inputs
+        """
+        for bad_input in [None, 1, [], 'no_such_file.txt']:
+            self.assertEqual((), tokenize_big_file_parallel(bad_input))
+        self.assertEqual((), tokenize_big_file_parallel(self.path, '2'))
+        for bad_processes in [0, -1]:
+            vocabulary = {}
+            self.assertEqual((), tokenize_big_file_parallel(self.path, bad_processes, 2, vocabulary))
+            self.assertEqual({}, vocabulary)
+        self.assertEqual((), tokenize_big_file_parallel(self.path, 1, True))
+        self.assertEqual((), tokenize_big_file_parallel(self.path, 1, 2, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
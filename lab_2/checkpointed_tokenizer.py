@@ -0,0 +1,151 @@
+"""
+Tokenization of very large files that resumes from the last checkpoint after a crash
+A directory of a checkpoint keeps:
+    ids.bin – little-endian uint32 ids emitted so far, appended after every block,
+    vocabulary.txt – tokens in the order of their ids, appended with new tokens at every checkpoint,
+    checkpoint.json – the source file, its byte offset and the sizes of both files at the last checkpoint
+Appended data beyond the last checkpoint is cut off on restart, so a crash at any moment loses at most one period
+"""
+import json
+import os
+import sys
+from array import array
+from collections import defaultdict
+from itertools import islice
+
+from lab_2.big_file_tokenizer import read_blocks, tokenize_block
+
+IDS_FILE = 'ids.bin'
+VOCABULARY_FILE = 'vocabulary.txt'
+CHECKPOINT_FILE = 'checkpoint.json'
+
+
+def read_checkpoint(path_to_checkpoint: str, source: list) -> dict:
+    """
+    Reads the last checkpoint of the source file
+    :param path_to_checkpoint: a path to the directory of the checkpoint
+    :param source: a list of the absolute path, the size and the modification time of the source file
+    :return: a dictionary of the checkpoint, an empty one if there is no checkpoint of this source file
+    """
+    try:
+        with open(os.path.join(path_to_checkpoint, CHECKPOINT_FILE), encoding='utf-8') as file:
+            checkpoint = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(checkpoint, dict) or checkpoint.get('source') != source:
+        return {}
+    return checkpoint
+
+
+def save_checkpoint(path_to_checkpoint: str, checkpoint: dict, files: tuple):
+    """
+    Flushes the appended files to disk and then atomically replaces checkpoint.json
+    :param path_to_checkpoint: a path to the directory of the checkpoint
+    :param checkpoint: a dictionary of the checkpoint
+    :param files: the opened files of ids and of the vocabulary
+    """
+    for file in files:
+        file.flush()
+        os.fsync(file.fileno())
+    path = os.path.join(path_to_checkpoint, CHECKPOINT_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as out:
+        json.dump(checkpoint, out)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(path + '.tmp', path)
+
+
+def restore_state(path_to_checkpoint: str, checkpoint: dict) -> defaultdict:
+    """
+    Cuts off data appended after the checkpoint and reads the vocabulary back
+    :param path_to_checkpoint: a path to the directory of the checkpoint
+    :param checkpoint: a dictionary of the checkpoint
+    :return: a dictionary token as bytes: id that gives the next id to a new token
+    """
+    vocabulary = defaultdict()
+    vocabulary.default_factory = vocabulary.__len__
+    with open(os.path.join(path_to_checkpoint, IDS_FILE), 'ab') as ids_file:
+        ids_file.truncate(checkpoint['ids'] * 4)
+    with open(os.path.join(path_to_checkpoint, VOCABULARY_FILE), 'ab+') as vocabulary_file:
+        vocabulary_file.truncate(checkpoint['vocabulary_bytes'])
+        vocabulary_file.seek(0)
+        for token in vocabulary_file.read().split():
+            vocabulary[token] = len(vocabulary)
+    return vocabulary
+
+
+def tokenize_from_checkpoint(path_to_file: str, path_to_checkpoint: str, checkpoint: dict, block_size: int,
+                             checkpoint_blocks: int) -> defaultdict:
+    """
+    Tokenizes the rest of a file after the checkpoint appending ids and new tokens to the directory
+    :param path_to_file: a path
+    :param path_to_checkpoint: a path to the directory of the checkpoint
+    :param checkpoint: a dictionary of the checkpoint, updated at every new checkpoint
+    :param block_size: a number of bytes to read at once
+    :param checkpoint_blocks: a number of blocks between checkpoints
+    :return: a dictionary token as bytes: id of the whole file
+    """
+    bytes_vocabulary = restore_state(path_to_checkpoint, checkpoint)
+    with open(path_to_file, 'rb') as file, \
+            open(os.path.join(path_to_checkpoint, IDS_FILE), 'ab') as ids_file, \
+            open(os.path.join(path_to_checkpoint, VOCABULARY_FILE), 'ab') as vocabulary_file:
+        file.seek(checkpoint['offset'])
+        for number, block in enumerate(read_blocks(file, block_size), 1):
+            token_ids = array('I', map(bytes_vocabulary.__getitem__, tokenize_block(block)))
+            if sys.byteorder != 'little':
+                token_ids.byteswap()
+            token_ids.tofile(ids_file)
+            checkpoint['ids'] += len(token_ids)
+            if number % checkpoint_blocks == 0 or file.tell() == checkpoint['source'][1]:
+                new_tokens = b''.join(token + b'\n' for token in islice(bytes_vocabulary, checkpoint['tokens'], None))
+                vocabulary_file.write(new_tokens)
+                checkpoint.update(offset=file.tell(), tokens=len(bytes_vocabulary),
+                                  vocabulary_bytes=checkpoint['vocabulary_bytes'] + len(new_tokens))
+                save_checkpoint(path_to_checkpoint, checkpoint, (ids_file, vocabulary_file))
+    if not checkpoint['offset']:
+        save_checkpoint(path_to_checkpoint, checkpoint, ())
+    return bytes_vocabulary
+
+
+def tokenize_big_file_resumable(path_to_file: str, path_to_checkpoint: str, vocabulary: dict = None,
+                                block_size: int = 1 << 20, checkpoint_blocks: int = 64) -> tuple:
+    """
+    Reads, tokenizes and transforms a big file into a numeric form saving a checkpoint every few blocks
+    A restarted call with the same directory continues from the last checkpoint,
+    a call for a finished file reads the ids from the directory.
+    The ids equal the ones of tokenize_big_file for a new vocabulary
+    :param path_to_file: a path
+    :param path_to_checkpoint: a path to the directory of the checkpoint, created if it does not exist
+    :param vocabulary: a dictionary token: id with ids from 0 to extend, a new one by default;
+    a resumed job takes the vocabulary of the checkpoint
+    :param block_size: a number of bytes to read at once
+    :param checkpoint_blocks: a number of blocks between checkpoints
+    :return: a tuple with ids
+    """
+    if not isinstance(path_to_file, str) or not os.path.isfile(path_to_file) or \
+            not isinstance(path_to_checkpoint, str) or not isinstance(vocabulary, (dict, type(None))):
+        return ()
+    for number in (block_size, checkpoint_blocks):
+        if not isinstance(number, int) or isinstance(number, bool) or number < 1:
+            return ()
+    if vocabulary is None:
+        vocabulary = {}
+    os.makedirs(path_to_checkpoint, exist_ok=True)
+    stat = os.stat(path_to_file)
+    source = [os.path.abspath(path_to_file), stat.st_size, stat.st_mtime_ns]
+    checkpoint = read_checkpoint(path_to_checkpoint, source)
+    if not checkpoint:
+        initial_tokens = sorted(vocabulary, key=vocabulary.get)
+        with open(os.path.join(path_to_checkpoint, VOCABULARY_FILE), 'w', encoding='utf-8') as vocabulary_file:
+            vocabulary_file.write(''.join(token + '\n' for token in initial_tokens))
+        checkpoint = {'source': source, 'offset': 0, 'ids': 0, 'tokens': len(initial_tokens),
+                      'vocabulary_bytes': sum(len(token.encode('utf-8')) + 1 for token in initial_tokens)}
+    bytes_vocabulary = tokenize_from_checkpoint(path_to_file, path_to_checkpoint, checkpoint, block_size,
+                                                checkpoint_blocks)
+    vocabulary.update((token.decode('utf-8'), token_id) for token, token_id in bytes_vocabulary.items())
+    token_ids = array('I')
+    with open(os.path.join(path_to_checkpoint, IDS_FILE), 'rb') as ids_file:
+        token_ids.fromfile(ids_file, checkpoint['ids'])
+    if sys.byteorder != 'little':
+        token_ids.byteswap()
+    return tuple(token_ids)
@@ -0,0 +1,110 @@
+"""
+Tests tokenization of big files resumed from checkpoints
+"""
+
+import json
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from lab_2.main import tokenize_big_file
+from lab_2.big_file_tokenizer import tokenize_block
+from lab_2.checkpointed_tokenizer import tokenize_big_file_resumable, CHECKPOINT_FILE
+
+
+class CheckpointedTokenizerTest(unittest.TestCase):
+    """
+    Checks for tokenize_big_file_resumable function
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'text.txt')
+        self.checkpoint = os.path.join(self.directory, 'checkpoint')
+        generator = random.Random(39)
+        words = ['The', 'cat', 'dog,', 'sleeps.', 'Über', 'x-ray', "don't", '42', 'A', 'end!']
+        with open(self.path, 'w', encoding='utf-8') as out:
+            for _ in range(200):
+                out.write(' '.join(generator.choice(words) for _ in range(generator.randint(0, 12))) + '\n')
+        self.current_directory = os.getcwd()
+        os.chdir(self.directory)
+
+    def tearDown(self):
+        os.chdir(self.current_directory)
+        shutil.rmtree(self.directory)
+
+    def test_tokenize_big_file_resumable_ideal(self):
+        """
+        Tests that ids equal the ones of tokenize_big_file and a finished job is read back
+        """
+        expected = tokenize_big_file(self.path)
+        self.assertEqual(expected, tokenize_big_file_resumable(self.path, self.checkpoint, block_size=100,
+                                                               checkpoint_blocks=3))
+        with mock.patch('lab_2.checkpointed_tokenizer.tokenize_block') as tokenize_mock:
+            self.assertEqual(expected, tokenize_big_file_resumable(self.path, self.checkpoint))
+            tokenize_mock.assert_not_called()
+
+    def test_tokenize_big_file_resumable_after_crash(self):
+        """
+        Tests that a job killed in the middle continues from the last checkpoint
+        """
+        calls = []
+
+        def crashing_tokenize_block(block):
+            calls.append(block)
+            if len(calls) == 8:
+                raise KeyboardInterrupt
+            return tokenize_block(block)
+
+        with mock.patch('lab_2.checkpointed_tokenizer.tokenize_block', crashing_tokenize_block):
+            self.assertRaises(KeyboardInterrupt, tokenize_big_file_resumable, self.path, self.checkpoint, None, 100, 3)
+        with open(os.path.join(self.checkpoint, CHECKPOINT_FILE), encoding='utf-8') as file:
+            offset = json.load(file)['offset']
+        self.assertEqual(sum(map(len, calls[:6])), offset)
+        vocabulary = {}
+        with mock.patch('lab_2.checkpointed_tokenizer.tokenize_block', wraps=tokenize_block) as tokenize_mock:
+            actual = tokenize_big_file_resumable(self.path, self.checkpoint, vocabulary, 100, 3)
+            self.assertEqual(calls[6], tokenize_mock.call_args_list[0][0][0])
+        self.assertEqual(tokenize_big_file(self.path), actual)
+        with open('id.pkl', 'rb') as file:
+            self.assertEqual(pickle.load(file), vocabulary)
+
+    def test_tokenize_big_file_resumable_changed_file(self):
+        """
+        Tests that a checkpoint of a changed file is not used
+        """
+        tokenize_big_file_resumable(self.path, self.checkpoint)
+        with open(self.path, 'w', encoding='utf-8') as out:
+            out.write('the cat\nthe dog\n')
+        os.utime(self.path, ns=(1, 1))
+        self.assertEqual((0, 1, 0, 2), tokenize_big_file_resumable(self.path, self.checkpoint))
+
+    def test_tokenize_big_file_resumable_extends_vocabulary(self):
+        """
+        Tests that new tokens continue ids of the given vocabulary
+        """
+        with open(self.path, 'w', encoding='utf-8') as out:
+            out.write('the cat\nthe dog\n')
+        vocabulary = {'dog': 0}
+        self.assertEqual((1, 2, 1, 0), tokenize_big_file_resumable(self.path, self.checkpoint, vocabulary))
+        self.assertEqual({'dog': 0, 'the': 1, 'cat': 2}, vocabulary)
+
+    def test_tokenize_big_file_resumable_incorrect_inputs(self):
+        """
+        Tests that tokenize_big_file_resumable can handle incorrect inputs
+        """
+        for bad_input in [None, 1, [], 'no_such_file.txt']:
+            self.assertEqual((), tokenize_big_file_resumable(bad_input, self.checkpoint))
+        self.assertEqual((), tokenize_big_file_resumable(self.path, None))
+        self.assertEqual((), tokenize_big_file_resumable(self.path, self.checkpoint, []))
+        for bad_input in [0, -1, True, 1.5, None]:
+            self.assertEqual((), tokenize_big_file_resumable(self.path, self.checkpoint, block_size=bad_input))
+            self.assertEqual((), tokenize_big_file_resumable(self.path, self.checkpoint, checkpoint_blocks=bad_input))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+
+if __name__ == "__main__":
+    unittest.main()
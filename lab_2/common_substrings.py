@@ -0,0 +1,188 @@
+"""
+Verbatim copying: longest common substrings of tokens found with a suffix automaton
+"""
+from array import array
+
+from lab_2.main import TOKEN_SEQUENCES
+
+
+class SuffixAutomaton:
+    """
+    The minimal automaton accepting all substrings of a sequence of tokens, built in linear time
+    State 0 is the initial one; for every state:
+        lengths – the length of the longest substring leading to it,
+        links – the suffix link,
+        first_ends – the index of the last token of the first occurrence of its substrings,
+        edge_tokens and edge_targets – the token and the next state of its first transition, None and -1 without one.
+    Most states have a single transition, so only states with more transitions get a dictionary token: next state
+    in more_transitions
+    """
+
+    def __init__(self, tokens):
+        self.lengths = array('i', [0])
+        self.links = [-1]
+        self.first_ends = array('i', [-1])
+        self.edge_tokens = [None]
+        self.edge_targets = [-1]
+        self.more_transitions = {}
+        last = 0
+        for index, token in enumerate(tokens):
+            last = self._extend(last, index, token)
+
+    def _get_transition(self, state: int, token) -> int:
+        """
+        Finds the next state by a token
+        :return: a state, -1 if there is no transition
+        """
+        if self.edge_tokens[state] == token:
+            return self.edge_targets[state]
+        more_transitions = self.more_transitions.get(state)
+        return more_transitions.get(token, -1) if more_transitions else -1
+
+    def _extend(self, last: int, index: int, token) -> int:
+        lengths, links, edge_tokens, edge_targets = self.lengths, self.links, self.edge_tokens, self.edge_targets
+        more_transitions = self.more_transitions
+        current = len(lengths)
+        lengths.append(lengths[last] + 1)
+        links.append(0)
+        self.first_ends.append(index)
+        edge_tokens.append(None)
+        edge_targets.append(-1)
+        state = last
+        # states without a transition by the token get one to the new state, lookups are inlined here
+        while state != -1:
+            edge_token = edge_tokens[state]
+            if edge_token is None:
+                edge_tokens[state] = token
+                edge_targets[state] = current
+            elif edge_token == token:
+                break
+            else:
+                transitions = more_transitions.get(state)
+                if transitions is None:
+                    more_transitions[state] = {token: current}
+                elif token in transitions:
+                    break
+                else:
+                    transitions[token] = current
+            state = links[state]
+        if state == -1:
+            return current
+        next_state = self._get_transition(state, token)
+        if lengths[state] + 1 == lengths[next_state]:
+            links[current] = next_state
+            return current
+        clone = self._clone(next_state, lengths[state] + 1)
+        self._redirect(state, token, next_state, clone)
+        links[next_state] = clone
+        links[current] = clone
+        return current
+
+    def _redirect(self, state: int, token, next_state: int, clone: int):
+        """
+        Moves transitions by the token from next_state to the clone along suffix links
+        """
+        edge_tokens, edge_targets, more_transitions = self.edge_tokens, self.edge_targets, self.more_transitions
+        while state != -1:
+            if edge_tokens[state] == token:
+                if edge_targets[state] != next_state:
+                    return
+                edge_targets[state] = clone
+            elif more_transitions[state][token] == next_state:
+                more_transitions[state][token] = clone
+            else:
+                return
+            state = self.links[state]
+
+    def _clone(self, state: int, length: int) -> int:
+        clone = len(self.lengths)
+        self.lengths.append(length)
+        self.links.append(self.links[state])
+        self.first_ends.append(self.first_ends[state])
+        self.edge_tokens.append(self.edge_tokens[state])
+        self.edge_targets.append(self.edge_targets[state])
+        if state in self.more_transitions:
+            self.more_transitions[clone] = dict(self.more_transitions[state])
+        return clone
+
+    def is_substring(self, tokens) -> bool:
+        """
+        Checks whether the tokens occur in the automaton sequence one after another
+        :param tokens: a sequence of tokens
+        :return: True if the tokens are a substring, False if not
+        """
+        if not isinstance(tokens, TOKEN_SEQUENCES):
+            return False
+        state = 0
+        for token in tokens:
+            state = self._get_transition(state, token)
+            if state == -1:
+                return False
+        return True
+
+    def find_common_substrings(self, tokens, min_length: int) -> tuple:
+        """
+        Finds maximal common substrings of the automaton sequence and the given tokens in linear time
+        A substring is reported at the position where it can not be extended to the right any more
+        :param tokens: a sequence of tokens
+        :param min_length: a minimal length of a substring
+        :return: a tuple of (start in tokens, start in the automaton sequence, length)
+        """
+        if not isinstance(tokens, TOKEN_SEQUENCES) or not isinstance(min_length, int) or \
+                isinstance(min_length, bool) or min_length < 1:
+            return ()
+        lengths, links = self.lengths, self.links
+        substrings = []
+        state = 0
+        length = 0
+        for index, token in enumerate(tokens):
+            next_state = self._get_transition(state, token)
+            if next_state != -1:
+                state = next_state
+                length += 1
+                continue
+            if length >= min_length:
+                substrings.append(self._describe(index - 1, state, length))
+            while state and next_state == -1:
+                state = links[state]
+                next_state = self._get_transition(state, token)
+            if next_state != -1:
+                length = lengths[state] + 1
+                state = next_state
+            else:
+                length = 0
+        if length >= min_length:
+            substrings.append(self._describe(len(tokens) - 1, state, length))
+        return tuple(substrings)
+
+    def _describe(self, end: int, state: int, length: int) -> tuple:
+        return end - length + 1, self.first_ends[state] - length + 1, length
+
+
+def calculate_verbatim_plagiarism_score(original_text_tokens: tuple, suspicious_text_tokens: tuple,
+                                        min_length: int = 5) -> float:
+    """
+    Calculates the share of tokens of the suspicious text copied verbatim from the original text
+    Texts are compared as whole sequences, copied runs may cross sentence borders.
+    Runs shorter than min_length tokens are not counted: short phrases coincide by chance
+    :param original_text_tokens: a tuple of sentences with tokens
+    :param suspicious_text_tokens: a tuple of sentences with tokens
+    :param min_length: a minimal length of a copied run
+    :return: a score from 0 to 1, where 0 means no plagiarism, 1 – the texts are the same
+    """
+    if not isinstance(original_text_tokens, tuple) or not isinstance(suspicious_text_tokens, tuple) or \
+            not all(isinstance(sentence, tuple) for sentence in original_text_tokens + suspicious_text_tokens):
+        return -1
+    if not isinstance(min_length, int) or isinstance(min_length, bool) or min_length < 1:
+        return -1
+    suspicious_tokens = tuple(token for sentence in suspicious_text_tokens for token in sentence)
+    if not suspicious_tokens:
+        return 0.0
+    automaton = SuffixAutomaton(token for sentence in original_text_tokens for token in sentence)
+    substrings = automaton.find_common_substrings(suspicious_tokens, min_length)
+    covered_tokens = 0
+    covered_until = 0
+    for start, _, length in substrings:
+        covered_tokens += max(0, start + length - max(start, covered_until))
+        covered_until = max(covered_until, start + length)
+    return covered_tokens / len(suspicious_tokens)
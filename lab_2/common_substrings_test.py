@@ -0,0 +1,121 @@
+"""
+Tests SuffixAutomaton class and calculate_verbatim_plagiarism_score function
+"""
+
+import random
+import unittest
+from lab_2.common_substrings import SuffixAutomaton, calculate_verbatim_plagiarism_score
+
+
+def find_common_substrings_naively(original_tokens, suspicious_tokens, min_length):
+    """
+    Checks every end in the suspicious tokens
+    """
+    substrings = []
+    longest = []
+    for end in range(len(suspicious_tokens)):
+        length = 0
+        start = 0
+        for candidate in range(end + 1, 0, -1):
+            part = suspicious_tokens[end - candidate + 1:end + 1]
+            for original_start in range(len(original_tokens) - candidate + 1):
+                if original_tokens[original_start:original_start + candidate] == part:
+                    length, start = candidate, original_start
+                    break
+            if length:
+                break
+        longest.append((length, start))
+    for end, (length, _) in enumerate(longest):
+        is_last = end == len(longest) - 1
+        if length >= min_length and (is_last or longest[end + 1][0] != length + 1):
+            substrings.append((end - length + 1, length))
+    return substrings
+
+
+class CommonSubstringsTest(unittest.TestCase):
+    """
+    Checks for SuffixAutomaton class and calculate_verbatim_plagiarism_score function
+    """
+
+    def test_find_common_substrings_ideal(self):
+        """
+        Tests that copied runs are found in both sequences
+        """
+        original = ('the', 'cat', 'is', 'sleeping', 'on', 'the', 'mat', 'today')
+        suspicious = ('now', 'the', 'cat', 'is', 'sleeping', 'on', 'a', 'mat', 'today')
+        expected = ((1, 0, 5), (7, 6, 2))
+        self.assertEqual(expected, SuffixAutomaton(original).find_common_substrings(suspicious, 2))
+        self.assertEqual(((1, 0, 5),), SuffixAutomaton(original).find_common_substrings(suspicious, 3))
+
+    def test_is_substring_ideal(self):
+        """
+        Tests that the automaton accepts substrings only
+        """
+        automaton = SuffixAutomaton(('the', 'cat', 'is', 'sleeping'))
+        self.assertTrue(automaton.is_substring(('cat', 'is')))
+        self.assertTrue(automaton.is_substring(()))
+        self.assertFalse(automaton.is_substring(('the', 'is')))
+        self.assertFalse(automaton.is_substring(None))
+
+    def test_find_common_substrings_random(self):
+        """
+        Tests that the automaton finds the same runs as a naive search
+        """
+        generator = random.Random(32)
+        for _ in range(50):
+            original = tuple(generator.choice('abc') for _ in range(generator.randint(0, 15)))
+            suspicious = tuple(generator.choice('abc') for _ in range(generator.randint(0, 15)))
+            actual = SuffixAutomaton(original).find_common_substrings(suspicious, 2)
+            self.assertEqual(find_common_substrings_naively(original, suspicious, 2),
+                             [(start, length) for start, _, length in actual])
+            for start, original_start, length in actual:
+                self.assertEqual(suspicious[start:start + length], original[original_start:original_start + length])
+
+    def test_automaton_transitions_compact(self):
+        """
+        Tests that only states with several transitions keep a dictionary of them
+        """
+        generator = random.Random(33)
+        tokens = tuple(generator.choice('abcd') for _ in range(300))
+        automaton = SuffixAutomaton(tokens)
+        for state, transitions in automaton.more_transitions.items():
+            self.assertNotIn(automaton.edge_tokens[state], transitions)
+            self.assertTrue(transitions)
+        for start in range(0, 300, 7):
+            self.assertTrue(automaton.is_substring(tokens[start:start + 20]))
+        self.assertLessEqual(len(automaton.lengths), 2 * len(tokens))
+
+    def test_find_common_substrings_incorrect_inputs(self):
+        """
+        Tests that find_common_substrings can handle incorrect inputs
+        """
+        automaton = SuffixAutomaton(('a', 'b'))
+        for bad_input in [[], {}, '', None, True, 9.22]:
+            self.assertEqual((), automaton.find_common_substrings(bad_input, 2))
+        for bad_length in [0, -1, None, True, 2.0]:
+            self.assertEqual((), automaton.find_common_substrings(('a', 'b'), bad_length))
+
+    def test_calculate_verbatim_plagiarism_score_ideal(self):
+        """
+        Tests that overlapping runs are counted once and runs may cross sentences
+        """
+        original_text_tokens = (('i', 'have', 'a', 'cat'), ('its', 'body', 'is', 'covered', 'with', 'fur'))
+        suspicious_text_tokens = (('a', 'cat'), ('its', 'body', 'is', 'white'), ('i', 'have', 'a', 'dog'))
+        self.assertEqual(8 / 10, calculate_verbatim_plagiarism_score(original_text_tokens,
+                                                                     suspicious_text_tokens, 3))
+        self.assertEqual(1.0, calculate_verbatim_plagiarism_score(original_text_tokens, original_text_tokens))
+        self.assertEqual(0.0, calculate_verbatim_plagiarism_score(original_text_tokens, ()))
+
+    def test_calculate_verbatim_plagiarism_score_incorrect_inputs(self):
+        """
+        Tests that calculate_verbatim_plagiarism_score can handle incorrect inputs
+        """
+        patches_text = (('the', 'dog'),)
+        for bad_input in [[], {}, '', None, True, 9.22, ('the', 'dog')]:
+            self.assertEqual(-1, calculate_verbatim_plagiarism_score(bad_input, patches_text))
+            self.assertEqual(-1, calculate_verbatim_plagiarism_score(patches_text, bad_input))
+        self.assertEqual(-1, calculate_verbatim_plagiarism_score(patches_text, patches_text, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
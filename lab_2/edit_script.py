@@ -0,0 +1,140 @@
+"""
+Edit scripts of sentences built during backtracking of the lcs matrix
+An edit script is a tuple of runs (operation, original_start, original_end, suspicious_start, suspicious_end),
+the runs cover both sentences from the start to the end, ends are exclusive
+"""
+from lab_2.main import TOKEN_SEQUENCES, fill_lcs_matrix
+
+EQUAL = 'equal'
+INSERT = 'insert'
+DELETE = 'delete'
+REPLACE = 'replace'
+
+
+def _backtrack_steps(original_sentence_tokens, suspicious_sentence_tokens) -> list:
+    """
+    Walks the lcs matrix from the last cell as find_lcs does
+    :return: a list of steps EQUAL, DELETE or INSERT from the end of the sentences to the start
+    """
+    lcs_matrix = fill_lcs_matrix(original_sentence_tokens, suspicious_sentence_tokens, compact=True)
+    cells, columns = (lcs_matrix.cells, lcs_matrix.columns) if lcs_matrix else ((), 0)
+    row, column = len(original_sentence_tokens) - 1, len(suspicious_sentence_tokens) - 1
+    steps = []
+    while row >= 0 and column >= 0:
+        if original_sentence_tokens[row] == suspicious_sentence_tokens[column]:
+            steps.append(EQUAL)
+            row -= 1
+            column -= 1
+            continue
+        upper = cells[(row - 1) * columns + column] if row else 0
+        left = cells[row * columns + column - 1] if column else 0
+        if upper > left:
+            steps.append(DELETE)
+            row -= 1
+        else:
+            steps.append(INSERT)
+            column -= 1
+    steps.extend([DELETE] * (row + 1))
+    steps.extend([INSERT] * (column + 1))
+    return steps
+
+
+def find_edit_script(original_sentence_tokens: tuple, suspicious_sentence_tokens: tuple) -> tuple:
+    """
+    Finds runs of equal, inserted, deleted and replaced tokens along the longest common subsequence
+    Deletions and insertions between two equal runs form one replace run
+    e.g. ('the', 'cat', 'sleeps'), ('the', 'dog', 'sleeps', 'now')
+    --> (('equal', 0, 1, 0, 1), ('replace', 1, 2, 1, 2), ('equal', 2, 3, 2, 3), ('insert', 3, 3, 3, 4))
+    :param original_sentence_tokens: a tuple of tokens
+    :param suspicious_sentence_tokens: a tuple of tokens
+    :return: a tuple of runs
+    """
+    if not isinstance(original_sentence_tokens, TOKEN_SEQUENCES) or \
+            not isinstance(suspicious_sentence_tokens, TOKEN_SEQUENCES) or \
+            None in original_sentence_tokens or None in suspicious_sentence_tokens:
+        return ()
+    edit_script = []
+    original_index = suspicious_index = 0
+    run_start = (0, 0)
+    steps = _backtrack_steps(original_sentence_tokens, suspicious_sentence_tokens)
+    for number in range(len(steps) - 1, -1, -1):
+        step = steps[number]
+        if step == EQUAL:
+            original_index += 1
+            suspicious_index += 1
+        elif step == DELETE:
+            original_index += 1
+        else:
+            suspicious_index += 1
+        if number and (steps[number - 1] == EQUAL) == (step == EQUAL):
+            continue
+        if step == EQUAL:
+            operation = EQUAL
+        elif original_index == run_start[0]:
+            operation = INSERT
+        elif suspicious_index == run_start[1]:
+            operation = DELETE
+        else:
+            operation = REPLACE
+        edit_script.append((operation, run_start[0], original_index, run_start[1], suspicious_index))
+        run_start = (original_index, suspicious_index)
+    return tuple(edit_script)
+
+
+def edit_script_to_diff_indexes(edit_script: tuple) -> tuple:
+    """
+    Finds indexes of differences as find_diff_in_sentence does: the start and the end of every changed part
+    :param edit_script: a tuple of runs
+    :return: a tuple of indexes for the original sentence and a tuple for the suspicious sentence
+    """
+    if not isinstance(edit_script, tuple):
+        return ()
+    original_indexes = []
+    suspicious_indexes = []
+    for operation, original_start, original_end, suspicious_start, suspicious_end in edit_script:
+        if operation == EQUAL:
+            continue
+        if original_start < original_end:
+            original_indexes.extend((original_start, original_end))
+        if suspicious_start < suspicious_end:
+            suspicious_indexes.extend((suspicious_start, suspicious_end))
+    return tuple(original_indexes), tuple(suspicious_indexes)
+
+
+def accumulate_diff_stats_by_edit_script(original_text_tokens: tuple, suspicious_text_tokens: tuple,
+                                         plagiarism_threshold=0.3) -> dict:
+    """
+    Accumulates the statistics of accumulate_diff_stats from one edit script per pair of sentences
+    A suspicious sentence without an original one is compared with an empty sentence
+    :param original_text_tokens: a tuple of sentences with tokens
+    :param suspicious_text_tokens: a tuple of sentences with tokens
+    :param plagiarism_threshold: a threshold
+    :return: a dictionary of accumulate_diff_stats with edit scripts for each pair of sentences
+    {'text_plagiarism': float,
+     'sentence_plagiarism': list,
+     'sentence_lcs_length': list,
+     'difference_indexes': list,
+     'edit_scripts': list}
+    """
+    if not isinstance(original_text_tokens, tuple) or not isinstance(suspicious_text_tokens, tuple) or \
+            not isinstance(plagiarism_threshold, float) or not 0 <= plagiarism_threshold <= 1:
+        return {}
+    diff_stats = {'text_plagiarism': 0.0, 'sentence_plagiarism': [], 'sentence_lcs_length': [],
+                  'difference_indexes': [], 'edit_scripts': []}
+    for number, suspicious_sentence in enumerate(suspicious_text_tokens):
+        original_sentence = original_text_tokens[number] if number < len(original_text_tokens) else ()
+        edit_script = find_edit_script(original_sentence, suspicious_sentence)
+        if not edit_script and (original_sentence or suspicious_sentence):
+            return {}
+        lcs_length = sum(run[2] - run[1] for run in edit_script if run[0] == EQUAL)
+        plagiarism_score = lcs_length / len(suspicious_sentence) if suspicious_sentence else 0.0
+        if plagiarism_score < plagiarism_threshold:
+            lcs_length = 0
+            plagiarism_score = 0.0
+        diff_stats['sentence_plagiarism'].append(plagiarism_score)
+        diff_stats['sentence_lcs_length'].append(lcs_length)
+        diff_stats['difference_indexes'].append(edit_script_to_diff_indexes(edit_script))
+        diff_stats['edit_scripts'].append(edit_script)
+    if suspicious_text_tokens:
+        diff_stats['text_plagiarism'] = sum(diff_stats['sentence_plagiarism']) / len(suspicious_text_tokens)
+    return diff_stats
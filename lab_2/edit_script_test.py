@@ -0,0 +1,104 @@
+"""
+Tests edit scripts of sentences
+"""
+
+import random
+import unittest
+from lab_2.main import find_lcs_length, create_diff_report
+from lab_2.edit_script import find_edit_script, edit_script_to_diff_indexes, accumulate_diff_stats_by_edit_script
+
+
+class EditScriptTest(unittest.TestCase):
+    """
+    Checks for find_edit_script, edit_script_to_diff_indexes and accumulate_diff_stats_by_edit_script functions
+    """
+
+    def test_find_edit_script_ideal(self):
+        """
+        Tests that runs of every operation are found
+        """
+        original = ('the', 'cat', 'sleeps', 'on', 'the', 'mat')
+        suspicious = ('a', 'the', 'dog', 'sleeps', 'the', 'mat', 'now')
+        expected = (('insert', 0, 0, 0, 1), ('equal', 0, 1, 1, 2), ('replace', 1, 2, 2, 3), ('equal', 2, 3, 3, 4),
+                    ('delete', 3, 4, 4, 4), ('equal', 4, 6, 4, 6), ('insert', 6, 6, 6, 7))
+        self.assertEqual(expected, find_edit_script(original, suspicious))
+
+    def test_find_edit_script_empty_sentences(self):
+        """
+        Tests that an empty sentence gives one insert or delete run
+        """
+        self.assertEqual((), find_edit_script((), ()))
+        self.assertEqual((('insert', 0, 0, 0, 2),), find_edit_script((), ('a', 'cat')))
+        self.assertEqual((('delete', 0, 2, 0, 0),), find_edit_script(('a', 'cat'), ()))
+        self.assertEqual((('replace', 0, 1, 0, 2),), find_edit_script(('dog',), ('a', 'cat')))
+
+    def test_find_edit_script_follows_lcs(self):
+        """
+        Tests that equal runs give a longest common subsequence and the runs cover both sentences
+        """
+        generator = random.Random(40)
+        for _ in range(200):
+            original = tuple(generator.choice('abcd') for _ in range(generator.randint(0, 12)))
+            suspicious = tuple(generator.choice('abcd') for _ in range(generator.randint(0, 12)))
+            edit_script = find_edit_script(original, suspicious)
+            lcs = tuple(token for run in edit_script if run[0] == 'equal' for token in original[run[1]:run[2]])
+            self.assertEqual(find_lcs_length(original, suspicious, 0.0), len(lcs))
+            self.assertEqual(tuple(token for run in edit_script if run[0] == 'equal'
+                                   for token in suspicious[run[3]:run[4]]), lcs)
+            ends = (0, 0)
+            for run in edit_script:
+                self.assertEqual(ends, (run[1], run[3]))
+                ends = (run[2], run[4])
+            self.assertEqual((len(original), len(suspicious)), ends)
+
+    def test_edit_script_to_diff_indexes(self):
+        """
+        Tests that indexes of changed parts are found for each sentence
+        """
+        original = ('her', 'body', 'is', 'covered', 'with', 'bushy', 'white', 'fur')
+        suspicious = ('his', 'body', 'is', 'covered', 'with', 'shiny', 'black', 'fur')
+        expected = ((0, 1, 5, 7), (0, 1, 5, 7))
+        self.assertEqual(expected, edit_script_to_diff_indexes(find_edit_script(original, suspicious)))
+        expected = ((1, 2), (2, 4))
+        self.assertEqual(expected, edit_script_to_diff_indexes(find_edit_script(('a', 'b', 'c'),
+                                                                                ('a', 'c', 'd', 'e'))))
+
+    def test_accumulate_diff_stats_by_edit_script_report(self):
+        """
+        Tests that create_diff_report renders the statistics as the example report
+        """
+        original_text = (('i', 'have', 'a', 'cat'),
+                         ('its', 'body', 'is', 'covered', 'with', 'bushy', 'white', 'fur'))
+        suspicious_text = (('i', 'have', 'a', 'cat'),
+                           ('its', 'body', 'is', 'covered', 'with', 'shiny', 'black', 'fur'))
+        diff_stats = accumulate_diff_stats_by_edit_script(original_text, suspicious_text)
+        self.assertEqual([4, 6], diff_stats['sentence_lcs_length'])
+        self.assertEqual([1.0, 0.75], diff_stats['sentence_plagiarism'])
+        self.assertEqual(0.875, diff_stats['text_plagiarism'])
+        with open('lab_2/diff_report_example.txt', encoding='utf-8') as example:
+            expected = example.read()
+        self.assertEqual(expected.split(), create_diff_report(original_text, suspicious_text, diff_stats).split())
+
+    def test_accumulate_diff_stats_by_edit_script_threshold(self):
+        """
+        Tests that sentences below the threshold and sentences without an original one get zero scores
+        """
+        diff_stats = accumulate_diff_stats_by_edit_script((('a', 'b', 'c', 'd'),), (('a', 'x', 'y', 'z'), ('b',)))
+        self.assertEqual([0, 0], diff_stats['sentence_lcs_length'])
+        self.assertEqual([0.0, 0.0], diff_stats['sentence_plagiarism'])
+        self.assertEqual([(('insert', 0, 0, 0, 1),)], diff_stats['edit_scripts'][1:])
+
+    def test_edit_script_incorrect_inputs(self):
+        """
+        Tests that the functions can handle incorrect inputs
+        """
+        for bad_input in [[], {}, '', 9.22, None, True, (None,)]:
+            self.assertEqual((), find_edit_script(bad_input, ('a',)))
+            self.assertEqual((), find_edit_script(('a',), bad_input))
+            self.assertEqual({}, accumulate_diff_stats_by_edit_script((('a',),), (bad_input,)))
+        self.assertEqual((), edit_script_to_diff_indexes([]))
+        self.assertEqual({}, accumulate_diff_stats_by_edit_script((), (), 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Binary storage of encoded corpora: a fixed header followed by uint32 token ids
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from lab_2.main import tokenize_big_file
+
+MAGIC = b'LCSIDS'
+VERSION = 1
+# magic, format version, number of ids; 16 bytes keep the id array 4-byte aligned
+HEADER = struct.Struct('<6sHQ')
+
+
+def save_encoded_corpus(token_ids, path_to_file: str) -> int:
+    """
+    Writes token ids into a binary file: the header and a little-endian uint32 array
+    :param token_ids: a sequence of non-negative ids
+    :param path_to_file: a path to the binary file
+    :return: 0 if succeeds, 1 if not
+    """
+    if not isinstance(token_ids, (tuple, memoryview, array)) or not isinstance(path_to_file, str):
+        return 1
+    try:
+        ids = array('I', token_ids)
+    except (TypeError, OverflowError):
+        return 1
+    if sys.byteorder != 'little':
+        ids.byteswap()
+    with open(path_to_file, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, VERSION, len(ids)))
+        ids.tofile(out)
+    return 0
+
+
+def load_encoded_corpus(path_to_file: str):
+    """
+    Memory-maps a binary file written by save_encoded_corpus
+    The ids are not copied: slices of the result are views over the mapped file
+    :param path_to_file: a path to the binary file
+    :return: a memoryview of uint32 ids, () if the file is not an encoded corpus
+    """
+    if not isinstance(path_to_file, str) or not os.path.isfile(path_to_file):
+        return ()
+    with open(path_to_file, 'rb') as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return ()
+        magic, version, ids_count = HEADER.unpack(header)
+        end = HEADER.size + ids_count * 4
+        if magic != MAGIC or version != VERSION or os.fstat(file.fileno()).st_size < end:
+            return ()
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    ids = memoryview(mapped)[HEADER.size:end].cast('I')
+    if sys.byteorder != 'little':
+        swapped = array('I', ids)
+        swapped.byteswap()
+        return memoryview(swapped)
+    return ids
+
+
+def encode_big_file(path_to_file: str, path_to_encoded: str):
+    """
+    Tokenizes a big file once and reuses the binary file on the next runs
+    The binary file is rebuilt when the text file is newer
+    :param path_to_file: a path to the text file
+    :param path_to_encoded: a path to the binary file
+    :return: a memoryview of uint32 ids
+    """
+    if not isinstance(path_to_file, str) or not isinstance(path_to_encoded, str):
+        return ()
+    if os.path.isfile(path_to_encoded) and \
+            os.path.getmtime(path_to_encoded) >= os.path.getmtime(path_to_file):
+        ids = load_encoded_corpus(path_to_encoded)
+        if isinstance(ids, memoryview):
+            return ids
+    if save_encoded_corpus(tokenize_big_file(path_to_file), path_to_encoded):
+        return ()
+    return load_encoded_corpus(path_to_encoded)
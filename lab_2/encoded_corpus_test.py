@@ -0,0 +1,94 @@
+"""
+Tests binary storage of encoded corpora
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from lab_2.encoded_corpus import save_encoded_corpus, load_encoded_corpus, encode_big_file
+from lab_2.main import find_lcs_length, find_lcs_length_optimized, fill_lcs_matrix, find_lcs
+
+
+class EncodedCorpusTest(unittest.TestCase):
+    """
+    Checks for save_encoded_corpus, load_encoded_corpus and encode_big_file functions
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'ids.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_and_load_ideal(self):
+        """
+        Tests that saved ids are loaded back as a memoryview
+        """
+        ids = (0, 1, 2, 1, 3, 70000)
+        self.assertEqual(0, save_encoded_corpus(ids, self.path))
+        actual = load_encoded_corpus(self.path)
+        self.assertIsInstance(actual, memoryview)
+        self.assertEqual(ids, tuple(actual))
+        self.assertEqual((1, 2, 1), tuple(actual[1:4]))
+
+    def test_save_empty(self):
+        """
+        Tests that an empty corpus is stored and loaded
+        """
+        self.assertEqual(0, save_encoded_corpus((), self.path))
+        self.assertEqual((), tuple(load_encoded_corpus(self.path)))
+
+    def test_save_incorrect_inputs(self):
+        """
+        Tests that save_encoded_corpus can handle incorrect inputs
+        """
+        bad_inputs = [[], {}, '', 9.22, -1, None, True, (None, None), (-1, 2)]
+        for bad_input in bad_inputs:
+            self.assertEqual(1, save_encoded_corpus(bad_input, self.path))
+        self.assertEqual(1, save_encoded_corpus((1, 2), None))
+
+    def test_load_incorrect_file(self):
+        """
+        Tests that load_encoded_corpus rejects missing and foreign files
+        """
+        self.assertEqual((), load_encoded_corpus(self.path))
+        self.assertEqual((), load_encoded_corpus(None))
+        with open(self.path, 'wb') as out:
+            out.write(b'not an encoded corpus at all')
+        self.assertEqual((), load_encoded_corpus(self.path))
+
+    def test_lcs_functions_take_slices(self):
+        """
+        Tests that lcs functions work on loaded slices without conversion
+        """
+        save_encoded_corpus((1, 2, 3, 4, 1, 5, 3, 4), self.path)
+        ids = load_encoded_corpus(self.path)
+        first, second = ids[:4], ids[4:]
+        self.assertEqual(3, find_lcs_length(first, second, 0.3))
+        self.assertEqual(3, find_lcs_length_optimized(first, second, 0.3))
+        self.assertEqual((1, 3, 4), find_lcs(first, second, fill_lcs_matrix(first, second)))
+
+    def test_encode_big_file_reuses_binary_file(self):
+        """
+        Tests that encode_big_file tokenizes a text once and then reads the binary file
+        """
+        path_to_text = os.path.join(self.directory, 'text.txt')
+        with open(path_to_text, 'w', encoding='utf-8') as out:
+            out.write('the cat\nthe dog and the cat\n')
+        current_directory = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            first = tuple(encode_big_file(path_to_text, self.path))
+            os.remove('id.pkl')
+            second = tuple(encode_big_file(path_to_text, self.path))
+        finally:
+            os.chdir(current_directory)
+        self.assertEqual((0, 1, 0, 2, 3, 0, 1), first)
+        self.assertEqual(first, second)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'id.pkl')))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Cache of lcs results for pairs of sentences keyed by a hash of their content
+"""
+import shelve
+from collections import OrderedDict
+from hashlib import blake2b
+
+from lab_2.main import TOKEN_SEQUENCES, fill_lcs_matrix, find_lcs, find_lcs_length
+
+
+def calculate_pair_key(kind: str, first_sentence_tokens, second_sentence_tokens, *parameters) -> str:
+    """
+    Calculates a key of a pair of sentences
+    :param kind: a name of the cached value
+    :param first_sentence_tokens: a tuple of tokens
+    :param second_sentence_tokens: a tuple of tokens
+    :param parameters: other arguments the value depends on
+    :return: a hex digest
+    """
+    content = repr((kind, tuple(first_sentence_tokens), tuple(second_sentence_tokens)) + parameters)
+    return blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class LcsCache:
+    """
+    Keeps lcs lengths and lcs of recently seen pairs of sentences, the least recently used are dropped first
+    With a path to a storage the results are also written to disk
+    and read from it when they are not in memory, e.g. after a restart of the process
+    """
+
+    def __init__(self, capacity: int = 100000, path_to_storage: str = None):
+        self.capacity = capacity
+        self.results = OrderedDict()
+        self.is_persistent = bool(path_to_storage)
+        self.storage = shelve.open(path_to_storage) if self.is_persistent else {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception_info):
+        self.close()
+
+    def close(self):
+        """
+        Writes the storage to disk and closes it
+        """
+        if self.is_persistent:
+            self.storage.close()
+            self.is_persistent = False
+            self.storage = {}
+
+    def _get_or_calculate(self, key: str, calculate):
+        if key in self.results:
+            self.hits += 1
+            self.results.move_to_end(key)
+            return self.results[key]
+        if key in self.storage:
+            self.disk_hits += 1
+            value = self.storage[key]
+        else:
+            self.misses += 1
+            value = calculate()
+            if self.is_persistent:
+                self.storage[key] = value
+        self.results[key] = value
+        if len(self.results) > self.capacity:
+            self.results.popitem(last=False)
+        return value
+
+    def find_lcs_length(self, first_sentence_tokens: tuple, second_sentence_tokens: tuple,
+                        plagiarism_threshold: float) -> int:
+        """
+        Finds a length of the longest common subsequence as lab_2.main.find_lcs_length does
+        :param first_sentence_tokens: a tuple of tokens
+        :param second_sentence_tokens: a tuple of tokens
+        :param plagiarism_threshold: a threshold
+        :return: a length of the longest common subsequence
+        """
+        if not isinstance(first_sentence_tokens, TOKEN_SEQUENCES) or \
+                not isinstance(second_sentence_tokens, TOKEN_SEQUENCES) or \
+                not isinstance(plagiarism_threshold, float):
+            return -1
+        if None in first_sentence_tokens or None in second_sentence_tokens or not 0 <= plagiarism_threshold <= 1:
+            return -1
+        key = calculate_pair_key('lcs_length', first_sentence_tokens, second_sentence_tokens, plagiarism_threshold)
+        return self._get_or_calculate(key, lambda: find_lcs_length(first_sentence_tokens, second_sentence_tokens,
+                                                                   plagiarism_threshold))
+
+    def find_lcs(self, first_sentence_tokens: tuple, second_sentence_tokens: tuple) -> tuple:
+        """
+        Finds the longest common subsequence filling the lcs matrix as lab_2.main.find_lcs does
+        :param first_sentence_tokens: a tuple of tokens
+        :param second_sentence_tokens: a tuple of tokens
+        :return: the longest common subsequence
+        """
+        if not isinstance(first_sentence_tokens, TOKEN_SEQUENCES) or \
+                not isinstance(second_sentence_tokens, TOKEN_SEQUENCES):
+            return ()
+        key = calculate_pair_key('lcs', first_sentence_tokens, second_sentence_tokens)
+        return self._get_or_calculate(key, lambda: find_lcs(first_sentence_tokens, second_sentence_tokens,
+                                                            fill_lcs_matrix(first_sentence_tokens,
+                                                                            second_sentence_tokens)))
@@ -0,0 +1,81 @@
+"""
+Tests LcsCache class
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from lab_2.lcs_cache import LcsCache
+
+
+class LcsCacheTest(unittest.TestCase):
+    """
+    Checks for LcsCache class
+    """
+
+    def setUp(self):
+        self.first_sentence = ('the', 'cat', 'is', 'sleeping')
+        self.second_sentence = ('the', 'dog', 'is', 'sleeping')
+        self.third_sentence = ('a', 'dog', 'is', 'running')
+
+    def test_lcs_cache_hits_and_misses(self):
+        """
+        Tests that repeated pairs are taken from the cache
+        """
+        cache = LcsCache()
+        self.assertEqual(3, cache.find_lcs_length(self.first_sentence, self.second_sentence, 0.3))
+        self.assertEqual(3, cache.find_lcs_length(self.first_sentence, self.second_sentence, 0.3))
+        self.assertEqual(('the', 'is', 'sleeping'), cache.find_lcs(self.first_sentence, self.second_sentence))
+        self.assertEqual(('the', 'is', 'sleeping'), cache.find_lcs(self.first_sentence, self.second_sentence))
+        self.assertEqual(0, cache.find_lcs_length(self.first_sentence, self.second_sentence, 0.9))
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(3, cache.misses)
+
+    def test_lcs_cache_drops_least_recently_used(self):
+        """
+        Tests that the cache keeps at most capacity results
+        """
+        cache = LcsCache(capacity=2)
+        cache.find_lcs(self.first_sentence, self.second_sentence)
+        cache.find_lcs(self.first_sentence, self.third_sentence)
+        cache.find_lcs(self.first_sentence, self.second_sentence)
+        cache.find_lcs(self.second_sentence, self.third_sentence)
+        self.assertEqual(2, len(cache.results))
+        cache.find_lcs(self.first_sentence, self.second_sentence)
+        self.assertEqual(2, cache.hits)
+        cache.find_lcs(self.first_sentence, self.third_sentence)
+        self.assertEqual(4, cache.misses)
+
+    def test_lcs_cache_storage_survives_restart(self):
+        """
+        Tests that results written to disk are read by a new cache
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'lcs_cache')
+            with LcsCache(path_to_storage=path) as cache:
+                cache.find_lcs_length(self.first_sentence, self.second_sentence, 0.3)
+            with LcsCache(path_to_storage=path) as cache:
+                self.assertEqual(3, cache.find_lcs_length(self.first_sentence, self.second_sentence, 0.3))
+                self.assertEqual((1, 0), (cache.disk_hits, cache.misses))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_lcs_cache_incorrect_inputs(self):
+        """
+        Tests that the cache can handle incorrect inputs without storing them
+        """
+        cache = LcsCache()
+        for bad_input in [[], {}, '', 9.22, None, True]:
+            self.assertEqual(-1, cache.find_lcs_length(bad_input, self.first_sentence, 0.3))
+            self.assertEqual((), cache.find_lcs(self.first_sentence, bad_input))
+        self.assertEqual(-1, cache.find_lcs_length(self.first_sentence, self.first_sentence, 1))
+        for bad_threshold in [-0.1, 1.5, float('nan')]:
+            self.assertEqual(-1, cache.find_lcs_length(self.first_sentence, self.first_sentence, bad_threshold))
+        self.assertEqual(-1, cache.find_lcs_length(self.first_sentence, ('a', None), 0.3))
+        self.assertEqual((0, 0), (cache.misses, len(cache.results)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests LcsMatrix class and compact lcs matrices
+"""
+
+import random
+import unittest
+from lab_2.main import LcsMatrix, create_zero_matrix, fill_lcs_matrix, find_lcs, find_lcs_length
+
+
+class LcsMatrixTest(unittest.TestCase):
+    """
+    Checks for LcsMatrix class and the compact option of create_zero_matrix and fill_lcs_matrix
+    """
+
+    def test_create_zero_matrix_compact(self):
+        """
+        Tests that a compact zero matrix keeps 2 bytes per cell
+        """
+        matrix = create_zero_matrix(3, 4, compact=True)
+        self.assertIsInstance(matrix, LcsMatrix)
+        self.assertEqual(2, matrix.cells.itemsize)
+        self.assertEqual(12, len(matrix.cells))
+        self.assertEqual([[0] * 4] * 3, matrix.to_list())
+        self.assertEqual([], create_zero_matrix(0, 4, compact=True))
+        self.assertEqual([], create_zero_matrix(3, -1, compact=True))
+
+    def test_lcs_matrix_rows_are_views(self):
+        """
+        Tests that writing into a row changes the matrix
+        """
+        matrix = LcsMatrix(2, 3)
+        matrix[1][2] = 5
+        matrix[-2][0] = 1
+        self.assertEqual([[1, 0, 0], [0, 0, 5]], matrix.to_list())
+        self.assertEqual(2, len(matrix))
+        with self.assertRaises(IndexError):
+            matrix[2].tolist()
+
+    def test_fill_lcs_matrix_compact_ideal(self):
+        """
+        Tests that the compact matrix has the same values as the list of lists
+        """
+        generator = random.Random(34)
+        for _ in range(50):
+            first = tuple(generator.choice('abcd') for _ in range(generator.randint(1, 10)))
+            second = tuple(generator.choice('abcd') for _ in range(generator.randint(1, 10)))
+            expected = fill_lcs_matrix(first, second)
+            actual = fill_lcs_matrix(first, second, compact=True)
+            self.assertEqual(expected, actual.to_list())
+            self.assertEqual(find_lcs(first, second, expected), find_lcs(first, second, actual))
+
+    def test_fill_lcs_matrix_match_in_first_column(self):
+        """
+        Tests that a match in the first column does not take the last cell of the previous row
+        """
+        expected = [[0, 0, 1], [1, 1, 1], [1, 1, 1]]
+        self.assertEqual(expected, fill_lcs_matrix(('b', 'a', 'x'), ('a', 'c', 'b')))
+        self.assertEqual(1, find_lcs_length(('b', 'a', 'x'), ('a', 'c', 'b'), 0.3))
+
+    def test_find_lcs_length_longer_first_sentence(self):
+        """
+        Tests that the whole matrix is taken into account when the first sentence is longer
+        """
+        self.assertEqual(2, find_lcs_length(('x', 'y', 'z', 'a', 'b'), ('a', 'b'), 0.3))
+
+    def test_find_lcs_length_equals_last_cell(self):
+        """
+        Tests that the length found with two rows is the last cell of the filled matrix
+        """
+        generator = random.Random(35)
+        for _ in range(50):
+            first = tuple(generator.choice('abcd') for _ in range(generator.randint(1, 12)))
+            second = tuple(generator.choice('abcd') for _ in range(generator.randint(1, 12)))
+            expected = fill_lcs_matrix(first, second)
+            self.assertEqual([expected[-1]], fill_lcs_matrix(first, second, last_row_only=True))
+            self.assertEqual(expected[-1][-1], find_lcs_length(first, second, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,18 @@
 """
 Longest common subsequence problem
 """
+import html
+import io
+import json
 import pickle
 import os
 import re
+from array import array
 from lab_2.tokenizer import tokenize
 
+# besides tuples of tokens, the lcs functions take arrays of ids and memoryview slices of them
+TOKEN_SEQUENCES = (tuple, array, memoryview)
+
 
 def tokenize_by_lines(text: str) -> tuple:
     """
@@ -25,18 +32,55 @@ def tokenize_by_lines(text: str) -> tuple:
     return tuple(tokens)
 
 
-def create_zero_matrix(rows: int, columns: int) -> list:
+class LcsMatrix:  # pylint: disable=too-few-public-methods
+    """
+    A matrix of lcs lengths stored in one flat array of unsigned ints:
+    2 bytes per cell while a lcs can not exceed 65535, 4 bytes otherwise,
+    instead of a pointer and an int object per cell in a list of lists
+    Rows are memoryviews over the array, so writing into a row changes the matrix
+    """
+
+    def __init__(self, rows: int, columns: int):
+        self.rows = rows
+        self.columns = columns
+        self.cells = array('H' if min(rows, columns) < 2 ** 16 else 'I', [0]) * (rows * columns)
+        self._view = memoryview(self.cells)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row: int) -> memoryview:
+        if not isinstance(row, int):
+            raise TypeError('row index must be int')
+        if row < 0:
+            row += self.rows
+        if not 0 <= row < self.rows:
+            raise IndexError('row index out of range')
+        return self._view[row * self.columns:(row + 1) * self.columns]
+
+    def to_list(self) -> list:
+        """
+        Converts the matrix into a list of lists
+        :return: a matrix as create_zero_matrix makes it
+        """
+        return [self[row].tolist() for row in range(self.rows)]
+
+
+def create_zero_matrix(rows: int, columns: int, compact: bool = False) -> list:
     """
     Creates a matrix rows * columns where each element is zero
     :param rows: a number of rows
     :param columns: a number of columns
-    :return: a matrix with 0s
+    :param compact: True to store the matrix in an LcsMatrix
+    :return: a list of lists with 0s or, if compact, an LcsMatrix; an empty list for incorrect or empty sizes
     e.g. rows = 2, columns = 2
     --> [[0, 0], [0, 0]]
     """
     if not isinstance(rows, int) or not isinstance(columns, int) or \
             isinstance(rows, bool) or isinstance(columns, bool):
         return []
+    if compact:
+        return LcsMatrix(rows, columns) if rows > 0 and columns > 0 else []
     zero_matrix = []
     n_columns = [0] * columns
     if n_columns:
@@ -44,24 +88,39 @@ def create_zero_matrix(rows: int, columns: int) -> list:
     return zero_matrix
 
 
-def fill_lcs_matrix(first_sentence_tokens: tuple, second_sentence_tokens: tuple) -> list:
+def fill_lcs_matrix(first_sentence_tokens: tuple, second_sentence_tokens: tuple, compact: bool = False,
+                    last_row_only: bool = False) -> list:
     """
     Fills a longest common subsequence matrix using the Needleman–Wunsch algorithm
     :param first_sentence_tokens: a tuple of tokens
     :param second_sentence_tokens: a tuple of tokens
-    :return: a lcs matrix
+    :param compact: True to fill an LcsMatrix instead of a list of lists
+    :param last_row_only: True to keep two rows only and return a list with the last one
+    :return: a lcs matrix, a list of lists or an LcsMatrix
     """
-    if not isinstance(first_sentence_tokens, tuple) or not isinstance(second_sentence_tokens, tuple) or \
+    if not isinstance(first_sentence_tokens, TOKEN_SEQUENCES) or \
+            not isinstance(second_sentence_tokens, TOKEN_SEQUENCES) or \
             None in first_sentence_tokens or None in second_sentence_tokens:
         return []
-    lcs_matrix = create_zero_matrix(len(first_sentence_tokens), len(second_sentence_tokens))
+    if last_row_only:
+        lcs_matrix = create_zero_matrix(min(len(first_sentence_tokens), 2), len(second_sentence_tokens))
+    else:
+        lcs_matrix = create_zero_matrix(len(first_sentence_tokens), len(second_sentence_tokens), compact)
+    if not lcs_matrix:
+        return []
+    previous_row = [0] * len(second_sentence_tokens)
     for row, word_1 in enumerate(first_sentence_tokens):
+        current_row = lcs_matrix[row % 2 if last_row_only else row]
+        diagonal = left = 0
         for column, word_2 in enumerate(second_sentence_tokens):
             if word_1 == word_2:
-                lcs_matrix[row][column] = lcs_matrix[row - 1][column - 1] + 1
-            else:
-                lcs_matrix[row][column] = max((lcs_matrix[row][column - 1], lcs_matrix[row - 1][column]))
-    return lcs_matrix
+                left = diagonal + 1
+            elif previous_row[column] > left:
+                left = previous_row[column]
+            diagonal = previous_row[column]
+            current_row[column] = left
+        previous_row = current_row
+    return [previous_row] if last_row_only else lcs_matrix
 
 
 def find_lcs_length(first_sentence_tokens: tuple, second_sentence_tokens: tuple, plagiarism_threshold: float) -> int:
@@ -73,7 +132,8 @@ def find_lcs_length(first_sentence_tokens: tuple, second_sentence_tokens: tuple,
     :param plagiarism_threshold: a threshold
     :return: a length of the longest common subsequence
     """
-    if not isinstance(first_sentence_tokens, tuple) or not isinstance(second_sentence_tokens, tuple) or \
+    if not isinstance(first_sentence_tokens, TOKEN_SEQUENCES) or \
+            not isinstance(second_sentence_tokens, TOKEN_SEQUENCES) or \
             not isinstance(plagiarism_threshold, float):
         return -1
     if None in first_sentence_tokens or None in second_sentence_tokens or \
@@ -81,11 +141,7 @@ def find_lcs_length(first_sentence_tokens: tuple, second_sentence_tokens: tuple,
         return -1
     if len(first_sentence_tokens) == 0 or len(second_sentence_tokens) == 0:
         return 0
-    lcs_matrix = fill_lcs_matrix(first_sentence_tokens, second_sentence_tokens)
-    if len(first_sentence_tokens) > len(second_sentence_tokens):
-        lcs_length = max(lcs_matrix[len(second_sentence_tokens)-1])
-    else:
-        lcs_length = max(lcs_matrix[-1])
+    lcs_length = fill_lcs_matrix(first_sentence_tokens, second_sentence_tokens, last_row_only=True)[-1][-1]
     if lcs_length / len(second_sentence_tokens) < plagiarism_threshold:
         return 0
     return lcs_length
@@ -99,10 +155,11 @@ def find_lcs(first_sentence_tokens: tuple, second_sentence_tokens: tuple, lcs_ma
     :param lcs_matrix: a filled lcs matrix
     :return: the longest common subsequence
     """
-    if not isinstance(first_sentence_tokens, tuple) or not isinstance(second_sentence_tokens, tuple) or \
+    if not isinstance(first_sentence_tokens, TOKEN_SEQUENCES) or \
+            not isinstance(second_sentence_tokens, TOKEN_SEQUENCES) or \
             None in first_sentence_tokens or None in second_sentence_tokens:
         return ()
-    if not isinstance(lcs_matrix, list) or None in lcs_matrix or \
+    if not isinstance(lcs_matrix, (list, LcsMatrix)) or None in lcs_matrix or \
             (isinstance(lcs_matrix, list) and None in lcs_matrix):
         return ()
     if isinstance(lcs_matrix, list) and len(lcs_matrix) > 0:
@@ -243,7 +300,7 @@ def accumulate_diff_stats(original_text_tokens: tuple, suspicious_text_tokens: t
         for suspicious_number, suspicious_sentence in enumerate(suspicious_text_tokens):
             if original_number == suspicious_number:
                 lcs_length = int(find_lcs_length(original_sentence, suspicious_sentence, plagiarism_threshold))
-                lcs_matrix = fill_lcs_matrix(original_sentence, suspicious_sentence)
+                lcs_matrix = fill_lcs_matrix(original_sentence, suspicious_sentence, compact=True)
                 lcs = find_lcs(original_sentence, suspicious_sentence, lcs_matrix)
                 diff_stats['sentence_lcs_length'] += [lcs_length]
                 diff_stats['difference_indexes'] += [find_diff_in_sentence(original_sentence, suspicious_sentence, lcs)]
@@ -256,6 +313,107 @@ def accumulate_diff_stats(original_text_tokens: tuple, suspicious_text_tokens: t
     return diff_stats
 
 
+def _mark_differences(tokens: tuple, diff_indexes: tuple) -> list:
+    """
+    Places '|' markers before the tokens with the given indexes in one pass
+    :param tokens: a tuple of tokens
+    :param diff_indexes: indexes of the markers
+    :return: a list of tokens with markers
+    """
+    diff_indexes = sorted(diff_indexes)
+    marked_tokens = []
+    marker = 0
+    for index, token in enumerate(tokens):
+        while marker < len(diff_indexes) and diff_indexes[marker] <= index:
+            marked_tokens.append('|')
+            marker += 1
+        marked_tokens.append(token)
+    marked_tokens.extend('|' * (len(diff_indexes) - marker))
+    return marked_tokens
+
+
+def _generate_report_blocks(original_text_tokens: tuple, suspicious_text_tokens: tuple,
+                            accumulated_diff_stats: dict):
+    """
+    Yields a block of the report for every pair of sentences, one at a time
+    :param original_text_tokens: a tuple of sentences with tokens
+    :param suspicious_text_tokens: a tuple of sentences with tokens
+    :param accumulated_diff_stats: a dictionary with statistics for each pair of sentences
+    :return: a generator of dictionaries with marked sentences, lcs lengths and plagiarism percents
+    """
+    for number, suspicious_sentence in enumerate(suspicious_text_tokens):
+        if number < len(original_text_tokens):
+            original_sentence = original_text_tokens[number]
+        else:
+            original_sentence = ('',)
+        diff_indexes = accumulated_diff_stats['difference_indexes'][number] or ((), ())
+        yield {'original': _mark_differences(original_sentence, diff_indexes[0]),
+               'suspicious': _mark_differences(suspicious_sentence, diff_indexes[1]),
+               'lcs_length': accumulated_diff_stats['sentence_lcs_length'][number],
+               'plagiarism': accumulated_diff_stats['sentence_plagiarism'][number] * 100}
+
+
+def _mark_html(marked_tokens: list) -> str:
+    """
+    Replaces pairs of '|' markers with <mark> tags, escapes tokens
+    """
+    html_tokens = []
+    is_open = False
+    for token in marked_tokens:
+        if token == '|':
+            html_tokens.append('</mark>' if is_open else '<mark>')
+            is_open = not is_open
+        else:
+            html_tokens.append(html.escape(token))
+    if is_open:
+        html_tokens.append('</mark>')
+    return ' '.join(html_tokens)
+
+
+def write_diff_report(original_text_tokens: tuple, suspicious_text_tokens: tuple,
+                      accumulated_diff_stats: dict, out, report_format: str = 'text') -> int:
+    """
+    Writes a diff report into a file-like object as soon as each pair of sentences is processed
+    Formats:
+        'text' – the layout of create_diff_report, one line per sentence,
+        'html' – paragraphs with differences inside <mark> tags,
+        'json' – JSON lines: one object per pair of sentences and the last one with the text plagiarism
+    :param original_text_tokens: a tuple of sentences with tokens
+    :param suspicious_text_tokens: a tuple of sentences with tokens
+    :param accumulated_diff_stats: a dictionary with statistics for each pair of sentences
+    :param out: a file-like object with the write method
+    :param report_format: 'text', 'html' or 'json'
+    :return: 0 if succeeds, 1 if not
+    """
+    if not isinstance(original_text_tokens, tuple) or not isinstance(suspicious_text_tokens, tuple) or \
+            not isinstance(accumulated_diff_stats, dict) or not hasattr(out, 'write') or \
+            report_format not in ('text', 'html', 'json'):
+        return 1
+    blocks = _generate_report_blocks(original_text_tokens, suspicious_text_tokens, accumulated_diff_stats)
+    total_plagiarism_percent = accumulated_diff_stats['text_plagiarism'] * 100
+    if report_format == 'json':
+        for block in blocks:
+            out.write(json.dumps(block) + '\n')
+        out.write(json.dumps({'text_plagiarism': total_plagiarism_percent}) + '\n')
+    elif report_format == 'html':
+        out.write('<div class="diff-report">\n')
+        for block in blocks:
+            out.write('<p class="original">- {}</p>\n'.format(_mark_html(block['original'])))
+            out.write('<p class="suspicious">+ {}</p>\n'.format(_mark_html(block['suspicious'])))
+            out.write('<p class="score">lcs = {}, plagiarism = {}%</p>\n'.format(block['lcs_length'],
+                                                                               block['plagiarism']))
+        out.write('<p class="total">Text average plagiarism (words): {}%</p>\n</div>\n'.format(
+            total_plagiarism_percent))
+    else:
+        for block in blocks:
+            out.write('- {}\n+ {}\n\nlcs = {}, plagiarism = {}%\n\n'.format(' '.join(block['original']),
+                                                                          ' '.join(block['suspicious']),
+                                                                          block['lcs_length'],
+                                                                          block['plagiarism']))
+        out.write('Text average plagiarism (words): {}%'.format(total_plagiarism_percent))
+    return 0
+
+
 def create_diff_report(original_text_tokens: tuple, suspicious_text_tokens: tuple, accumulated_diff_stats: dict) -> str:
     """
     Creates a diff report for two texts comparing them line by line
@@ -264,36 +422,10 @@ def create_diff_report(original_text_tokens: tuple, suspicious_text_tokens: tupl
     :param accumulated_diff_stats: a dictionary with statistics for each pair of sentences
     :return: a report
     """
-    if not isinstance(original_text_tokens, tuple) or not isinstance(suspicious_text_tokens, tuple) or \
-            not isinstance(accumulated_diff_stats, dict):
+    report = io.StringIO()
+    if write_diff_report(original_text_tokens, suspicious_text_tokens, accumulated_diff_stats, report):
         return ''
-    if len(original_text_tokens) < len(suspicious_text_tokens):
-        original_text_tokens += tuple([tuple([''])]) * (len(suspicious_text_tokens) - len(original_text_tokens))
-    if len(original_text_tokens) > len(suspicious_text_tokens):
-        original_text_tokens = original_text_tokens[:len(suspicious_text_tokens)]
-    report = []
-    total_plagiarism_percent = accumulated_diff_stats['text_plagiarism'] * 100
-    for number in enumerate(suspicious_text_tokens):
-        number = number[0]
-        lcs_length = accumulated_diff_stats['sentence_lcs_length'][number]
-        plagiarism_percent = accumulated_diff_stats['sentence_plagiarism'][number] * 100
-        diff_indexes = accumulated_diff_stats['difference_indexes'][number]
-        changed_original = list(original_text_tokens[number])
-        changed_suspicious = list(suspicious_text_tokens[number])
-        if diff_indexes != ((), ()):
-            for element, indexes in enumerate(diff_indexes):
-                inserts = 0
-                for insert in indexes:
-                    if element == 0:
-                        changed_suspicious.insert(insert + inserts, '|')
-                    elif element == 1:
-                        changed_original.insert(insert + inserts, '|')
-                    inserts += 1
-        report.append('- ' + ' '.join(changed_original))
-        report.append('+ ' + ' '.join(changed_suspicious))
-        report.append('lcs = {}, plagiarism = {}%'.format(lcs_length, plagiarism_percent))
-    report.append('Text average plagiarism (words): {}%'.format(total_plagiarism_percent))
-    return ' '.join(report)
+    return report.getvalue()
 
 
 def find_lcs_length_optimized(first_sentence_tokens: tuple, second_sentence_tokens: tuple,
@@ -0,0 +1,168 @@
+"""
+Plagiarism checking from documents down to paragraphs and sentences
+"""
+import re
+from hashlib import blake2b
+
+from lab_2.main import tokenize_by_lines, find_lcs_length, calculate_plagiarism_score
+
+
+def split_into_paragraphs(text: str) -> tuple:
+    """
+    Splits a text into paragraphs by empty lines, paragraphs – into sentences with tokens
+    :param text: the initial text
+    :return: a tuple of paragraphs, each is a tuple of sentences with tokens
+    e.g. text = 'I have a cat.\nHis name is Bruno\n\nHe is grey'
+    --> ((('i', 'have', 'a', 'cat'), ('his', 'name', 'is', 'bruno')), (('he', 'is', 'grey'),))
+    """
+    if not isinstance(text, str):
+        return ()
+    paragraphs = (tokenize_by_lines(paragraph) for paragraph in re.split(r'\n\s*\n', text))
+    return tuple(paragraph for paragraph in paragraphs if paragraph)
+
+
+def calculate_content_hash(sentences: tuple) -> bytes:
+    """
+    Calculates a hash of tokenized sentences
+    :param sentences: a tuple of sentences with tokens
+    :return: a 16-byte digest
+    """
+    content = '\n'.join(' '.join(sentence) for sentence in sentences)
+    return blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+
+def calculate_jaccard_similarity(first_tokens: frozenset, second_tokens: frozenset) -> float:
+    """
+    Calculates the share of common tokens among all tokens of two blocks
+    :param first_tokens: a set of tokens
+    :param second_tokens: a set of tokens
+    :return: a similarity from 0 to 1
+    """
+    if not first_tokens and not second_tokens:
+        return 1.0
+    return len(first_tokens & second_tokens) / len(first_tokens | second_tokens)
+
+
+class PlagiarismHierarchy:
+    """
+    Compares texts paragraph by paragraph and descends to sentences only where paragraphs partially match:
+        a suspicious paragraph equal to any original one scores 1 without lcs,
+        other paragraphs are paired from the most similar pair, the nearest one on ties,
+        paragraphs with a Jaccard similarity below min_similarity score 0 without lcs.
+    Fingerprints of paragraphs and results for pairs of paragraphs are cached by content hashes and thresholds,
+    so checking a revised draft again computes lcs only for the changed paragraphs,
+    even if paragraphs were inserted or deleted before them
+    """
+
+    def __init__(self, plagiarism_threshold: float = 0.3, min_similarity: float = 0.1):
+        self.plagiarism_threshold = plagiarism_threshold
+        self.min_similarity = min_similarity
+        self.fingerprints = {}
+        self.paragraph_scores = {}
+        self.compared_sentences = 0
+
+    def clear_cache(self):
+        """
+        Forgets fingerprints and scores of paragraphs
+        """
+        self.fingerprints = {}
+        self.paragraph_scores = {}
+
+    def _get_fingerprint(self, paragraph: tuple) -> tuple:
+        content_hash = calculate_content_hash(paragraph)
+        if content_hash not in self.fingerprints:
+            self.fingerprints[content_hash] = frozenset(token for sentence in paragraph for token in sentence)
+        return content_hash, self.fingerprints[content_hash]
+
+    def _compare_sentences(self, original_paragraph: tuple, suspicious_paragraph: tuple) -> tuple:
+        scores = []
+        for number, suspicious_sentence in enumerate(suspicious_paragraph):
+            if number >= len(original_paragraph):
+                scores.append(0.0)
+                continue
+            original_sentence = original_paragraph[number]
+            if original_sentence == suspicious_sentence:
+                scores.append(1.0)
+                continue
+            self.compared_sentences += 1
+            lcs_length = find_lcs_length(original_sentence, suspicious_sentence, self.plagiarism_threshold)
+            scores.append(calculate_plagiarism_score(lcs_length, suspicious_sentence))
+        return tuple(scores)
+
+    def _compare_paragraphs(self, original_paragraph: tuple, suspicious_paragraph: tuple) -> tuple:
+        original_hash, original_tokens = self._get_fingerprint(original_paragraph)
+        suspicious_hash, suspicious_tokens = self._get_fingerprint(suspicious_paragraph)
+        if original_hash == suspicious_hash:
+            return (1.0,) * len(suspicious_paragraph)
+        key = (original_hash, suspicious_hash, self.plagiarism_threshold, self.min_similarity)
+        if key not in self.paragraph_scores:
+            if calculate_jaccard_similarity(original_tokens, suspicious_tokens) < self.min_similarity:
+                scores = (0.0,) * len(suspicious_paragraph)
+            else:
+                scores = self._compare_sentences(original_paragraph, suspicious_paragraph)
+            self.paragraph_scores[key] = scores
+        return self.paragraph_scores[key]
+
+    def _pair_paragraphs(self, original_paragraphs: tuple, suspicious_paragraphs: tuple) -> list:
+        """
+        Finds an original paragraph for every suspicious one: an equal paragraph by content hashes first,
+        then pairs of the rest from the most similar one, the nearest by position on ties
+        Pairs with a similarity below min_similarity are not made, they would score 0 anyway
+        :return: a list of indexes of original paragraphs, -1 for a suspicious paragraph without a pair
+        """
+        original_hashes = {}
+        for index, paragraph in enumerate(original_paragraphs):
+            original_hashes.setdefault(self._get_fingerprint(paragraph)[0], index)
+        pairs = [original_hashes.get(self._get_fingerprint(paragraph)[0], -1) for paragraph in suspicious_paragraphs]
+        unpaired = set(range(len(original_paragraphs))) - set(pairs)
+        candidates = []
+        for number, suspicious_paragraph in enumerate(suspicious_paragraphs):
+            if pairs[number] != -1:
+                continue
+            suspicious_tokens = self._get_fingerprint(suspicious_paragraph)[1]
+            for index in unpaired:
+                similarity = calculate_jaccard_similarity(self._get_fingerprint(original_paragraphs[index])[1],
+                                                          suspicious_tokens)
+                if similarity >= self.min_similarity:
+                    candidates.append((-similarity, abs(index - number), number, index))
+        for _, _, number, index in sorted(candidates):
+            if pairs[number] == -1 and index in unpaired:
+                pairs[number] = index
+                unpaired.remove(index)
+        return pairs
+
+    def compare(self, original_text: str, suspicious_text: str) -> dict:
+        """
+        Compares two texts paragraph by paragraph, paragraphs – sentence by sentence
+        :param original_text: the original text
+        :param suspicious_text: the suspicious text
+        :return: a dictionary with scores, an empty one for incorrect texts or thresholds
+        {'text_plagiarism': float,
+         'paragraph_plagiarism': list,
+         'sentence_plagiarism': list}
+        """
+        if not isinstance(original_text, str) or not isinstance(suspicious_text, str):
+            return {}
+        for threshold in (self.plagiarism_threshold, self.min_similarity):
+            if not isinstance(threshold, float) or not 0 <= threshold <= 1:
+                return {}
+        original_paragraphs = split_into_paragraphs(original_text)
+        suspicious_paragraphs = split_into_paragraphs(suspicious_text)
+        stats = {'text_plagiarism': 0.0, 'paragraph_plagiarism': [], 'sentence_plagiarism': []}
+        if not suspicious_paragraphs:
+            return stats
+        if original_paragraphs == suspicious_paragraphs:
+            stats['paragraph_plagiarism'] = [1.0] * len(suspicious_paragraphs)
+            stats['sentence_plagiarism'] = [1.0] * sum(len(paragraph) for paragraph in suspicious_paragraphs)
+            stats['text_plagiarism'] = 1.0
+            return stats
+        pairs = self._pair_paragraphs(original_paragraphs, suspicious_paragraphs)
+        for suspicious_paragraph, index in zip(suspicious_paragraphs, pairs):
+            if index != -1:
+                scores = self._compare_paragraphs(original_paragraphs[index], suspicious_paragraph)
+            else:
+                scores = (0.0,) * len(suspicious_paragraph)
+            stats['paragraph_plagiarism'].append(sum(scores) / len(scores))
+            stats['sentence_plagiarism'].extend(scores)
+        stats['text_plagiarism'] = sum(stats['sentence_plagiarism']) / len(stats['sentence_plagiarism'])
+        return stats
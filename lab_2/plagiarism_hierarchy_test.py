@@ -0,0 +1,117 @@
+"""
+Tests PlagiarismHierarchy class
+"""
+
+import unittest
+from lab_2.plagiarism_hierarchy import split_into_paragraphs, PlagiarismHierarchy
+
+
+ORIGINAL_TEXT = 'I have a cat.\nIts body is covered with bushy white fur.\n\n' \
+                'The weather is sunny.\nThe man is happy.\n\n' \
+                'Apples grow on trees.'
+
+
+class PlagiarismHierarchyTest(unittest.TestCase):
+    """
+    Checks for split_into_paragraphs function and PlagiarismHierarchy class
+    """
+
+    def test_split_into_paragraphs_ideal(self):
+        """
+        Tests that split_into_paragraphs splits by empty lines and skips empty paragraphs
+        """
+        text = 'I have a cat.\nHis name is Bruno\n\n\n  \nHe is grey'
+        expected = ((('i', 'have', 'a', 'cat'), ('his', 'name', 'is', 'bruno')), (('he', 'is', 'grey'),))
+        self.assertEqual(expected, split_into_paragraphs(text))
+        self.assertEqual((), split_into_paragraphs(None))
+
+    def test_compare_same_texts(self):
+        """
+        Tests that equal texts score 1 without lcs
+        """
+        hierarchy = PlagiarismHierarchy()
+        actual = hierarchy.compare(ORIGINAL_TEXT, ORIGINAL_TEXT)
+        self.assertEqual(1.0, actual['text_plagiarism'])
+        self.assertEqual([1.0] * 3, actual['paragraph_plagiarism'])
+        self.assertEqual([1.0] * 5, actual['sentence_plagiarism'])
+        self.assertEqual(0, hierarchy.compared_sentences)
+
+    def test_compare_partial_match(self):
+        """
+        Tests that only changed paragraphs are compared sentence by sentence
+        """
+        suspicious_text = 'I have a cat.\nIts body is covered with shiny black fur.\n\n' \
+                          'The weather is sunny.\nThe man is happy.\n\n' \
+                          'Rockets fly to distant planets.'
+        hierarchy = PlagiarismHierarchy()
+        actual = hierarchy.compare(ORIGINAL_TEXT, suspicious_text)
+        self.assertEqual([1.0, 0.75, 1.0, 1.0, 0.0], actual['sentence_plagiarism'])
+        self.assertEqual([0.875, 1.0, 0.0], actual['paragraph_plagiarism'])
+        self.assertAlmostEqual(3.75 / 5, actual['text_plagiarism'])
+        self.assertEqual(1, hierarchy.compared_sentences)
+
+    def test_compare_revised_draft_uses_cache(self):
+        """
+        Tests that checking a revised draft computes lcs only for the revised paragraph
+        """
+        first_draft = 'I have a cat.\nIts body is covered with shiny black fur.\n\n' \
+                      'The weather is rainy.\nThe man is sad.'
+        second_draft = 'I have a cat.\nIts body is covered with shiny black fur.\n\n' \
+                       'The weather is cloudy.\nThe man is sad.'
+        hierarchy = PlagiarismHierarchy()
+        hierarchy.compare(ORIGINAL_TEXT, first_draft)
+        self.assertEqual(3, hierarchy.compared_sentences)
+        hierarchy.compare(ORIGINAL_TEXT, second_draft)
+        self.assertEqual(5, hierarchy.compared_sentences)
+
+    def test_compare_inserted_and_deleted_paragraphs(self):
+        """
+        Tests that paragraphs after an inserted or deleted paragraph are matched by content
+        """
+        inserted = 'Rockets fly to distant planets.\n\n' + ORIGINAL_TEXT.replace('sunny', 'cloudy')
+        hierarchy = PlagiarismHierarchy()
+        actual = hierarchy.compare(ORIGINAL_TEXT, inserted)
+        self.assertEqual([0.0, 1.0, 1.0, 0.75, 1.0, 1.0], actual['sentence_plagiarism'])
+        self.assertEqual(1, hierarchy.compared_sentences)
+
+        deleted = 'The weather is sunny.\nThe man is sad.\n\nApples grow on trees.'
+        actual = hierarchy.compare(ORIGINAL_TEXT, deleted)
+        self.assertEqual([1.0, 0.75, 1.0], actual['sentence_plagiarism'])
+        self.assertEqual(2, hierarchy.compared_sentences)
+
+    def test_compare_cache_depends_on_thresholds(self):
+        """
+        Tests that cached scores of paragraphs are not reused for other thresholds
+        """
+        suspicious_text = 'I have a cat.\nIts body is covered with shiny black fur.'
+        hierarchy = PlagiarismHierarchy()
+        self.assertEqual([1.0, 0.75], hierarchy.compare(ORIGINAL_TEXT, suspicious_text)['sentence_plagiarism'])
+        hierarchy.plagiarism_threshold = 0.8
+        self.assertEqual([1.0, 0.0], hierarchy.compare(ORIGINAL_TEXT, suspicious_text)['sentence_plagiarism'])
+        hierarchy.min_similarity = 0.99
+        self.assertEqual([0.0, 0.0], hierarchy.compare(ORIGINAL_TEXT, suspicious_text)['sentence_plagiarism'])
+        self.assertEqual(2, hierarchy.compared_sentences)
+
+    def test_compare_incorrect_inputs(self):
+        """
+        Tests that compare can handle incorrect inputs
+        """
+        hierarchy = PlagiarismHierarchy()
+        for bad_input in [[], {}, (), 9.22, None, True]:
+            self.assertEqual({}, hierarchy.compare(bad_input, ORIGINAL_TEXT))
+            self.assertEqual({}, hierarchy.compare(ORIGINAL_TEXT, bad_input))
+        self.assertEqual(0.0, hierarchy.compare(ORIGINAL_TEXT, '')['text_plagiarism'])
+
+    def test_compare_incorrect_thresholds(self):
+        """
+        Tests that compare returns an empty dictionary instead of -1 scores for incorrect thresholds
+        """
+        for bad_threshold in [0, 1, -0.1, 1.5, None, '0.3', True]:
+            self.assertEqual({}, PlagiarismHierarchy(plagiarism_threshold=bad_threshold).compare(
+                'I have a cat.\nHe is grey', 'I have a dog.\nHe is grey'))
+            self.assertEqual({}, PlagiarismHierarchy(min_similarity=bad_threshold).compare(
+                'I have a cat.\nHe is grey', 'I have a dog.\nHe is grey'))
+
+
+if __name__ == "__main__":
+    unittest.main()
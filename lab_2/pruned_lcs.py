@@ -0,0 +1,107 @@
+"""
+Longest common subsequence with early exits:
+pruning by the plagiarism threshold and a banded algorithm for near duplicates
+"""
+from collections import Counter
+
+from lab_2.main import TOKEN_SEQUENCES
+
+
+def _check_sentences(first_sentence_tokens, second_sentence_tokens) -> bool:
+    return isinstance(first_sentence_tokens, TOKEN_SEQUENCES) and \
+           isinstance(second_sentence_tokens, TOKEN_SEQUENCES) and \
+           None not in first_sentence_tokens and None not in second_sentence_tokens
+
+
+def count_common_tokens(first_sentence_tokens: tuple, second_sentence_tokens: tuple) -> int:
+    """
+    Counts tokens the two sentences share, with repetitions
+    The number bounds the length of the longest common subsequence from above
+    :param first_sentence_tokens: a tuple of tokens
+    :param second_sentence_tokens: a tuple of tokens
+    :return: a number of common tokens
+    """
+    if not _check_sentences(first_sentence_tokens, second_sentence_tokens):
+        return -1
+    common_tokens = Counter(first_sentence_tokens) & Counter(second_sentence_tokens)
+    return sum(common_tokens.values())
+
+
+def find_lcs_length_pruned(first_sentence_tokens: tuple, second_sentence_tokens: tuple,
+                           plagiarism_threshold: float) -> int:
+    """
+    Finds a length of the longest common subsequence keeping two rows of the matrix
+    Stops as soon as the threshold can not be reached:
+        the lcs is at most the value of the current row at column m - r plus r,
+        where r is the number of the rows left and m is the length of the second sentence
+    :param first_sentence_tokens: a tuple of tokens
+    :param second_sentence_tokens: a tuple of tokens
+    :param plagiarism_threshold: a threshold
+    :return: a length of the longest common subsequence, 0 when it is less than the threshold
+    """
+    if not _check_sentences(first_sentence_tokens, second_sentence_tokens) or \
+            not isinstance(plagiarism_threshold, float) or not 0 <= plagiarism_threshold <= 1:
+        return -1
+    if not first_sentence_tokens or not second_sentence_tokens:
+        return 0
+    columns = len(second_sentence_tokens)
+    required_length = plagiarism_threshold * columns
+    if min(len(first_sentence_tokens), columns) < required_length or \
+            count_common_tokens(first_sentence_tokens, second_sentence_tokens) < required_length:
+        return 0
+    prev_row = [0] * (columns + 1)
+    cur_row = [0] * (columns + 1)
+    rows_left = len(first_sentence_tokens)
+    for token_1 in first_sentence_tokens:
+        prev_row, cur_row = cur_row, prev_row
+        for column, token_2 in enumerate(second_sentence_tokens):
+            if token_1 == token_2:
+                cur_row[column + 1] = prev_row[column] + 1
+            else:
+                cur_row[column + 1] = max(cur_row[column], prev_row[column + 1])
+        rows_left -= 1
+        if rows_left < columns:
+            upper_bound = cur_row[columns - rows_left] + rows_left
+        else:
+            upper_bound = columns
+        if upper_bound < required_length:
+            return 0
+    return cur_row[-1]
+
+
+def find_lcs_length_banded(first_sentence_tokens: tuple, second_sentence_tokens: tuple,
+                           max_distance: int) -> int:
+    """
+    Finds a length of the longest common subsequence of near duplicates (the Ukkonen band)
+    Two sentences are near duplicates when one turns into the other by
+    at most max_distance insertions and deletions of tokens, that is n + m - 2 * lcs <= max_distance.
+    Then the path of the lcs never leaves the diagonal band |i - j| <= max_distance
+    and only the cells of the band are filled: O((n + m) * max_distance) instead of O(n * m)
+    :param first_sentence_tokens: a tuple of tokens
+    :param second_sentence_tokens: a tuple of tokens
+    :param max_distance: a maximum number of insertions and deletions
+    :return: a length of the longest common subsequence, 0 when the sentences are not near duplicates
+    """
+    if not _check_sentences(first_sentence_tokens, second_sentence_tokens) or \
+            not isinstance(max_distance, int) or isinstance(max_distance, bool) or max_distance < 0:
+        return -1
+    rows = len(first_sentence_tokens)
+    columns = len(second_sentence_tokens)
+    if abs(rows - columns) > max_distance:
+        return 0
+    # cells outside the band keep values of earlier rows: they never exceed the real ones,
+    # and the cells on the lcs path are filled exactly
+    prev_row = [0] * (columns + 1)
+    cur_row = [0] * (columns + 1)
+    for row in range(1, rows + 1):
+        prev_row, cur_row = cur_row, prev_row
+        token_1 = first_sentence_tokens[row - 1]
+        for column in range(max(1, row - max_distance), min(columns, row + max_distance) + 1):
+            if token_1 == second_sentence_tokens[column - 1]:
+                cur_row[column] = prev_row[column - 1] + 1
+            else:
+                cur_row[column] = max(cur_row[column - 1], prev_row[column])
+    lcs_length = cur_row[columns] if rows else 0
+    if rows + columns - 2 * lcs_length > max_distance:
+        return 0
+    return lcs_length
@@ -0,0 +1,98 @@
+"""
+Tests pruned and banded lcs functions
+"""
+
+import random
+import unittest
+from lab_2.pruned_lcs import count_common_tokens, find_lcs_length_pruned, find_lcs_length_banded
+
+
+def reference_lcs_length(first_sentence_tokens, second_sentence_tokens):
+    """
+    Fills the whole lcs matrix
+    """
+    matrix = [[0] * (len(second_sentence_tokens) + 1) for _ in range(len(first_sentence_tokens) + 1)]
+    for row, token_1 in enumerate(first_sentence_tokens):
+        for column, token_2 in enumerate(second_sentence_tokens):
+            if token_1 == token_2:
+                matrix[row + 1][column + 1] = matrix[row][column] + 1
+            else:
+                matrix[row + 1][column + 1] = max(matrix[row][column + 1], matrix[row + 1][column])
+    return matrix[-1][-1]
+
+
+class PrunedLcsTest(unittest.TestCase):
+    """
+    Checks for count_common_tokens, find_lcs_length_pruned and find_lcs_length_banded functions
+    """
+
+    def setUp(self):
+        generator = random.Random(26)
+        self.pairs = []
+        for _ in range(200):
+            first = tuple(generator.choice('abcde') for _ in range(generator.randint(0, 12)))
+            second = tuple(generator.choice('abcde') for _ in range(generator.randint(0, 12)))
+            self.pairs.append((first, second))
+
+    def test_count_common_tokens_ideal(self):
+        """
+        Tests that common tokens are counted with repetitions
+        """
+        self.assertEqual(3, count_common_tokens(('a', 'b', 'a', 'c'), ('a', 'a', 'c', 'd')))
+        self.assertEqual(0, count_common_tokens((), ('a',)))
+
+    def test_find_lcs_length_pruned_ideal(self):
+        """
+        Tests that the pruned lcs equals the full one above the threshold and 0 below it
+        """
+        for threshold in (0.0, 0.3, 0.6, 1.0):
+            for first, second in self.pairs:
+                expected = reference_lcs_length(first, second)
+                if not second or expected < threshold * len(second):
+                    expected = 0
+                self.assertEqual(expected, find_lcs_length_pruned(first, second, threshold))
+
+    def test_find_lcs_length_pruned_stops_early(self):
+        """
+        Tests that a pair below the threshold is rejected before the matrix is filled
+        """
+        first = ('the', 'cat', 'is', 'sleeping') * 100
+        second = ('a', 'dog', 'was', 'running') * 100
+        self.assertEqual(0, find_lcs_length_pruned(first, second, 0.3))
+
+    def test_find_lcs_length_pruned_incorrect_inputs(self):
+        """
+        Tests that find_lcs_length_pruned can handle incorrect inputs
+        """
+        bad_inputs = [[], {}, '', 9.22, -1, 0, None, True, (None, None)]
+        patches_sentence = ('the', 'dog', 'is', 'running')
+        for bad_input in bad_inputs:
+            self.assertEqual(-1, find_lcs_length_pruned(bad_input, patches_sentence, 0.3))
+            self.assertEqual(-1, find_lcs_length_pruned(patches_sentence, bad_input, 0.3))
+        for bad_threshold in [None, 1, -0.5, 1.2, '0.3']:
+            self.assertEqual(-1, find_lcs_length_pruned(patches_sentence, patches_sentence, bad_threshold))
+
+    def test_find_lcs_length_banded_ideal(self):
+        """
+        Tests that the banded lcs is exact for near duplicates and 0 for other pairs
+        """
+        for max_distance in range(6):
+            for first, second in self.pairs:
+                expected = reference_lcs_length(first, second)
+                if len(first) + len(second) - 2 * expected > max_distance:
+                    expected = 0
+                self.assertEqual(expected, find_lcs_length_banded(first, second, max_distance))
+
+    def test_find_lcs_length_banded_incorrect_inputs(self):
+        """
+        Tests that find_lcs_length_banded can handle incorrect inputs
+        """
+        patches_sentence = ('the', 'dog', 'is', 'running')
+        for bad_input in [[], {}, '', None, True, (None, None)]:
+            self.assertEqual(-1, find_lcs_length_banded(bad_input, patches_sentence, 2))
+        for bad_distance in [None, True, -1, 2.0]:
+            self.assertEqual(-1, find_lcs_length_banded(patches_sentence, patches_sentence, bad_distance))
+
+
+if __name__ == "__main__":
+    unittest.main()
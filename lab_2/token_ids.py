@@ -0,0 +1,95 @@
+"""
+Comparison of texts by token ids from a shared vocabulary
+"""
+from lab_2.main import accumulate_diff_stats, calculate_text_plagiarism_score
+
+
+def encode_texts(original_text_tokens: tuple, suspicious_text_tokens: tuple, vocabulary: dict = None) -> tuple:
+    """
+    Replaces tokens of both texts with ids from a shared vocabulary
+    Ids follow the first occurrence of tokens as in tokenize_big_file
+    :param original_text_tokens: a tuple of sentences with tokens
+    :param suspicious_text_tokens: a tuple of sentences with tokens
+    :param vocabulary: a dictionary token: id to extend, a new one by default
+    :return: a tuple of the encoded original text, the encoded suspicious text and the vocabulary
+    e.g. original_text_tokens = (('i', 'have', 'a', 'cat'),), suspicious_text_tokens = (('i', 'have', 'a', 'dog'),)
+    --> (((0, 1, 2, 3),), ((0, 1, 2, 4),), {'i': 0, 'have': 1, 'a': 2, 'cat': 3, 'dog': 4})
+    """
+    if not isinstance(original_text_tokens, tuple) or not isinstance(suspicious_text_tokens, tuple) or \
+            not isinstance(vocabulary, (dict, type(None))):
+        return ()
+    if vocabulary is None:
+        vocabulary = {}
+    encoded_texts = []
+    for text in (original_text_tokens, suspicious_text_tokens):
+        encoded_text = []
+        for sentence in text:
+            if not isinstance(sentence, tuple):
+                return ()
+            for token in sentence:
+                if token not in vocabulary:
+                    vocabulary[token] = len(vocabulary)
+            encoded_text.append(tuple(vocabulary[token] for token in sentence))
+        encoded_texts.append(tuple(encoded_text))
+    return encoded_texts[0], encoded_texts[1], vocabulary
+
+
+def invert_vocabulary(vocabulary: dict) -> tuple:
+    """
+    Builds tokens in the order of their ids to decode many sentences with one vocabulary
+    :param vocabulary: a dictionary token: id with ids from 0
+    :return: a tuple where the token with an id is at the index of the id
+    """
+    if not isinstance(vocabulary, dict):
+        return ()
+    tokens = [''] * len(vocabulary)
+    for token, token_id in vocabulary.items():
+        tokens[token_id] = token
+    return tuple(tokens)
+
+
+def decode_sentence(sentence_ids: tuple, vocabulary) -> tuple:
+    """
+    Replaces ids with tokens, e.g. to show a longest common subsequence found by ids
+    A dictionary is inverted on every call, so sentences of a whole text are decoded with invert_vocabulary once:
+    tokens = invert_vocabulary(vocabulary); decode_sentence(sentence_ids, tokens)
+    :param sentence_ids: a tuple of ids
+    :param vocabulary: a dictionary token: id or a tuple of tokens by ids from invert_vocabulary
+    :return: a tuple of tokens
+    """
+    if not isinstance(sentence_ids, tuple) or not isinstance(vocabulary, (dict, tuple)):
+        return ()
+    tokens = invert_vocabulary(vocabulary) if isinstance(vocabulary, dict) else vocabulary
+    return tuple(tokens[token_id] for token_id in sentence_ids)
+
+
+def calculate_text_plagiarism_score_by_ids(original_text_tokens: tuple, suspicious_text_tokens: tuple,
+                                           plagiarism_threshold=0.3) -> float:
+    """
+    Calculates the plagiarism score as calculate_text_plagiarism_score does, comparing ids instead of strings
+    :param original_text_tokens: a tuple of sentences with tokens
+    :param suspicious_text_tokens: a tuple of sentences with tokens
+    :param plagiarism_threshold: a threshold
+    :return: a score from 0 to 1, where 0 means no plagiarism, 1 – the texts are the same
+    """
+    encoded_texts = encode_texts(original_text_tokens, suspicious_text_tokens)
+    if not encoded_texts:
+        return -1
+    return calculate_text_plagiarism_score(encoded_texts[0], encoded_texts[1], plagiarism_threshold)
+
+
+def accumulate_diff_stats_by_ids(original_text_tokens: tuple, suspicious_text_tokens: tuple,
+                                 plagiarism_threshold=0.3) -> dict:
+    """
+    Accumulates the statistics as accumulate_diff_stats does, comparing ids instead of strings
+    The statistics keep only lengths, scores and indexes,
+    so create_diff_report takes them together with the texts of tokens
+    :param original_text_tokens: a tuple of sentences with tokens
+    :param suspicious_text_tokens: a tuple of sentences with tokens
+    :param plagiarism_threshold: a threshold
+    :return: a dictionary of main statistics for each pair of sentences
+    """
+    encoded_texts = encode_texts(original_text_tokens, suspicious_text_tokens)
+    if not encoded_texts:
+        return {}
+    return accumulate_diff_stats(encoded_texts[0], encoded_texts[1], plagiarism_threshold)
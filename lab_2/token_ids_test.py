@@ -0,0 +1,78 @@
+"""
+Tests comparison of texts by token ids
+"""
+
+import unittest
+from lab_2.main import accumulate_diff_stats, calculate_text_plagiarism_score, create_diff_report, \
+    fill_lcs_matrix, find_lcs
+from lab_2.token_ids import encode_texts, invert_vocabulary, decode_sentence, \
+    calculate_text_plagiarism_score_by_ids, accumulate_diff_stats_by_ids
+
+
+class TokenIdsTest(unittest.TestCase):
+    """
+    Checks for encode_texts, decode_sentence and the functions comparing ids
+    """
+
+    def setUp(self):
+        self.original_text_tokens = (('i', 'have', 'a', 'cat'),
+                                     ('its', 'body', 'is', 'covered', 'with', 'bushy', 'white', 'fur'),
+                                     ('the', 'cat', 'is', 'sleeping'))
+        self.suspicious_text_tokens = (('i', 'have', 'a', 'cat'),
+                                       ('its', 'body', 'is', 'covered', 'with', 'shiny', 'black', 'fur'),
+                                       ('a', 'dog', 'is', 'running'))
+
+    def test_encode_texts_ideal(self):
+        """
+        Tests that both texts share ids in the order of the first occurrence
+        """
+        expected = (((0, 1, 2, 3),), ((0, 1, 2, 4),), {'i': 0, 'have': 1, 'a': 2, 'cat': 3, 'dog': 4})
+        actual = encode_texts((('i', 'have', 'a', 'cat'),), (('i', 'have', 'a', 'dog'),))
+        self.assertEqual(expected, actual)
+
+    def test_encode_texts_incorrect_inputs(self):
+        """
+        Tests that encode_texts can handle incorrect inputs
+        """
+        for bad_input in [[], {}, '', 9.22, None, True, ('cat',)]:
+            self.assertEqual((), encode_texts(bad_input, self.suspicious_text_tokens))
+            self.assertEqual((), encode_texts(self.original_text_tokens, bad_input))
+
+    def test_decode_sentence_ideal(self):
+        """
+        Tests that a lcs found by ids is decoded into tokens
+        """
+        encoded_texts = encode_texts(self.original_text_tokens, self.suspicious_text_tokens)
+        first_sentence, second_sentence = encoded_texts[0][1], encoded_texts[1][1]
+        lcs = find_lcs(first_sentence, second_sentence, fill_lcs_matrix(first_sentence, second_sentence))
+        self.assertEqual(('its', 'body', 'is', 'covered', 'with', 'fur'), decode_sentence(lcs, encoded_texts[2]))
+
+    def test_decode_sentence_by_inverted_vocabulary(self):
+        """
+        Tests that sentences are decoded with tokens by ids built once
+        """
+        encoded_texts = encode_texts(self.original_text_tokens, self.suspicious_text_tokens)
+        tokens = invert_vocabulary(encoded_texts[2])
+        self.assertEqual(len(encoded_texts[2]), len(tokens))
+        for text, encoded_text in zip((self.original_text_tokens, self.suspicious_text_tokens), encoded_texts):
+            self.assertEqual(text, tuple(decode_sentence(sentence_ids, tokens) for sentence_ids in encoded_text))
+        for bad_input in [[], '', 9.22, None, True]:
+            self.assertEqual((), invert_vocabulary(bad_input))
+            self.assertEqual((), decode_sentence((0, 1), bad_input))
+
+    def test_scores_by_ids_match_scores_by_tokens(self):
+        """
+        Tests that comparing ids gives the same scores and report as comparing tokens
+        """
+        self.assertEqual(calculate_text_plagiarism_score(self.original_text_tokens, self.suspicious_text_tokens),
+                         calculate_text_plagiarism_score_by_ids(self.original_text_tokens,
+                                                                self.suspicious_text_tokens))
+        expected = accumulate_diff_stats(self.original_text_tokens, self.suspicious_text_tokens)
+        actual = accumulate_diff_stats_by_ids(self.original_text_tokens, self.suspicious_text_tokens)
+        self.assertEqual(expected, actual)
+        self.assertEqual(create_diff_report(self.original_text_tokens, self.suspicious_text_tokens, expected),
+                         create_diff_report(self.original_text_tokens, self.suspicious_text_tokens, actual))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Longest common subsequence of two huge sequences on several processes:
+the lcs matrix is split into tiles, tiles of one anti-diagonal are independent and filled in parallel
+"""
+from array import array
+from multiprocessing import Pool, cpu_count
+from multiprocessing.shared_memory import SharedMemory
+
+from lab_2.main import TOKEN_SEQUENCES
+
+# a process keeps the sequences and views of the boundaries here, set once by _set_state
+_STATE = {}
+
+
+def _fill_tile(first_tokens, second_tokens, top_row, left_column) -> tuple:
+    """
+    Fills a tile of the lcs matrix keeping two rows
+    :param first_tokens: tokens of the rows of the tile
+    :param second_tokens: tokens of the columns of the tile
+    :param top_row: values of the row above the tile, starting with the corner
+    :param left_column: values of the column to the left of the tile, starting with the corner
+    :return: the bottom row and the right column, both starting with the corner
+    """
+    cur_row = list(top_row)
+    right_column = [cur_row[-1]]
+    for row, token_1 in enumerate(first_tokens, 1):
+        prev_row = cur_row
+        cur_row = [left_column[row]] * (len(second_tokens) + 1)
+        for column, token_2 in enumerate(second_tokens):
+            if token_1 == token_2:
+                cur_row[column + 1] = prev_row[column] + 1
+            else:
+                left_value = cur_row[column]
+                upper_value = prev_row[column + 1]
+                cur_row[column + 1] = left_value if left_value > upper_value else upper_value
+        right_column.append(cur_row[-1])
+    return cur_row, right_column
+
+
+def _set_state(first_tokens, second_tokens, tile_size: int, rows_name, columns_name):
+    """
+    Keeps the sequences and views of the boundaries in the process
+    Boundaries are given as names of shared memory blocks or as arrays when there is a single process
+    """
+    _STATE['first_tokens'] = first_tokens
+    _STATE['second_tokens'] = second_tokens
+    _STATE['tile_size'] = tile_size
+    for key, boundaries in (('rows', rows_name), ('columns', columns_name)):
+        if isinstance(boundaries, str):
+            _STATE[key + '_memory'] = SharedMemory(name=boundaries)
+            boundaries = _STATE[key + '_memory'].buf.cast('I')
+        _STATE[key] = boundaries
+
+
+def _run_tile(tile_row: int, tile_column: int):
+    """
+    Fills a tile reading its top and left boundaries and writing the bottom and right ones:
+        rows[k] keeps the matrix row at the bottom edge of the k-th band of tiles,
+        columns[k] keeps the matrix column at the right edge of the k-th band of tiles
+    """
+    first_tokens, second_tokens, tile_size = _STATE['first_tokens'], _STATE['second_tokens'], _STATE['tile_size']
+    row_start, column_start = tile_row * tile_size, tile_column * tile_size
+    row_end = min(row_start + tile_size, len(first_tokens))
+    column_end = min(column_start + tile_size, len(second_tokens))
+    rows_start = tile_row * (len(second_tokens) + 1) + column_start
+    columns_start = tile_column * (len(first_tokens) + 1) + row_start
+
+    bottom_row, right_column = _fill_tile(first_tokens[row_start:row_end], second_tokens[column_start:column_end],
+                                          _STATE['rows'][rows_start:rows_start + column_end - column_start + 1],
+                                          _STATE['columns'][columns_start:columns_start + row_end - row_start + 1])
+    rows_start += len(second_tokens) + 1
+    _STATE['rows'][rows_start:rows_start + len(bottom_row)] = array('I', bottom_row)
+    columns_start += len(first_tokens) + 1
+    _STATE['columns'][columns_start:columns_start + len(right_column)] = array('I', right_column)
+
+
+def _to_picklable(tokens):
+    if isinstance(tokens, memoryview):
+        return array(tokens.format, tokens)
+    return tokens
+
+
+def _fill_in_process(tokens: tuple, tile_size: int, diagonals: list, sizes: tuple) -> int:
+    _set_state(*tokens, tile_size, array('I', bytes(4 * sizes[0])), array('I', bytes(4 * sizes[1])))
+    for diagonal in diagonals:
+        for tile in diagonal:
+            _run_tile(*tile)
+    lcs_length = _STATE['rows'][-1]
+    _STATE.clear()
+    return lcs_length
+
+
+def _fill_in_processes(tokens: tuple, tile_size: int, diagonals: list, sizes: tuple, processes: int) -> int:
+    rows_memory = SharedMemory(create=True, size=4 * sizes[0])
+    columns_memory = SharedMemory(create=True, size=4 * sizes[1])
+    try:
+        for memory in (rows_memory, columns_memory):
+            memory.buf[:] = bytes(memory.size)
+        with Pool(processes, initializer=_set_state,
+                  initargs=(*tokens, tile_size, rows_memory.name, columns_memory.name)) as pool:
+            for diagonal in diagonals:
+                pool.starmap(_run_tile, diagonal)
+        rows = rows_memory.buf.cast('I')
+        lcs_length = rows[sizes[0] - 1]
+        rows.release()
+    finally:
+        for memory in (rows_memory, columns_memory):
+            memory.close()
+            memory.unlink()
+    return lcs_length
+
+
+def find_lcs_length_wavefront(first_sentence_tokens: tuple, second_sentence_tokens: tuple,
+                              plagiarism_threshold: float, processes: int = None, tile_size: int = 2000) -> int:
+    """
+    Finds a length of the longest common subsequence filling tiles of the matrix in parallel processes
+    Tiles with the same sum of tile indexes form an anti-diagonal and depend only on the previous one.
+    The boundaries between tiles are passed through shared memory, whole tiles are never stored.
+    The result equals find_lcs_length_optimized
+    When a length is less than the threshold, it becomes 0
+    :param first_sentence_tokens: a tuple of tokens
+    :param second_sentence_tokens: a tuple of tokens
+    :param plagiarism_threshold: a threshold
+    :param processes: a number of processes, all cores by default, 1 – no processes are started,
+        there are never more processes than tiles on the longest anti-diagonal
+    :param tile_size: a number of rows and columns in a tile
+    :return: a length of the longest common subsequence
+    """
+    if not isinstance(first_sentence_tokens, TOKEN_SEQUENCES) or \
+            not isinstance(second_sentence_tokens, TOKEN_SEQUENCES) or \
+            not isinstance(plagiarism_threshold, float) or not 0 <= plagiarism_threshold <= 1:
+        return -1
+    if not isinstance(processes, (int, type(None))) or isinstance(processes, bool) or \
+            processes is not None and processes < 1:
+        return -1
+    if not isinstance(tile_size, int) or isinstance(tile_size, bool) or tile_size < 1:
+        return -1
+    if not first_sentence_tokens or not second_sentence_tokens:
+        return 0
+    first_tokens = _to_picklable(first_sentence_tokens)
+    second_tokens = _to_picklable(second_sentence_tokens)
+    tile_rows = -(-len(first_tokens) // tile_size)
+    tile_columns = -(-len(second_tokens) // tile_size)
+    sizes = ((tile_rows + 1) * (len(second_tokens) + 1), (tile_columns + 1) * (len(first_tokens) + 1))
+    diagonals = [[(tile_row, diagonal - tile_row)
+                  for tile_row in range(max(0, diagonal - tile_columns + 1), min(tile_rows, diagonal + 1))]
+                 for diagonal in range(tile_rows + tile_columns - 1)]
+
+    # an anti-diagonal has at most min(tile_rows, tile_columns) tiles, more processes would stay idle
+    processes = min(processes or cpu_count(), tile_rows, tile_columns)
+    if processes == 1:
+        lcs_length = _fill_in_process((first_tokens, second_tokens), tile_size, diagonals, sizes)
+    else:
+        lcs_length = _fill_in_processes((first_tokens, second_tokens), tile_size, diagonals, sizes, processes)
+    if lcs_length / len(second_tokens) < plagiarism_threshold:
+        return 0
+    return lcs_length
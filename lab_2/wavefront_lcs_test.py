@@ -0,0 +1,85 @@
+"""
+Tests find_lcs_length_wavefront function
+"""
+
+import random
+import unittest
+from array import array
+from unittest.mock import patch
+from lab_2.main import find_lcs_length_optimized
+from lab_2.wavefront_lcs import find_lcs_length_wavefront
+
+
+class FindLcsLengthWavefrontTest(unittest.TestCase):
+    """
+    Checks for find_lcs_length_wavefront function
+    """
+
+    def setUp(self):
+        generator = random.Random(31)
+        self.first_tokens = tuple(generator.randrange(20) for _ in range(300))
+        self.second_tokens = tuple(generator.randrange(20) for _ in range(300))
+        self.expected = find_lcs_length_optimized(self.first_tokens, self.second_tokens, 0.0)
+
+    def test_find_lcs_length_wavefront_single_process(self):
+        """
+        Tests that tiles filled in one process give the serial result
+        """
+        for tile_size in (1, 7, 64, 300, 1000):
+            actual = find_lcs_length_wavefront(self.first_tokens, self.second_tokens, 0.0, 1, tile_size)
+            self.assertEqual(self.expected, actual)
+
+    def test_find_lcs_length_wavefront_several_processes(self):
+        """
+        Tests that tiles filled in parallel processes give the serial result
+        """
+        actual = find_lcs_length_wavefront(self.first_tokens, self.second_tokens, 0.0, 2, 50)
+        self.assertEqual(self.expected, actual)
+        actual = find_lcs_length_wavefront(self.first_tokens, self.second_tokens[:170], 0.0, 3, 40)
+        self.assertEqual(find_lcs_length_optimized(self.first_tokens[:170], self.second_tokens[:170], 0.0),
+                         find_lcs_length_wavefront(self.first_tokens[:170], self.second_tokens[:170], 0.0, 1, 40))
+        self.assertEqual(find_lcs_length_wavefront(self.first_tokens, self.second_tokens[:170], 0.0, 1, 300),
+                         actual)
+
+    @patch('lab_2.wavefront_lcs.Pool', side_effect=AssertionError('no pool is needed'))
+    def test_find_lcs_length_wavefront_single_tile_band(self, mock):
+        """
+        Tests that no processes are started when anti-diagonals have a single tile
+        """
+        self.assertEqual(self.expected, find_lcs_length_wavefront(self.first_tokens, self.second_tokens, 0.0))
+        self.assertEqual(find_lcs_length_optimized(self.first_tokens, self.second_tokens[:50], 0.0),
+                         find_lcs_length_wavefront(self.first_tokens, self.second_tokens[:50], 0.0, 4, 50))
+        self.assertFalse(mock.called)
+
+    def test_find_lcs_length_wavefront_takes_memoryview(self):
+        """
+        Tests that a memoryview is passed to the processes
+        """
+        first_tokens = memoryview(array('I', self.first_tokens))
+        actual = find_lcs_length_wavefront(first_tokens, self.second_tokens, 0.0, 2, 100)
+        self.assertEqual(self.expected, actual)
+
+    def test_find_lcs_length_wavefront_threshold(self):
+        """
+        Tests that a length below the threshold becomes 0
+        """
+        self.assertEqual(0, find_lcs_length_wavefront(('a', 'b', 'c'), ('a', 'd', 'e'), 0.5, 1, 2))
+        self.assertEqual(1, find_lcs_length_wavefront(('a', 'b', 'c'), ('a', 'd', 'e'), 0.3, 1, 2))
+        self.assertEqual(0, find_lcs_length_wavefront((), ('a', 'd', 'e'), 0.3, 1, 2))
+
+    def test_find_lcs_length_wavefront_incorrect_inputs(self):
+        """
+        Tests that find_lcs_length_wavefront can handle incorrect inputs
+        """
+        patches_sentence = ('the', 'dog', 'is', 'running')
+        for bad_input in [[], {}, '', 9.22, None, True]:
+            self.assertEqual(-1, find_lcs_length_wavefront(bad_input, patches_sentence, 0.3))
+            self.assertEqual(-1, find_lcs_length_wavefront(patches_sentence, bad_input, 0.3))
+        for bad_tile_size in [0, -1, None, True, 2.0]:
+            self.assertEqual(-1, find_lcs_length_wavefront(patches_sentence, patches_sentence, 0.3, 1, bad_tile_size))
+        for bad_processes in [0, -1, '2', True, 2.0]:
+            self.assertEqual(-1, find_lcs_length_wavefront(patches_sentence, patches_sentence, 0.3, bad_processes))
+
+
+if __name__ == "__main__":
+    unittest.main()
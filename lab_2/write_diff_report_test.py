@@ -0,0 +1,78 @@
+# pylint: skip-file
+"""
+Tests write_diff_report function
+"""
+
+import io
+import json
+import unittest
+from lab_2.main import write_diff_report, create_diff_report, accumulate_diff_stats
+
+
+class WriteDiffReportTest(unittest.TestCase):
+    """
+    Checks for write_diff_report function
+    """
+
+    def setUp(self):
+        self.original_text_tokens = (('i', 'have', 'a', 'cat'),
+                                     ('its', 'body', 'is', 'covered', 'with', 'bushy', 'white', 'fur'))
+        self.suspicious_text_tokens = (('i', 'have', 'a', 'cat'),
+                                       ('its', 'body', 'is', 'covered', 'with', 'shiny', 'black', 'fur'))
+        self.accumulated_diff_stats = accumulate_diff_stats(self.original_text_tokens, self.suspicious_text_tokens)
+
+    def test_write_diff_report_text(self):
+        """
+        Tests that the text report repeats the example file
+        """
+        out = io.StringIO()
+        self.assertEqual(0, write_diff_report(self.original_text_tokens, self.suspicious_text_tokens,
+                                              self.accumulated_diff_stats, out))
+        expected = open('lab_2/diff_report_example.txt', 'r', errors='coerce').read()
+        self.assertEqual(expected.strip(), out.getvalue().strip())
+        self.assertEqual(out.getvalue(), create_diff_report(self.original_text_tokens, self.suspicious_text_tokens,
+                                                            self.accumulated_diff_stats))
+
+    def test_write_diff_report_html(self):
+        """
+        Tests that the html report marks the differences
+        """
+        out = io.StringIO()
+        write_diff_report(self.original_text_tokens, self.suspicious_text_tokens,
+                          self.accumulated_diff_stats, out, 'html')
+        actual = out.getvalue()
+        self.assertIn('<p class="original">- its body is covered with <mark> bushy white </mark> fur</p>', actual)
+        self.assertIn('<p class="suspicious">+ its body is covered with <mark> shiny black </mark> fur</p>', actual)
+        self.assertIn('<p class="total">Text average plagiarism (words): 87.5%</p>', actual)
+
+    def test_write_diff_report_json(self):
+        """
+        Tests that the json report has an object per pair of sentences and the total
+        """
+        out = io.StringIO()
+        write_diff_report(self.original_text_tokens, self.suspicious_text_tokens,
+                          self.accumulated_diff_stats, out, 'json')
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(3, len(lines))
+        self.assertEqual(['its', 'body', 'is', 'covered', 'with', '|', 'shiny', 'black', '|', 'fur'],
+                         lines[1]['suspicious'])
+        self.assertEqual(6, lines[1]['lcs_length'])
+        self.assertEqual({'text_plagiarism': 87.5}, lines[2])
+
+    def test_write_diff_report_incorrect_inputs(self):
+        """
+        Tests that write_diff_report can handle incorrect inputs
+        """
+        out = io.StringIO()
+        for bad_input in [[], {}, '', 9.22, None, True]:
+            self.assertEqual(1, write_diff_report(bad_input, self.suspicious_text_tokens,
+                                                  self.accumulated_diff_stats, out))
+        self.assertEqual(1, write_diff_report(self.original_text_tokens, self.suspicious_text_tokens,
+                                              self.accumulated_diff_stats, None))
+        self.assertEqual(1, write_diff_report(self.original_text_tokens, self.suspicious_text_tokens,
+                                              self.accumulated_diff_stats, out, 'pdf'))
+        self.assertEqual('', out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
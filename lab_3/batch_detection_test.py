@@ -0,0 +1,95 @@
+# pylint: skip-file
+"""
+Tests for detection of languages of many texts at once
+"""
+
+import unittest
+from lab_3.main import tokenize_by_sentence
+from lab_3.main import encode_corpus
+from lab_3.main import NGramTrie
+from lab_3.main import LetterStorage
+from lab_3.main import LanguageDetector
+from lab_3.main import ProbabilityLanguageDetector
+
+
+class BatchDetectionTest(unittest.TestCase):
+    """
+    Checks that batch detection gives the same results as detection of every text
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        letter_storage = LetterStorage()
+        texts = {}
+        for name, path in (('english', 'lab_3/Frank_Baum.txt'), ('german', 'lab_3/Thomas_Mann.txt')):
+            with open(path, encoding='utf-8') as file:
+                texts[name] = tokenize_by_sentence(file.read())
+            letter_storage.update(texts[name])
+        cls.encoded_texts = {name: encode_corpus(letter_storage, text) for name, text in texts.items()}
+        unknown_texts = (tokenize_by_sentence('The cat sat on the mat. It is a sunny day!'),
+                         tokenize_by_sentence('Der Hund schläft im Garten. Es ist ein schöner Tag.'),
+                         tokenize_by_sentence('Where is the way home?'))
+        for text in unknown_texts:
+            letter_storage.update(text)
+        cls.unknown_texts = tuple(encode_corpus(letter_storage, text) for text in unknown_texts)
+
+    def test_detect_languages_equals_detect_language(self):
+        language_detector = LanguageDetector((2, 3), 100)
+        for name, encoded_text in self.encoded_texts.items():
+            language_detector.new_language(encoded_text, name)
+        expected = tuple(language_detector.detect_language(text) for text in self.unknown_texts)
+        self.assertEqual(expected, language_detector.detect_languages(self.unknown_texts))
+        self.assertEqual(expected, language_detector.detect_languages(self.unknown_texts, 2))
+
+    def test_probability_detect_languages(self):
+        language_detector = ProbabilityLanguageDetector((2, 3), 100)
+        for name, encoded_text in self.encoded_texts.items():
+            language_detector.new_language(encoded_text, name)
+            for n_gram_trie in language_detector.n_gram_storages[name].values():
+                n_gram_trie.calculate_log_probabilities()
+
+        actual = language_detector.detect_languages(self.unknown_texts)
+        self.assertEqual(len(self.unknown_texts), len(actual))
+        for text, probabilities in zip(self.unknown_texts, actual):
+            for name, storages in language_detector.n_gram_storages.items():
+                expected = []
+                for trie_level, n_gram_trie in storages.items():
+                    text_storage = NGramTrie(trie_level)
+                    text_storage.fill_n_grams(text)
+                    expected.append(language_detector._calculate_sentence_probability(n_gram_trie,
+                                                                                      text_storage.n_grams))
+                self.assertAlmostEqual(sum(expected) / len(expected), probabilities[name])
+        self.assertTrue(actual[0]['english'] > actual[0]['german'])
+        self.assertTrue(actual[1]['german'] > actual[1]['english'])
+        self.assertEqual(actual, language_detector.detect_languages(self.unknown_texts, None))
+
+    def test_probability_detect_languages_sums_detect_language_by_levels(self):
+        language_detector = ProbabilityLanguageDetector((2, 3), 100)
+        for name, encoded_text in self.encoded_texts.items():
+            language_detector.new_language(encoded_text, name)
+
+        actual = language_detector.detect_languages(self.unknown_texts, 2)
+        for text, probabilities in zip(self.unknown_texts, actual):
+            expected = {name: 0.0 for name in self.encoded_texts}
+            for trie_level in (2, 3):
+                text_storage = NGramTrie(trie_level)
+                text_storage.fill_n_grams(text)
+                for name, probability in language_detector.detect_language(text_storage.n_grams).items():
+                    expected[name] += probability
+            for name in expected:
+                self.assertAlmostEqual(expected[name], probabilities[name])
+
+    def test_detect_languages_empty(self):
+        language_detector = LanguageDetector((2,), 10)
+        language_detector.new_language(self.encoded_texts['english'], 'english')
+        self.assertEqual((), language_detector.detect_languages(()))
+        self.assertEqual((), language_detector.detect_languages((), 4))
+
+    def test_detect_languages_incorrect_inputs(self):
+        language_detector = LanguageDetector((2,), 10)
+        language_detector.new_language(self.encoded_texts['english'], 'english')
+        bad_inputs = [None, 123, 'text', [self.unknown_texts[0]], (None,), {}]
+        for bad_input in bad_inputs:
+            self.assertEqual((), language_detector.detect_languages(bad_input))
+        for bad_processes in (0, -1, 'two', 1.5, True):
+            self.assertEqual((), language_detector.detect_languages(self.unknown_texts, bad_processes))
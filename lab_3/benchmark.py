@@ -0,0 +1,180 @@
+"""
+Throughput of n-gram extraction and language detection in letters per second,
+memory and lookups of dictionaries of NGramTrie and PackedNGramTable
+Run from the root of the repository:
+    python -m lab_3.benchmark --sizes 3 4 5 --repeats 3
+"""
+import argparse
+import timeit
+import tracemalloc
+
+from lab_3.main import tokenize_by_sentence, encode_corpus, LetterStorage, NGramTrie, PrefixTrie, PackedNGramTable, \
+    LanguageDetector
+
+
+def _fill_n_grams(encoded_text: tuple, size: int):
+    n_gram_trie = NGramTrie(size)
+    n_gram_trie.fill_n_grams(encoded_text)
+    n_gram_trie.calculate_n_grams_frequencies()
+
+
+def _count_n_grams(encoded_text: tuple, size: int):
+    NGramTrie(size).count_n_grams(encoded_text)
+
+
+def _fill_prefix_trie(encoded_text: tuple, size: int):
+    PrefixTrie(size).fill(encoded_text)
+
+
+def _detect_sentences(encoded_text: tuple, language_detector: LanguageDetector):
+    language_detector.detect_languages(tuple((sentence,) for sentence in encoded_text))
+
+
+EXTRACTION_FUNCTIONS = {
+    'fill_n_grams': _fill_n_grams,
+    'count_n_grams': _count_n_grams,
+    'prefix_trie_fill': _fill_prefix_trie,
+}
+
+
+def load_encoded_texts(paths: tuple) -> tuple:
+    """
+    Tokenizes and encodes texts with one letter storage
+    :param paths: paths to text files
+    :return: a tuple of encoded texts
+    """
+    letter_storage = LetterStorage()
+    texts = []
+    for path in paths:
+        with open(path, encoding='utf-8') as file:
+            texts.append(tokenize_by_sentence(file.read()))
+        letter_storage.update(texts[-1])
+    return tuple(encode_corpus(letter_storage, text) for text in texts)
+
+
+def count_letters(encoded_text: tuple) -> int:
+    """
+    Counts letters of all tokens of an encoded text
+    """
+    return sum(len(token) for sentence in encoded_text for token in sentence)
+
+
+def measure_throughput(function, encoded_text: tuple, *arguments, repeats: int = 3) -> float:
+    """
+    Measures the best of several runs of a function
+    :return: letters per second
+    """
+    seconds = min(timeit.repeat(lambda: function(encoded_text, *arguments), number=1, repeat=repeats))
+    return count_letters(encoded_text) / seconds
+
+
+def run_benchmarks(training_text: tuple, unknown_text: tuple, sizes: tuple, repeats: int = 3) -> dict:
+    """
+    Measures extraction of n-grams of every size and detection with all sizes as trie levels,
+    detect_languages takes every sentence of the unknown text as a separate text
+    :param training_text: an encoded text to extract n-grams from
+    :param unknown_text: an encoded text to detect the language of
+    :param sizes: orders of n-grams
+    :param repeats: a number of runs, the fastest one is taken
+    :return: a dictionary name: {size: letters per second}
+    """
+    results = {}
+    for name, function in EXTRACTION_FUNCTIONS.items():
+        for size in sizes:
+            results.setdefault(name, {})[str(size)] = measure_throughput(function, training_text, size,
+                                                                         repeats=repeats)
+    language_detector = LanguageDetector(tuple(sizes), 1000)
+    language_detector.new_language(training_text, 'training')
+    results['detect_language'] = {','.join(map(str, sizes)): measure_throughput(language_detector.detect_language,
+                                                                                 unknown_text, repeats=repeats)}
+    results['detect_languages'] = {','.join(map(str, sizes)): measure_throughput(_detect_sentences, unknown_text,
+                                                                                  language_detector, repeats=repeats)}
+    return results
+
+
+def _create_n_gram_trie(encoded_text: tuple, size: int) -> NGramTrie:
+    n_gram_trie = NGramTrie(size)
+    n_gram_trie.count_n_grams(encoded_text)
+    n_gram_trie.calculate_log_probabilities()
+    return n_gram_trie
+
+
+def _create_packed_table(n_gram_trie: NGramTrie) -> PackedNGramTable:
+    # letter ids from -1 to base - 2 are digits of packed n-grams
+    base = max((letter for n_gram in n_gram_trie.n_gram_frequencies for letter in n_gram), default=0) + 2
+    table = PackedNGramTable(n_gram_trie.size, base)
+    table.fill_from_n_gram_trie(n_gram_trie)
+    return table
+
+
+def measure_kept_memory(function, *arguments) -> float:
+    """
+    Measures memory allocated by a function and still kept by its result
+    :return: KiB
+    """
+    tracemalloc.start()
+    result = function(*arguments)
+    kept = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return kept / 1024
+
+
+def measure_lookups(lookup, n_grams: tuple, repeats: int = 3) -> float:
+    """
+    Measures the best of several runs of a lookup of every n-gram
+    :return: lookups per second
+    """
+    seconds = min(timeit.repeat(lambda: list(map(lookup, n_grams)), number=1, repeat=repeats))
+    return len(n_grams) / seconds
+
+
+def run_table_benchmarks(training_text: tuple, unknown_text: tuple, sizes: tuple, repeats: int = 3) -> dict:
+    """
+    Compares tuple dictionaries of NGramTrie with PackedNGramTable for every size:
+    memory kept by frequencies and log-probabilities of the training text
+    and log-probability lookups of all n-grams of the unknown text
+    :param training_text: an encoded text to fill the tables with
+    :param unknown_text: an encoded text with n-grams to look up
+    :param sizes: orders of n-grams
+    :param repeats: a number of runs of lookups, the fastest one is taken
+    :return: a dictionary name: {size: KiB or lookups per second}
+    """
+    results = {}
+    for size in sizes:
+        n_gram_trie = _create_n_gram_trie(training_text, size)
+        table = _create_packed_table(n_gram_trie)
+        unknown_trie = NGramTrie(size)
+        unknown_trie.fill_n_grams(unknown_text)
+        n_grams = tuple(n_gram for sentence in unknown_trie.n_grams for token in sentence for n_gram in token)
+        results.setdefault('n_gram_dict_kib', {})[str(size)] = measure_kept_memory(_create_n_gram_trie,
+                                                                                   training_text, size)
+        results.setdefault('packed_table_kib', {})[str(size)] = measure_kept_memory(_create_packed_table,
+                                                                                    n_gram_trie)
+        results.setdefault('n_gram_dict_lookups', {})[str(size)] = measure_lookups(
+            n_gram_trie.n_gram_log_probabilities.get, n_grams, repeats)
+        results.setdefault('packed_table_lookups', {})[str(size)] = measure_lookups(table.get_log_probability,
+                                                                                    n_grams, repeats)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measures n-gram extraction and detection in letters per second')
+    parser.add_argument('--training', type=str, default='lab_3/Frank_Baum.txt', help='Path to a training text')
+    parser.add_argument('--unknown', type=str, default='lab_3/unknown_Arthur_Conan_Doyle.txt',
+                        help='Path to a text to detect')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3, 4, 5], help='Orders of n-grams')
+    parser.add_argument('--repeats', type=int, default=3, help='Number of runs of every function')
+    args: argparse.Namespace = parser.parse_args()
+
+    encoded_training, encoded_unknown = load_encoded_texts((args.training, args.unknown))
+    benchmark_results = run_benchmarks(encoded_training, encoded_unknown, tuple(args.sizes), args.repeats)
+    print('{:<20} {:>7} {:>16}'.format('function', 'size', 'letters/s'))
+    for function_name, measurements in benchmark_results.items():
+        for n_gram_size, letters_per_second in measurements.items():
+            print('{:<20} {:>7} {:>16,.0f}'.format(function_name, n_gram_size, letters_per_second))
+    table_results = run_table_benchmarks(encoded_training, encoded_unknown, tuple(args.sizes), args.repeats)
+    print('{:<20} {:>7} {:>16}'.format('table', 'size', 'KiB or lookups/s'))
+    for table_name, measurements in table_results.items():
+        for n_gram_size, value in measurements.items():
+            print('{:<20} {:>7} {:>16,.1f}'.format(table_name, n_gram_size, value))
@@ -0,0 +1,39 @@
+# pylint: skip-file
+"""
+Tests for the throughput benchmark
+"""
+
+import unittest
+from lab_3.benchmark import load_encoded_texts, count_letters, run_benchmarks, run_table_benchmarks, \
+    EXTRACTION_FUNCTIONS
+
+
+class BenchmarkTest(unittest.TestCase):
+    """
+    Checks that every function is measured
+    """
+
+    def test_run_benchmarks_measures_every_function(self):
+        training_text, unknown_text = load_encoded_texts(('lab_3/Frank_Baum.txt', 'lab_3/unknown_Arthur_Conan_Doyle.txt'))
+        self.assertTrue(count_letters(training_text) > 0 and count_letters(unknown_text) > 0)
+        results = run_benchmarks(training_text[:20], unknown_text[:5], (2, 3), repeats=1)
+        self.assertEqual(set(EXTRACTION_FUNCTIONS) | {'detect_language', 'detect_languages'}, set(results))
+        for name in EXTRACTION_FUNCTIONS:
+            self.assertEqual({'2', '3'}, set(results[name]))
+        self.assertEqual({'2,3'}, set(results['detect_language']))
+        self.assertEqual({'2,3'}, set(results['detect_languages']))
+        self.assertTrue(all(value > 0 for measurements in results.values() for value in measurements.values()))
+
+    def test_run_table_benchmarks_compares_dictionaries_and_packed_tables(self):
+        training_text, unknown_text = load_encoded_texts(('lab_3/Frank_Baum.txt', 'lab_3/unknown_Arthur_Conan_Doyle.txt'))
+        results = run_table_benchmarks(training_text[:50], unknown_text[:5], (2, 3), repeats=1)
+        self.assertEqual({'n_gram_dict_kib', 'packed_table_kib', 'n_gram_dict_lookups', 'packed_table_lookups'},
+                         set(results))
+        for measurements in results.values():
+            self.assertEqual({'2', '3'}, set(measurements))
+            self.assertTrue(all(value > 0 for value in measurements.values()))
+        self.assertTrue(results['packed_table_kib']['3'] < results['n_gram_dict_kib']['3'])
+
+
+if __name__ == "__main__":
+    unittest.main()
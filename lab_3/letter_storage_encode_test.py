@@ -0,0 +1,87 @@
+# pylint: skip-file
+"""
+Tests for the lookup tables of LetterStorage and bulk encoding
+"""
+
+import unittest
+from lab_3.main import tokenize_by_sentence
+from lab_3.main import encode_corpus
+from lab_3.main import encode_sentences
+from lab_3.main import LetterStorage
+
+
+class LetterStorageEncodeTest(unittest.TestCase):
+    """
+    Checks that bulk encoding gives the ids of get_id_by_letter
+    """
+
+    def test_encode_equals_get_id_by_letter(self):
+        letter_storage = LetterStorage()
+        with open('lab_3/Thomas_Mann.txt', encoding='utf-8') as file:
+            text = file.read()
+        letter_storage.update(tokenize_by_sentence(text))
+        for string in (text, 'straße über ünd', 'кот', 'a\U0001F600b', ''):
+            expected = [letter_storage.get_id_by_letter(letter) for letter in string]
+            self.assertEqual(expected, list(letter_storage.encode(string)))
+
+    def test_get_letter_by_id(self):
+        letter_storage = LetterStorage()
+        letter_storage.update(((('_', 'c', 'a', 't', '_'),),))
+        for letter, letter_id in letter_storage.storage.items():
+            self.assertEqual(letter, letter_storage.get_letter_by_id(letter_id))
+        for bad_input in (0, -1, 5, None, 'a', 1.0):
+            self.assertEqual('', letter_storage.get_letter_by_id(bad_input))
+
+    def test_assigned_storage_rebuilds_tables(self):
+        letter_storage = LetterStorage()
+        letter_storage.update(((('a', 'b'),),))
+        letter_storage.storage = {'w': 1}
+        self.assertEqual([1, -1], list(letter_storage.encode('wa')))
+        self.assertEqual('w', letter_storage.get_letter_by_id(1))
+        self.assertEqual(0, letter_storage._put_letter('a'))
+        self.assertEqual([1, 2], list(letter_storage.encode('wa')))
+
+    def test_storage_is_read_only(self):
+        letter_storage = LetterStorage()
+        letter_storage.update(((('a', 'b'),),))
+        with self.assertRaises(TypeError):
+            letter_storage.storage['c'] = 3
+        assigned = {'w': 1}
+        letter_storage.storage = assigned
+        assigned['a'] = 2
+        self.assertEqual({'w': 1}, letter_storage.storage)
+        self.assertEqual([1, -1], list(letter_storage.encode('wa')))
+        self.assertEqual(-1, letter_storage.get_id_by_letter('a'))
+
+    def test_encode_large_ids(self):
+        letter_storage = LetterStorage()
+        letter_storage.storage = {'w': 40000, 'a': 2}
+        self.assertEqual([40000, 2, -1], list(letter_storage.encode('wab')))
+
+    def test_encode_incorrect_input(self):
+        letter_storage = LetterStorage()
+        for bad_input in (None, 123, ('a',), ['a']):
+            self.assertEqual([], list(letter_storage.encode(bad_input)))
+
+    def test_encode_corpus_equals_get_id_by_letter(self):
+        letter_storage = LetterStorage()
+        letter_storage.storage = {'a': 0, 'b': 40000, 'c': 3, 'ab': 5}
+        corpus = ((('_', 'a', 'b', '_'), ('c', 'x')), (('ab', 'c'),), ((None, 'c'),))
+        expected = tuple(tuple(tuple(letter_storage.get_id_by_letter(letter) for letter in token) for token in sentence)
+                         for sentence in corpus)
+        self.assertEqual(expected, encode_corpus(letter_storage, corpus))
+        self.assertEqual(((-1, 0, 40000, -1), (3, -1)), expected[0])
+
+    def test_encode_sentences_new_letters(self):
+        with open('lab_3/Frank_Baum.txt', encoding='utf-8') as file:
+            text = tokenize_by_sentence(file.read())
+        expected_storage = LetterStorage()
+        expected_storage.update(text)
+        letter_storage = LetterStorage()
+        self.assertEqual(encode_corpus(expected_storage, text), tuple(encode_sentences(letter_storage, text)))
+        self.assertEqual(expected_storage.storage, letter_storage.storage)
+
+    def test_encode_sentences_long_letters(self):
+        letter_storage = LetterStorage()
+        sentences = ((('_', 'ab', 'c', '_'),),)
+        self.assertEqual((((1, -1, 2, 1),),), tuple(encode_sentences(letter_storage, sentences)))
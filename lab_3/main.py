@@ -1,8 +1,22 @@
 """
 Language detection using n-grams
 """
+import os
 import re
-from math import log
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from math import exp, log
+from types import MappingProxyType
+from multiprocessing import Pool
+
+# letter ids from -1 (an unknown letter) to LETTER_BOUND - 2 fit into a packed edge of PrefixTrie
+LETTER_BOUND = 1 << 16
+# ids below it are read back from UTF-16 as signed 16-bit integers, '\uffff' gives -1
+_ID_BOUND = 1 << 15
+# a process of detect_languages keeps the batch function and the prepared languages here, set once by _set_batch_state
+_BATCH_STATE = {}
 
 
 # 4
@@ -34,11 +48,75 @@ def tokenize_by_sentence(text: str) -> tuple:
     return tuple(list_letters)
 
 
+def iterate_sentences(path_to_file: str, chunk_size: int = 1 << 16, max_sentence_size: int = 1 << 20):
+    """
+    Reads a text file by chunks and yields its sentences as tokenize_by_sentence splits the whole text
+    A part after the last sentence end of a chunk waits for the next chunk, only its last piece is split again
+    as a sentence end may start there. A part longer than max_sentence_size characters is yielded as a sentence
+    up to its last space or line break, so a text without sentence ends is not kept in memory; n-grams do not
+    cross tokens and are counted the same
+    :param path_to_file: a path to a text file
+    :param chunk_size: a number of characters to read at once
+    :param max_sentence_size: a number of characters of an unfinished sentence to keep
+    :return: a generator of sentences with tuples of tokens split into letters
+    """
+    with open(path_to_file, encoding='utf-8') as file:
+        rest = []
+        rest_size = 0
+        for chunk in iter(lambda: file.read(chunk_size), ''):
+            last_piece = rest.pop() if rest else ''
+            sentences = re.split('[!?.] ', last_piece + chunk)
+            if len(sentences) == 1:
+                rest.extend((last_piece, chunk))
+                rest_size += len(chunk)
+            else:
+                yield from tokenize_by_sentence(''.join(rest) + sentences[0])
+                for sentence in sentences[1:-1]:
+                    yield from tokenize_by_sentence(sentence)
+                rest = [sentences[-1]]
+                rest_size = len(sentences[-1])
+            if rest_size > max_sentence_size:
+                text = ''.join(rest)
+                border = max(text.rfind(' '), text.rfind('\n'))
+                border = border if border > 0 else len(text)
+                yield from tokenize_by_sentence(text[:border])
+                rest = [text[border:]]
+                rest_size = len(rest[0])
+        yield from tokenize_by_sentence(''.join(rest))
+
+
 # 4
 class LetterStorage:
 
     def __init__(self):
-        self.storage = {}
+        self._storage = {}
+        # a table of str.translate: characters with ids as code points by code points of letters below LETTER_BOUND,
+        # '\uffff' for unknown letters, and letters by ids
+        self.translation_table = ['\uffff'] * LETTER_BOUND
+        self.letters = ['']
+
+    @property
+    def storage(self) -> MappingProxyType:
+        """
+        A read-only view of the dictionary letter: id, letters are put by _put_letter and update,
+        a replaced dictionary is copied and the lookup arrays are rebuilt
+        """
+        return MappingProxyType(self._storage)
+
+    @storage.setter
+    def storage(self, storage: dict):
+        self._storage = dict(storage)
+        self.translation_table = ['\uffff'] * LETTER_BOUND
+        self.letters = [''] * (max(storage.values(), default=0) + 1)
+        for letter, letter_id in storage.items():
+            self._index_letter(letter, letter_id)
+
+    def _index_letter(self, letter: str, letter_id: int):
+        if len(letter) == 1 and ord(letter) < LETTER_BOUND and 0 < letter_id < _ID_BOUND:
+            self.translation_table[ord(letter)] = chr(letter_id)
+        if letter_id >= len(self.letters):
+            self.letters.extend([''] * (letter_id + 1 - len(self.letters)))
+        self.letters[letter_id] = letter
 
     def _put_letter(self, letter: str) -> int:
         """
@@ -48,8 +126,9 @@ class LetterStorage:
         """
         if not isinstance(letter, str) or not len(letter) <= 1:
             return 1
-        if letter not in self.storage:
-            self.storage[letter] = len(self.storage) + 1
+        if letter not in self._storage:
+            self._storage[letter] = len(self._storage) + 1
+            self._index_letter(letter, self._storage[letter])
         return 0
 
     def get_id_by_letter(self, letter: str) -> int:
@@ -58,9 +137,39 @@ class LetterStorage:
         :param letter: a letter
         :return: an id
         """
-        if not isinstance(letter, str) or letter not in self.storage or not 0 < len(letter) <= 1:
+        if not isinstance(letter, str) or letter not in self._storage or not 0 < len(letter) <= 1:
             return -1
-        return self.storage[letter]
+        return self._storage[letter]
+
+    def get_letter_by_id(self, letter_id: int) -> str:
+        """
+        Gets a letter by its id
+        :param letter_id: an id
+        :return: a letter, an empty string for an unknown id
+        """
+        if not isinstance(letter_id, int) or not 0 < letter_id < len(self.letters):
+            return ''
+        return self.letters[letter_id]
+
+    def encode(self, text: str) -> array:
+        """
+        Encodes all letters of a string at once: str.translate replaces letters with characters of their ids
+        and the UTF-16 bytes of the result are read as an array of signed 16-bit integers
+        Letters beyond LETTER_BOUND and storages with ids from _ID_BOUND are encoded letter by letter
+        :param text: a string of letters
+        :return: an array of ids, -1 for letters not in the storage
+        """
+        if not isinstance(text, str):
+            return array('h')
+        if len(self.letters) <= _ID_BOUND:
+            ids = array('h')
+            ids.frombytes(text.translate(self.translation_table).encode('utf-16-le'))
+            # a letter beyond LETTER_BOUND is left as it is and takes two 16-bit units
+            if len(ids) == len(text):
+                if sys.byteorder != 'little':
+                    ids.byteswap()
+                return ids
+        return array('i' if len(self.letters) > _ID_BOUND else 'h', [self._storage.get(letter, -1) for letter in text])
 
     def update(self, corpus: tuple) -> int:
         """
@@ -77,6 +186,31 @@ class LetterStorage:
         return 0
 
 
+def _encode_sentence(storage: LetterStorage, sentence: tuple) -> tuple:
+    """
+    Encodes a sentence of one-character letters at once by LetterStorage.encode and splits it into tokens,
+    letters it does not find, unknown ones or ones with ids out of its tables, are looked up by get_id_by_letter
+    Sentences with other letters are encoded letter by letter
+    """
+    try:
+        text = ''.join(map(''.join, sentence))
+        is_text = len(text) == sum(map(len, sentence))
+    except TypeError:
+        is_text = False
+    if not is_text:
+        return tuple(tuple(storage.get_id_by_letter(letter) for letter in token) for token in sentence)
+    ids = storage.encode(text)
+    if -1 in ids:
+        ids = [storage.get_id_by_letter(letter) if letter_id == -1 else letter_id
+               for letter, letter_id in zip(text, ids)]
+    start = 0
+    encoded_sentence = []
+    for token in sentence:
+        encoded_sentence.append(tuple(ids[start:start + len(token)]))
+        start += len(token)
+    return tuple(encoded_sentence)
+
+
 # 6
 def encode_corpus(storage: LetterStorage, corpus: tuple) -> tuple:
     """
@@ -88,12 +222,27 @@ def encode_corpus(storage: LetterStorage, corpus: tuple) -> tuple:
     if not isinstance(storage, LetterStorage) or not isinstance(corpus, tuple):
         return ()
 
-    encoded_corpus = []
-    for sentence in corpus:
-        list_sentence = [tuple([storage.get_id_by_letter(letter) for letter in token]) for token in sentence]
-        encoded_corpus.append(tuple(list_sentence))
+    return tuple(_encode_sentence(storage, sentence) for sentence in corpus)
+
 
-    return tuple(encoded_corpus)
+def encode_sentences(storage: LetterStorage, sentences):
+    """
+    Encodes sentences one by one, letters are put into the storage when they are met for the first time
+    :param storage: an instance of the LetterStorage class
+    :param sentences: an iterable of sentences with tuples of tokens split into letters
+    :return: a generator of encoded sentences
+    """
+    for sentence in sentences:
+        text = ''.join(map(''.join, sentence))
+        if len(text) != sum(map(len, sentence)):
+            storage.update((sentence,))
+            yield _encode_sentence(storage, sentence)
+            continue
+        # a sentence of one-character letters is encoded at once and split into tokens
+        new_letters = tuple(letter for letter in dict.fromkeys(text) if letter not in storage.storage)
+        if new_letters:
+            storage.update(((new_letters,),))
+        yield _encode_sentence(storage, sentence)
 
 
 # 6
@@ -139,6 +288,25 @@ class NGramTrie:
                     self.n_gram_frequencies[n_gram] = self.n_gram_frequencies.get(n_gram, 0) + 1
         return 0
 
+    def count_n_grams(self, encoded_sentences) -> int:
+        """
+        Counts n-grams straight from encoded sentences without filling the field n_grams,
+        so a generator of sentences is read once and only distinct n-grams are kept
+        :param encoded_sentences: a tuple or an iterator of encoded sentences
+        :return: 0 if succeeds, 1 if not
+        """
+        if not isinstance(encoded_sentences, (tuple, Iterator)):
+            return 1
+
+        size = self.size
+        frequencies = self.n_gram_frequencies
+        for sentence in encoded_sentences:
+            for token in sentence:
+                for ind in range(len(token) - size + 1):
+                    n_gram = tuple(token[ind:ind + size])
+                    frequencies[n_gram] = frequencies.get(n_gram, 0) + 1
+        return 0
+
     def calculate_log_probabilities(self) -> int:
         """
         Gets log-probabilities of n-grams, fills the field n_gram_log_probabilities
@@ -147,11 +315,14 @@ class NGramTrie:
         if not self.n_gram_frequencies:
             return 1
 
-        for n_gram in self.n_gram_frequencies:
-            probability = self.n_gram_frequencies[n_gram] / \
-                          sum([self.n_gram_frequencies[other_n_gram]
-                               for other_n_gram in self.n_gram_frequencies
-                               if n_gram[:self.size - 1] == other_n_gram[:self.size - 1]])
+        # counts of n-grams with the same (n-1)-prefix are summed in one pass
+        prefix_frequencies = {}
+        for n_gram, frequency in self.n_gram_frequencies.items():
+            prefix = n_gram[:self.size - 1]
+            prefix_frequencies[prefix] = prefix_frequencies.get(prefix, 0) + frequency
+
+        for n_gram, frequency in self.n_gram_frequencies.items():
+            probability = frequency / prefix_frequencies[n_gram[:self.size - 1]]
             self.n_gram_log_probabilities[n_gram] = log(probability)
         return 0
 
@@ -165,6 +336,214 @@ class NGramTrie:
         return tuple(sorted(self.n_gram_frequencies, key=self.n_gram_frequencies.get, reverse=True)[:k])
 
 
+class PrefixTrie:
+    """
+    A prefix tree of n-grams of all orders up to max_size with the counts stored at each depth
+    Nodes are indexes into flat arrays, an edge is a dictionary item node * LETTER_BOUND + letter + 1: child
+    LanguageDetector uses it only to count all levels in one pass and builds an NGramTrie per level from it,
+    the tree is not kept: its edges take more memory than the tables of n-grams and lookups walk them letter by letter
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.parents = array('l', [-1])
+        self.letters = array('l', [-1])
+        self.depths = array('B', [0])
+        self.counts = array('Q', [0])
+        self.edges = {}
+
+    def _add_path(self, letters: tuple, count: int):
+        node = 0
+        for letter in letters:
+            edge = node * LETTER_BOUND + letter + 1
+            child = self.edges.get(edge)
+            if child is None:
+                child = self.edges[edge] = len(self.counts)
+                self.parents.append(node)
+                self.letters.append(letter)
+                self.depths.append(self.depths[node] + 1)
+                self.counts.append(0)
+            self.counts[child] += count
+            node = child
+
+    def fill(self, encoded_text: tuple) -> int:
+        """
+        Counts n-grams of all orders up to max_size in tokens of the given text
+        Every position of a token starts one string of max_size letters or a shorter end of the token,
+        the n-grams starting at the position are prefixes of this string:
+        distinct strings are counted in one pass and only they are walked down the tree
+        :param encoded_text: a tuple or an iterator of sentences with tuples of tokens split into letter ids
+        :return: 0 if succeeds, 1 if not
+        """
+        if not isinstance(encoded_text, (tuple, Iterator)) or not isinstance(self.max_size, int) or \
+                not 0 < self.max_size < 256:
+            return 1
+        size = self.max_size
+        strings = {}
+        for sentence in encoded_text:
+            if not isinstance(sentence, tuple):
+                return 1
+            for token in sentence:
+                if not isinstance(token, tuple):
+                    return 1
+                for start in range(len(token)):
+                    string = token[start:start + size]
+                    strings[string] = strings.get(string, 0) + 1
+        letters = {letter for string in strings for letter in string}
+        if not all(isinstance(letter, int) and -1 <= letter < LETTER_BOUND - 1 for letter in letters):
+            return 1
+        # strings are walked in the order of their first occurrence, so nodes of every depth are created
+        # in the order of the first occurrence of their n-grams
+        for string, count in strings.items():
+            self._add_path(string, count)
+        return 0
+
+    def _find_n_gram(self, node: int) -> tuple:
+        letters = []
+        while node:
+            letters.append(self.letters[node])
+            node = self.parents[node]
+        return tuple(reversed(letters))
+
+    def get_frequency(self, n_gram: tuple) -> int:
+        """
+        Gets a count of an n-gram of any order up to max_size
+        :param n_gram: a tuple of letter ids
+        :return: a count, 0 for an unseen n-gram
+        """
+        if not isinstance(n_gram, tuple) or not n_gram:
+            return 0
+        node = 0
+        for letter in n_gram:
+            if not isinstance(letter, int):
+                return 0
+            node = self.edges.get(node * LETTER_BOUND + letter + 1)
+            if node is None:
+                return 0
+        return self.counts[node]
+
+    def _find_nodes(self, size: int) -> list:
+        depths = self.depths
+        return [node for node in range(1, len(depths)) if depths[node] == size]
+
+    def get_n_gram_frequencies(self, size: int) -> dict:
+        """
+        Gets counts of n-grams of one order in the order of their first occurrence as NGramTrie does
+        :param size: an order of n-grams from 1 to max_size
+        :return: a dictionary n-gram: count
+        """
+        if not isinstance(size, int) or not 0 < size <= self.max_size:
+            return {}
+        return {self._find_n_gram(node): self.counts[node] for node in self._find_nodes(size)}
+
+    def to_n_gram_trie(self, size: int) -> 'NGramTrie':
+        """
+        Creates an NGramTrie of one order with frequencies and log-probabilities filled, n_grams are not stored
+        Counts of n-grams with a common prefix are summed over the children of the prefix node
+        :param size: an order of n-grams from 1 to max_size
+        :return: an instance of the NGramTrie class
+        """
+        n_gram_trie = NGramTrie(size)
+        if not isinstance(size, int) or not 0 < size <= self.max_size:
+            return n_gram_trie
+        nodes = self._find_nodes(size)
+        prefix_frequencies = {}
+        for node in nodes:
+            prefix_frequencies[self.parents[node]] = prefix_frequencies.get(self.parents[node], 0) + self.counts[node]
+        for node in nodes:
+            n_gram = self._find_n_gram(node)
+            n_gram_trie.n_gram_frequencies[n_gram] = self.counts[node]
+            n_gram_trie.n_gram_log_probabilities[n_gram] = log(self.counts[node] /
+                                                               prefix_frequencies[self.parents[node]])
+        return n_gram_trie
+
+
+class PackedNGramTable:
+    """
+    Frequencies and log-probabilities of n-grams of one order with every n-gram packed into one integer:
+    letter ids are digits of a number in base `base`, shifted by one for the id -1 of an unknown letter.
+    Keys are sorted in an array of unsigned 64-bit integers and found by binary search
+    """
+
+    def __init__(self, size: int, base: int):
+        self.size = size
+        self.base = base
+        self.keys = array('Q')
+        self.counts = array('Q')
+        self.log_probabilities = array('d')
+
+    def pack(self, n_gram: tuple) -> int:
+        """
+        Packs an n-gram into an integer key
+        :param n_gram: a tuple of letter ids
+        :return: a key, -1 if the n-gram does not fit into the table
+        """
+        if not isinstance(n_gram, tuple) or len(n_gram) != self.size:
+            return -1
+        key = 0
+        for letter in n_gram:
+            if not isinstance(letter, int) or not -1 <= letter < self.base - 1:
+                return -1
+            key = key * self.base + letter + 1
+        return key
+
+    def unpack(self, key: int) -> tuple:
+        """
+        Unpacks an integer key into an n-gram
+        :param key: a key
+        :return: a tuple of letter ids
+        """
+        letters = []
+        for _ in range(self.size):
+            key, digit = divmod(key, self.base)
+            letters.append(digit - 1)
+        return tuple(reversed(letters))
+
+    def fill_from_n_gram_trie(self, n_gram_trie: NGramTrie) -> int:
+        """
+        Packs frequencies and log-probabilities of an NGramTrie of the same order
+        :param n_gram_trie: an instance of the NGramTrie class with frequencies
+        :return: 0 if succeeds, 1 if not
+        """
+        if not isinstance(n_gram_trie, NGramTrie) or n_gram_trie.size != self.size:
+            return 1
+        if not isinstance(self.base, int) or self.base < 2 or self.base ** self.size > 1 << 64:
+            return 1
+        packed = sorted((self.pack(n_gram), frequency) for n_gram, frequency in n_gram_trie.n_gram_frequencies.items())
+        if packed and packed[0][0] == -1:
+            return 1
+        self.keys = array('Q', [key for key, _ in packed])
+        self.counts = array('Q', [frequency for _, frequency in packed])
+        self.log_probabilities = array('d', [n_gram_trie.n_gram_log_probabilities.get(self.unpack(key), 0.0)
+                                             for key in self.keys])
+        return 0
+
+    def _find_index(self, n_gram: tuple) -> int:
+        key = self.pack(n_gram)
+        index = bisect_left(self.keys, key)
+        if key == -1 or index == len(self.keys) or self.keys[index] != key:
+            return -1
+        return index
+
+    def get_frequency(self, n_gram: tuple) -> int:
+        """
+        Gets a count of an n-gram
+        :param n_gram: a tuple of letter ids
+        :return: a count, 0 for an unseen n-gram
+        """
+        index = self._find_index(n_gram)
+        return self.counts[index] if index != -1 else 0
+
+    def get_log_probability(self, n_gram: tuple) -> float:
+        """
+        Gets a log-probability of an n-gram
+        :param n_gram: a tuple of letter ids
+        :return: a log-probability, 0 for an unseen n-gram as ProbabilityLanguageDetector counts it
+        """
+        index = self._find_index(n_gram)
+        return self.log_probabilities[index] if index != -1 else 0.0
+
+
 # 8
 class LanguageDetector:
 
@@ -172,34 +551,71 @@ class LanguageDetector:
         self.trie_levels = trie_levels
         self.top_k = top_k
         self.n_gram_storages = {}
+        self.top_n_grams = {}
+        self.top_n_gram_ranks = {}
+        # language_name: (top_k, {trie_level: n_gram_frequencies}) the cached top n-grams were taken from
+        self.top_n_gram_sources = {}
 
     def new_language(self, encoded_text: tuple, language_name: str) -> int:
         """
         Fills NGramTries with regard to the trie_levels field
-        :param encoded_text: an encoded text
+        :param encoded_text: an encoded text or an iterator of encoded sentences, e.g. from encode_sentences
         :param language_name: a language
         :return: 0 if succeeds, 1 if not
         """
-        if (not isinstance(encoded_text, tuple) or
-                not isinstance(encoded_text[0], tuple) or
-                not isinstance(language_name, str)):
+        if not isinstance(language_name, str):
+            return 1
+        if not isinstance(encoded_text, Iterator) and \
+                (not isinstance(encoded_text, tuple) or not isinstance(encoded_text[0], tuple)):
             return 1
 
-        self.n_gram_storages[language_name] = {}
-        for trie_level in self.trie_levels:
-            storage_lang = NGramTrie(trie_level)
-            storage_lang.fill_n_grams(encoded_text)
-            storage_lang.calculate_n_grams_frequencies()
-            storage_lang.calculate_log_probabilities()
-            self.n_gram_storages[language_name][trie_level] = storage_lang
+        # one prefix tree counts n-grams of every level at once, then it is dropped: every level keeps its own table
+        prefix_trie = PrefixTrie(max(self.trie_levels, default=1))
+        if prefix_trie.fill(encoded_text):
+            return 1
+        self.n_gram_storages[language_name] = {trie_level: prefix_trie.to_n_gram_trie(trie_level)
+                                               for trie_level in self.trie_levels}
+        self._rank_top_n_grams(language_name)
         return 0
 
+    def _rank_top_n_grams(self, language_name: str) -> dict:
+        """
+        Sorts top_k n-grams of every level of a language once and caches them with their ranks
+        :param language_name: a language of n_gram_storages
+        :return: a dictionary trie_level: a dictionary n_gram: rank
+        """
+        self.top_n_grams[language_name] = {trie_level: n_gram_trie.top_n_grams(self.top_k)
+                                           for trie_level, n_gram_trie in self.n_gram_storages[language_name].items()}
+        self.top_n_gram_ranks[language_name] = {trie_level: {n_gram: rank for rank, n_gram in enumerate(top_n_grams)}
+                                                for trie_level, top_n_grams in self.top_n_grams[language_name].items()}
+        self.top_n_gram_sources[language_name] = (self.top_k, {
+            trie_level: n_gram_trie.n_gram_frequencies
+            for trie_level, n_gram_trie in self.n_gram_storages[language_name].items()})
+        return self.top_n_gram_ranks[language_name]
+
+    def _get_top_n_grams(self, language_name: str) -> tuple:
+        """
+        Gets cached top_k n-grams and ranks of a language, they are ranked again when top_k is changed,
+        NGramTries of the language or their n_gram_frequencies are replaced or put into n_gram_storages directly
+        :return: a tuple of dictionaries trie_level: top n-grams and trie_level: {n_gram: rank}
+        """
+        storages = self.n_gram_storages[language_name]
+        top_k, cached_frequencies = self.top_n_gram_sources.get(language_name, (None, {}))
+        if language_name not in self.top_n_gram_ranks or top_k != self.top_k or \
+                cached_frequencies.keys() != storages.keys() or \
+                any(cached_frequencies[trie_level] is not n_gram_trie.n_gram_frequencies
+                    for trie_level, n_gram_trie in storages.items()):
+            self._rank_top_n_grams(language_name)
+        return self.top_n_grams[language_name], self.top_n_gram_ranks[language_name]
+
     @staticmethod
-    def _calculate_distance(first_n_grams: tuple, second_n_grams: tuple) -> int:
+    def _calculate_distance(first_n_grams: tuple, second_n_grams: tuple, first_ranks: dict = None) -> int:
         """
         Calculates distance between top_k n-grams
         :param first_n_grams: a tuple of the top_k n-grams
         :param second_n_grams: a tuple of the top_k n-grams
+        :param first_ranks: a cached dictionary n_gram: index of first_n_grams without repeated n-grams,
+        then only second_n_grams are walked through
         :return: a distance
         """
         incorrect_inputs = (not isinstance(first_n_grams, tuple) or
@@ -209,12 +625,19 @@ class LanguageDetector:
         if incorrect_inputs:
             return -1
 
-        total_distance = 0
-        for ind, n_gram in enumerate(first_n_grams):
-            if n_gram in second_n_grams:
-                total_distance += abs(second_n_grams.index(n_gram) - ind)
-            else:
-                total_distance += len(second_n_grams)
+        # the first occurrence of an n-gram gives its index as tuple.index does
+        second_ranks = {}
+        for ind, n_gram in enumerate(second_n_grams):
+            second_ranks.setdefault(n_gram, ind)
+        if first_ranks is None:
+            return sum(abs(second_ranks[n_gram] - ind) if n_gram in second_ranks else len(second_n_grams)
+                       for ind, n_gram in enumerate(first_n_grams))
+
+        # every n-gram of the first tuple costs len(second_n_grams) unless it is met in the second one
+        total_distance = len(first_n_grams) * len(second_n_grams)
+        for n_gram, ind in second_ranks.items():
+            if n_gram in first_ranks:
+                total_distance += abs(first_ranks[n_gram] - ind) - len(second_n_grams)
         return total_distance
 
     def detect_language(self, encoded_text: tuple) -> dict:
@@ -229,22 +652,91 @@ class LanguageDetector:
         lang_distance = {}
         for language_name, storage_lang in self.n_gram_storages.items():
             lang_distance[language_name] = []
-            for trie_level, n_gram_trie in storage_lang.items():
+            top_n_grams, ranks = self._get_top_n_grams(language_name)
+            for trie_level in storage_lang:
                 text_storage = NGramTrie(trie_level)
-                text_storage.fill_n_grams(encoded_text)
-                text_storage.calculate_n_grams_frequencies()
+                text_storage.count_n_grams(encoded_text)
                 lang_distance[language_name].append(
-                    self._calculate_distance(n_gram_trie.top_n_grams(self.top_k),
-                                             text_storage.top_n_grams(self.top_k)))
+                    self._calculate_distance(top_n_grams[trie_level], text_storage.top_n_grams(self.top_k),
+                                             ranks[trie_level]))
 
             lang_distance[language_name] = sum(lang_distance[language_name]) / len(lang_distance[language_name])
 
         return lang_distance
 
+    def _prepare_batch(self) -> tuple:
+        """
+        Collects what _detect_batch needs of the languages, it is sent to every process once
+        :return: a tuple of top_k and a dictionary language_name: (top n-grams, ranks) of _get_top_n_grams
+        """
+        return self.top_k, {language_name: self._get_top_n_grams(language_name)
+                            for language_name in self.n_gram_storages}
+
+    @staticmethod
+    def _detect_batch(prepared: tuple, encoded_texts: tuple) -> tuple:
+        """
+        Finds distances for several texts as detect_language does, n-grams of a text are counted once per level
+        :param prepared: languages prepared by _prepare_batch
+        :param encoded_texts: a tuple of encoded texts
+        :return: a tuple of dictionaries language_name: distance
+        """
+        top_k, language_top_n_grams = prepared
+        trie_levels = {trie_level for top_n_grams, _ in language_top_n_grams.values() for trie_level in top_n_grams}
+        results = []
+        for encoded_text in encoded_texts:
+            text_top_n_grams = {}
+            for trie_level in trie_levels:
+                text_storage = NGramTrie(trie_level)
+                text_storage.count_n_grams(encoded_text)
+                text_top_n_grams[trie_level] = text_storage.top_n_grams(top_k)
+            lang_distance = {}
+            for language_name, (top_n_grams, ranks) in language_top_n_grams.items():
+                distances = [LanguageDetector._calculate_distance(language_n_grams, text_top_n_grams[trie_level],
+                                                                  ranks[trie_level])
+                             for trie_level, language_n_grams in top_n_grams.items()]
+                lang_distance[language_name] = sum(distances) / len(distances)
+            results.append(lang_distance)
+        return tuple(results)
+
+    def detect_languages(self, encoded_texts: tuple, processes: int = 1) -> tuple:
+        """
+        Detects languages of many texts at once, optionally in a pool of processes
+        :param encoded_texts: a tuple of encoded texts
+        :param processes: a number of processes, None for all cores, 1 – no processes are started
+        :return: a tuple of dictionaries language_name: score, one per text, see _detect_batch
+        """
+        if not isinstance(encoded_texts, tuple) or not all(isinstance(text, tuple) for text in encoded_texts):
+            return ()
+        if not isinstance(processes, (int, type(None))) or isinstance(processes, bool) or \
+                processes is not None and processes < 1:
+            return ()
+        prepared = self._prepare_batch()
+        if processes == 1 or len(encoded_texts) < 2:
+            return self._detect_batch(prepared, encoded_texts)
+        # languages are sent to a process once by the initializer, a few chunks per process balance the load
+        chunk_size = -(-len(encoded_texts) // (4 * (processes or os.cpu_count() or 1)))
+        chunks = [encoded_texts[start:start + chunk_size] for start in range(0, len(encoded_texts), chunk_size)]
+        with Pool(processes, initializer=_set_batch_state, initargs=(self._detect_batch, prepared)) as pool:
+            return tuple(result for chunk_results in pool.map(_detect_batch_in_process, chunks)
+                         for result in chunk_results)
+
+
+def _set_batch_state(detect_batch, prepared: tuple):
+    _BATCH_STATE['detect_batch'] = detect_batch
+    _BATCH_STATE['prepared'] = prepared
+
+
+def _detect_batch_in_process(encoded_texts: tuple) -> tuple:
+    return _BATCH_STATE['detect_batch'](_BATCH_STATE['prepared'], encoded_texts)
+
 
 # 10
 class ProbabilityLanguageDetector(LanguageDetector):
 
+    def __init__(self, trie_levels: tuple = (2,), top_k: int = 10):
+        super().__init__(trie_levels, top_k)
+        self.smoothing_counts = {}
+
     @staticmethod
     def _calculate_sentence_probability(n_gram_storage: NGramTrie, sentence_n_grams: tuple) -> float:
         """
@@ -280,3 +772,121 @@ class ProbabilityLanguageDetector(LanguageDetector):
             lang_prob_dict[language_name] = sum(language_prob) / len(language_prob)
 
         return lang_prob_dict
+
+    def _prepare_batch(self) -> tuple:
+        """
+        Collects log-probabilities of all languages into a matrix per level, it is sent to every process once
+        :return: a tuple of language names in the order of columns, a dictionary
+        trie_level: {n_gram: a list of log-probabilities, one per language} and numbers of levels of the languages
+        """
+        language_names = tuple(self.n_gram_storages)
+        log_probability_rows = {}
+        for index, language_name in enumerate(language_names):
+            for trie_level, n_gram_trie in self.n_gram_storages[language_name].items():
+                rows = log_probability_rows.setdefault(trie_level, {})
+                for n_gram, log_probability in n_gram_trie.n_gram_log_probabilities.items():
+                    rows.setdefault(n_gram, [0.0] * len(language_names))[index] = log_probability
+        levels = [len(self.n_gram_storages[language_name]) for language_name in language_names]
+        return language_names, log_probability_rows, levels
+
+    @staticmethod
+    def _detect_batch(prepared: tuple, encoded_texts: tuple) -> tuple:
+        """
+        Finds probabilities for several texts, n-grams of every level are counted in a text once
+        and scored against all languages with one lookup: a row of log-probabilities per n-gram
+        detect_language scores n-grams of one order given by the caller, here n-grams of every level are taken,
+        so a score is the sum over levels of detect_language for n-grams of the level
+        :param prepared: languages prepared by _prepare_batch
+        :param encoded_texts: a tuple of encoded texts
+        :return: a tuple of dictionaries language_name: probability
+        """
+        language_names, log_probability_rows, levels = prepared
+        results = []
+        for encoded_text in encoded_texts:
+            totals = [0.0] * len(language_names)
+            for trie_level, rows in log_probability_rows.items():
+                text_storage = NGramTrie(trie_level)
+                text_storage.count_n_grams(encoded_text)
+                for n_gram, count in text_storage.n_gram_frequencies.items():
+                    if n_gram in rows:
+                        totals = [total + count * log_probability
+                                  for total, log_probability in zip(totals, rows[n_gram])]
+            results.append({language_name: totals[index] / levels[index]
+                            for index, language_name in enumerate(language_names)})
+        return tuple(results)
+
+    def _get_smoothing_levels(self, language_name: str) -> tuple:
+        """
+        Gets counts of n-grams and of their histories of every level of a language from the lowest order
+        Counts of histories are cached for every NGramTrie and found again when a trie or its n_gram_frequencies
+        are replaced
+        :param language_name: a language of n_gram_storages
+        :return: a number of letters of the language with one unknown letter
+        and a list of (size, n_gram_frequencies, a dictionary history: count)
+        """
+        letters = set()
+        levels = []
+        for trie_level in sorted(self.n_gram_storages[language_name]):
+            n_gram_trie = self.n_gram_storages[language_name][trie_level]
+            cached = self.smoothing_counts.get((language_name, trie_level))
+            if cached is None or cached[0] is not n_gram_trie.n_gram_frequencies:
+                history_frequencies = {}
+                for n_gram, frequency in n_gram_trie.n_gram_frequencies.items():
+                    history_frequencies[n_gram[:-1]] = history_frequencies.get(n_gram[:-1], 0) + frequency
+                cached = (n_gram_trie.n_gram_frequencies, history_frequencies,
+                          {letter for n_gram in n_gram_trie.n_gram_frequencies for letter in n_gram})
+                self.smoothing_counts[(language_name, trie_level)] = cached
+            letters.update(cached[2])
+            levels.append((n_gram_trie.size, n_gram_trie.n_gram_frequencies, cached[1]))
+        return len(letters) + 1, levels
+
+    @staticmethod
+    def _calculate_token_log_probability(token: tuple, letters: int, levels: list, smoothing: float) -> float:
+        """
+        Calculates a smoothed log-probability of letters of a token after the first one
+        :param token: a tuple of letter ids
+        :param letters: a number of letters of a language
+        :param levels: a list of (size, n_gram_frequencies, a dictionary history: count) from the lowest order
+        :param smoothing: k of add-k smoothing
+        :return: a log-probability
+        """
+        log_probability = 0.0
+        for ind in range(1, len(token)):
+            probability = 1 / letters
+            for size, n_gram_frequencies, history_frequencies in levels:
+                if size > ind + 1:
+                    break
+                probability = ((n_gram_frequencies.get(token[ind - size + 1:ind + 1], 0) + smoothing * probability) /
+                               (history_frequencies.get(token[ind - size + 1:ind], 0) + smoothing))
+            log_probability += log(probability)
+        return log_probability
+
+    def detect_language_stream(self, encoded_sentences, confidence: float = 0.999, smoothing: float = 1.0) -> dict:
+        """
+        Detects the language of a text read sentence by sentence using smoothed probabilities of letters:
+        P(letter | history) = (count(history + letter) + k * P(letter | shorter history)) / (count(history) + k)
+        over n-grams of trie_levels, a letter after the shortest history gets 1 / the number of letters.
+        Reading stops after a sentence once the posterior probability of one language reaches the confidence,
+        languages are equally probable before the text is read
+        :param encoded_sentences: an encoded text or an iterator of encoded sentences, e.g. from encode_sentences
+        :param confidence: a posterior probability from 0 to 1 to stop at, 1 – the whole text is read
+        :param smoothing: k of add-k smoothing, greater than 0
+        :return: a dictionary language_name: log-probability of the read sentences
+        """
+        if not isinstance(encoded_sentences, (tuple, Iterator)) or not self.n_gram_storages:
+            return {}
+        if not isinstance(confidence, float) or not 0 < confidence <= 1 or \
+                not isinstance(smoothing, (int, float)) or isinstance(smoothing, bool) or smoothing <= 0:
+            return {}
+
+        levels = {language_name: self._get_smoothing_levels(language_name) for language_name in self.n_gram_storages}
+        log_probabilities = dict.fromkeys(levels, 0.0)
+        for sentence in encoded_sentences:
+            for token in sentence:
+                for language_name, (letters, language_levels) in levels.items():
+                    log_probabilities[language_name] += self._calculate_token_log_probability(
+                        tuple(token), letters, language_levels, smoothing)
+            best = max(log_probabilities.values())
+            if confidence < 1 and sum(exp(value - best) for value in log_probabilities.values()) <= 1 / confidence:
+                break
+        return log_probabilities
@@ -4,6 +4,7 @@ Tests for NGramTrie class
 """
 
 import math
+import random
 import unittest
 from lab_3.main import NGramTrie
 
@@ -176,6 +177,20 @@ class BiGramTest(unittest.TestCase):
         self.assertEqual(ngram.n_gram_log_probabilities[(1, 2)], 0.0)
         self.assertEqual(0, actual)
 
+    def test_calculate_log_probabilities_sums_by_prefix(self):
+        ngram = NGramTrie(3)
+        generator = random.Random(41)
+        for _ in range(500):
+            n_gram = tuple(generator.randint(1, 6) for _ in range(3))
+            ngram.n_gram_frequencies[n_gram] = generator.randint(1, 100)
+
+        actual = ngram.calculate_log_probabilities()
+        for n_gram, frequency in ngram.n_gram_frequencies.items():
+            prefix_frequency = sum([other_frequency for other_n_gram, other_frequency in ngram.n_gram_frequencies.items()
+                                    if other_n_gram[:2] == n_gram[:2]])
+            self.assertEqual(math.log(frequency / prefix_frequency), ngram.n_gram_log_probabilities[n_gram])
+        self.assertEqual(0, actual)
+
     def test_calculate_log_probabilities_empty_frequencies(self):
         ngram = NGramTrie(2)
         ngram.n_gram_frequencies = {}
@@ -0,0 +1,58 @@
+# pylint: skip-file
+"""
+Tests for PackedNGramTable class
+"""
+
+import unittest
+from lab_3.main import tokenize_by_sentence
+from lab_3.main import encode_corpus
+from lab_3.main import NGramTrie
+from lab_3.main import LetterStorage
+from lab_3.main import PackedNGramTable
+
+
+class PackedNGramTableTest(unittest.TestCase):
+    """
+    Checks that packed keys give the same frequencies and log-probabilities as tuple keys
+    """
+
+    def test_pack_and_unpack(self):
+        table = PackedNGramTable(3, 30)
+        for n_gram in [(1, 2, 3), (-1, 28, 0), (28, 28, 28), (-1, -1, -1)]:
+            self.assertEqual(n_gram, table.unpack(table.pack(n_gram)))
+        self.assertLess(table.pack((1, 2, 3)), table.pack((1, 2, 4)))
+        self.assertLess(table.pack((1, 28, 28)), table.pack((2, -1, -1)))
+
+    def test_packed_table_equals_n_gram_trie(self):
+        letter_storage = LetterStorage()
+        with open('lab_3/Frank_Baum.txt', encoding='utf-8') as file:
+            text = tokenize_by_sentence(file.read())
+        letter_storage.update(text)
+        n_gram_trie = NGramTrie(5)
+        n_gram_trie.count_n_grams(encode_corpus(letter_storage, text))
+        n_gram_trie.calculate_log_probabilities()
+
+        table = PackedNGramTable(5, len(letter_storage.storage) + 2)
+        self.assertEqual(0, table.fill_from_n_gram_trie(n_gram_trie))
+        self.assertEqual(len(n_gram_trie.n_gram_frequencies), len(table.keys))
+        for n_gram, frequency in n_gram_trie.n_gram_frequencies.items():
+            self.assertEqual(frequency, table.get_frequency(n_gram))
+            self.assertEqual(n_gram_trie.n_gram_log_probabilities[n_gram], table.get_log_probability(n_gram))
+        self.assertEqual(0, table.get_frequency((1, 1, 1, 1, 1)))
+        self.assertEqual(0.0, table.get_log_probability((1, 1, 1, 1, 1)))
+
+    def test_packed_table_incorrect_inputs(self):
+        n_gram_trie = NGramTrie(2)
+        n_gram_trie.n_gram_frequencies = {(1, 2): 3, (1, 40): 1}
+        self.assertEqual(1, PackedNGramTable(2, 30).fill_from_n_gram_trie(n_gram_trie))
+        self.assertEqual(1, PackedNGramTable(3, 50).fill_from_n_gram_trie(n_gram_trie))
+        self.assertEqual(1, PackedNGramTable(2, 1 << 40).fill_from_n_gram_trie(n_gram_trie))
+        self.assertEqual(0, PackedNGramTable(2, 50).fill_from_n_gram_trie(n_gram_trie))
+        table = PackedNGramTable(2, 30)
+        for bad_input in [None, [], (), (1,), (1, 2, 3), (1, 'a'), (1, 30), (1, -2)]:
+            self.assertEqual(-1, table.pack(bad_input))
+            self.assertEqual(0, table.get_frequency(bad_input))
+
+
+if __name__ == "__main__":
+    unittest.main()
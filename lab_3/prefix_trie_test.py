@@ -0,0 +1,64 @@
+# pylint: skip-file
+"""
+Tests for PrefixTrie class
+"""
+
+import unittest
+from lab_3.main import tokenize_by_sentence
+from lab_3.main import encode_corpus
+from lab_3.main import NGramTrie
+from lab_3.main import LetterStorage
+from lab_3.main import PrefixTrie
+
+
+class PrefixTrieTest(unittest.TestCase):
+    """
+    Checks that PrefixTrie counts n-grams of every order as NGramTrie does
+    """
+
+    def setUp(self):
+        with open('lab_3/Frank_Baum.txt', encoding='utf-8') as file:
+            text = tokenize_by_sentence(file.read()[:20000])
+        letter_storage = LetterStorage()
+        letter_storage.update(text)
+        self.encoded_text = encode_corpus(letter_storage, text)
+
+    def test_prefix_trie_equals_n_gram_tries(self):
+        prefix_trie = PrefixTrie(5)
+        self.assertEqual(0, prefix_trie.fill(self.encoded_text))
+        for size in range(1, 6):
+            expected = NGramTrie(size)
+            expected.fill_n_grams(self.encoded_text)
+            expected.calculate_n_grams_frequencies()
+            expected.calculate_log_probabilities()
+            actual = prefix_trie.to_n_gram_trie(size)
+            self.assertEqual(list(expected.n_gram_frequencies.items()), list(actual.n_gram_frequencies.items()))
+            self.assertEqual(expected.n_gram_log_probabilities, actual.n_gram_log_probabilities)
+            self.assertEqual(expected.top_n_grams(100), actual.top_n_grams(100))
+
+    def test_prefix_trie_get_frequency(self):
+        prefix_trie = PrefixTrie(3)
+        prefix_trie.fill((((1, 2, 3, 2, 3), (2, 3, -1)),))
+        self.assertEqual(3, prefix_trie.get_frequency((2, 3)))
+        self.assertEqual(3, prefix_trie.get_frequency((3,)))
+        self.assertEqual(1, prefix_trie.get_frequency((2, 3, -1)))
+        self.assertEqual(0, prefix_trie.get_frequency((1, 2, 3, 2)))
+        self.assertEqual(0, prefix_trie.get_frequency((3, 1)))
+        self.assertEqual({(1, 2, 3): 1, (2, 3, 2): 1, (3, 2, 3): 1, (2, 3, -1): 1},
+                         prefix_trie.get_n_gram_frequencies(3))
+
+    def test_prefix_trie_incorrect_inputs(self):
+        prefix_trie = PrefixTrie(3)
+        bad_inputs = [[], {}, '', 123, None, True, (None,), ((('a', 'b'),),), (((1, 2.0),),)]
+        for bad_input in bad_inputs:
+            self.assertEqual(1, prefix_trie.fill(bad_input))
+        for bad_input in [[], (), 'ab', None, (1, 'a')]:
+            self.assertEqual(0, prefix_trie.get_frequency(bad_input))
+        for bad_input in [0, 4, None, 2.0]:
+            self.assertEqual({}, prefix_trie.get_n_gram_frequencies(bad_input))
+            self.assertEqual({}, prefix_trie.to_n_gram_trie(bad_input).n_gram_frequencies)
+        self.assertEqual(1, PrefixTrie(0).fill((((1, 2),),)))
+
+
+if __name__ == "__main__":
+    unittest.main()
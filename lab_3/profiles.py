@@ -0,0 +1,220 @@
+"""
+Language profiles saved to one binary file and loaded without training
+A file of profiles is:
+    a header struct '<8sII' – the magic bytes, the version of the format and the length of the JSON header,
+    a JSON header – letters with their ids and for every language and level the size, the base and offsets of arrays,
+    arrays of every level aligned to 8 bytes, little-endian – sorted packed n-grams (uint64), their counts (uint64),
+    log-probabilities (float64) and indexes of n-grams from the most frequent one (uint64)
+Arrays of a lazily loaded profile are read from the mapped file when they are needed
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+
+from lab_3.main import LetterStorage, NGramTrie, PackedNGramTable, LanguageDetector
+
+PROFILE_MAGIC = b'LAB3PROF'
+PROFILE_VERSION = 1
+_HEADER = struct.Struct('<8sII')
+
+
+class PackedNGramMapping(Mapping):
+    """
+    A read-only dictionary n_gram: value over a PackedNGramTable, n-grams are iterated from the most frequent one
+    """
+
+    def __init__(self, table: PackedNGramTable, values, order):
+        self.table = table
+        self.values = values
+        self.order = order
+
+    def __getitem__(self, n_gram):
+        index = self.table._find_index(n_gram)  # pylint: disable=protected-access
+        if index == -1:
+            raise KeyError(n_gram)
+        return self.values[index]
+
+    def __iter__(self):
+        return (self.table.unpack(self.table.keys[index]) for index in self.order)
+
+    def __len__(self):
+        return len(self.order)
+
+
+class MappedNGramTrie(NGramTrie):  # pylint: disable=too-few-public-methods
+    """
+    An NGramTrie of a lazily loaded profile, frequencies and log-probabilities are looked up in a PackedNGramTable
+    """
+
+    def __init__(self, table: PackedNGramTable, order):
+        super().__init__(table.size)
+        self.table = table
+        self.order = order
+        self.n_gram_frequencies = PackedNGramMapping(table, table.counts, order)
+        self.n_gram_log_probabilities = PackedNGramMapping(table, table.log_probabilities, order)
+
+    def top_n_grams(self, k: int) -> tuple:
+        """
+        Gets k most common n-grams from the saved order without sorting
+        :return: a tuple with k most common n-grams
+        """
+        if not isinstance(k, int) or k < 0 or not self.order:
+            return ()
+        return tuple(self.table.unpack(self.table.keys[index]) for index in self.order[:k])
+
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pack_n_gram_trie(n_gram_trie: NGramTrie, base: int) -> tuple:
+    """
+    Packs an NGramTrie with the order of its top n-grams
+    :return: bytes of sorted packed n-grams, counts, log-probabilities and indexes from the most frequent n-gram,
+    an empty tuple if n-grams do not fit into 64 bits
+    """
+    table = PackedNGramTable(n_gram_trie.size, base)
+    if table.fill_from_n_gram_trie(n_gram_trie):
+        return ()
+    indexes = {key: index for index, key in enumerate(table.keys)}
+    order = array('Q', [indexes[table.pack(n_gram)]
+                        for n_gram in n_gram_trie.top_n_grams(len(n_gram_trie.n_gram_frequencies))])
+    return tuple(_to_bytes(values) for values in (table.keys, table.counts, table.log_probabilities, order))
+
+
+def save_profiles(path_to_file: str, letter_storage: LetterStorage, language_detector: LanguageDetector) -> int:
+    """
+    Saves letters and n-grams of all languages of a detector
+    :param path_to_file: a path
+    :param letter_storage: an instance of the LetterStorage class the languages are encoded with
+    :param language_detector: an instance of the LanguageDetector class with languages
+    :return: 0 if succeeds, 1 if not
+    """
+    if not isinstance(path_to_file, str) or not isinstance(letter_storage, LetterStorage) or \
+            not isinstance(language_detector, LanguageDetector):
+        return 1
+    # letter ids from -1 to base - 2 are digits of packed n-grams
+    base = max((letter for storages in language_detector.n_gram_storages.values()
+                for n_gram_trie in storages.values() for n_gram in n_gram_trie.n_gram_frequencies
+                for letter in n_gram), default=0)
+    base = max(base, *letter_storage.storage.values(), 0) + 2
+    header = {'letters': list(letter_storage.storage.items()), 'languages': {}}
+    blocks = []
+    for language_name, storages in language_detector.n_gram_storages.items():
+        header['languages'][language_name] = {}
+        for trie_level, n_gram_trie in storages.items():
+            level_blocks = _pack_n_gram_trie(n_gram_trie, base)
+            if not level_blocks:
+                return 1
+            header['languages'][language_name][trie_level] = {'size': n_gram_trie.size, 'base': base,
+                                                              'length': len(level_blocks[0]) // 8,
+                                                              'offset': sum(map(len, blocks))}
+            blocks.extend(level_blocks)
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_bytes += b' ' * (-(_HEADER.size + len(header_bytes)) % 8)
+    with open(path_to_file, 'wb') as file:
+        file.write(_HEADER.pack(PROFILE_MAGIC, PROFILE_VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for block in blocks:
+            file.write(block)
+    return 0
+
+
+def _read_n_gram_trie(data, start: int, level: dict, lazy: bool) -> NGramTrie:
+    """
+    Reads arrays of one level from bytes or a memoryview of the file
+    :param data: bytes or a memoryview of the file
+    :param start: the offset of the arrays of the level
+    :param level: a dictionary of the level from the header
+    :param lazy: True – a MappedNGramTrie is created over the memoryview, False – an NGramTrie is filled
+    :return: an instance of the NGramTrie class
+    """
+    table = PackedNGramTable(level['size'], level['base'])
+    end = 8 * level['length']
+    sections = [data[start + end * number:start + end * (number + 1)] for number in range(4)]
+    if isinstance(data, memoryview):
+        table.keys, table.counts, table.log_probabilities, order = (
+            section.cast(typecode) for typecode, section in zip('QQdQ', sections))
+    else:
+        table.keys, table.counts, table.log_probabilities, order = (
+            array(typecode, section) for typecode, section in zip('QQdQ', sections))
+        if sys.byteorder != 'little':
+            for values in (table.keys, table.counts, table.log_probabilities, order):
+                values.byteswap()
+    if lazy:
+        return MappedNGramTrie(table, order)
+    n_gram_trie = NGramTrie(level['size'])
+    for index in order:
+        n_gram = table.unpack(table.keys[index])
+        n_gram_trie.n_gram_frequencies[n_gram] = table.counts[index]
+        n_gram_trie.n_gram_log_probabilities[n_gram] = table.log_probabilities[index]
+    return n_gram_trie
+
+
+def _read_header(data) -> dict:
+    """
+    Checks the magic bytes and the version and reads the JSON header
+    :return: the header with the offset of arrays as 'start', an empty dictionary for a file of another format
+    """
+    if len(data) < _HEADER.size:
+        return {}
+    magic, version, header_length = _HEADER.unpack_from(data)
+    if magic != PROFILE_MAGIC or version != PROFILE_VERSION or len(data) < _HEADER.size + header_length:
+        return {}
+    try:
+        header = json.loads(bytes(data[_HEADER.size:_HEADER.size + header_length]).decode('utf-8'))
+    except ValueError:
+        return {}
+    header['start'] = _HEADER.size + header_length
+    return header
+
+
+def load_profiles(path_to_file: str, letter_storage: LetterStorage, language_detector: LanguageDetector,
+                  lazy: bool = False) -> int:
+    """
+    Loads saved languages into a detector and their letters into a storage
+    Letters already in the storage must have the saved ids, new texts are encoded with the filled storage
+    :param path_to_file: a path
+    :param letter_storage: an instance of the LetterStorage class
+    :param language_detector: an instance of LanguageDetector or ProbabilityLanguageDetector
+    :param lazy: True – the file is mapped into memory and n-grams are looked up in it, False – NGramTries are built
+    :return: 0 if succeeds, 1 if not
+    """
+    if not isinstance(path_to_file, str) or not isinstance(letter_storage, LetterStorage) or \
+            not isinstance(language_detector, LanguageDetector) or not isinstance(lazy, bool):
+        return 1
+    try:
+        with open(path_to_file, 'rb') as file:
+            # a memoryview of a little-endian file is used as it is, other machines read copies of arrays
+            if lazy and sys.byteorder == 'little':
+                data = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                data = file.read()
+    except (OSError, ValueError):
+        return 1
+    header = _read_header(data)
+    if not header:
+        return 1
+
+    languages = {}
+    for language_name, levels in header['languages'].items():
+        languages[language_name] = {}
+        for trie_level, level in levels.items():
+            if header['start'] + level['offset'] + 32 * level['length'] > len(data):
+                return 1
+            languages[language_name][int(trie_level)] = _read_n_gram_trie(data, header['start'] + level['offset'],
+                                                                          level, lazy)
+    for letter, letter_id in header['letters']:
+        letter_storage._put_letter(letter)  # pylint: disable=protected-access
+        if letter_storage.get_id_by_letter(letter) != letter_id:
+            return 1
+    for language_name, storages in languages.items():
+        language_detector.n_gram_storages[language_name] = storages
+        language_detector.top_n_gram_ranks.pop(language_name, None)
+    return 0
@@ -0,0 +1,121 @@
+# pylint: skip-file
+"""
+Tests for saved language profiles
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+from lab_3.main import tokenize_by_sentence
+from lab_3.main import encode_corpus
+from lab_3.main import NGramTrie
+from lab_3.main import LetterStorage
+from lab_3.main import LanguageDetector
+from lab_3.main import ProbabilityLanguageDetector
+from lab_3.profiles import save_profiles
+from lab_3.profiles import load_profiles
+from lab_3.profiles import MappedNGramTrie
+from lab_3.profiles import PROFILE_MAGIC
+
+
+class ProfilesTest(unittest.TestCase):
+    """
+    Checks that loaded profiles detect languages as the trained ones
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.letter_storage = LetterStorage()
+        texts = {}
+        for name, path in (('english', 'lab_3/Frank_Baum.txt'), ('german', 'lab_3/Thomas_Mann.txt'),
+                           ('unknown', 'lab_3/unknown_Arthur_Conan_Doyle.txt')):
+            with open(path, encoding='utf-8') as file:
+                texts[name] = tokenize_by_sentence(file.read())
+            cls.letter_storage.update(texts[name])
+        cls.encoded_texts = {name: encode_corpus(cls.letter_storage, text) for name, text in texts.items()}
+        cls.language_detector = ProbabilityLanguageDetector((3, 4, 5), 1000)
+        cls.language_detector.new_language(cls.encoded_texts['english'], 'english')
+        cls.language_detector.new_language(cls.encoded_texts['german'], 'german')
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'profiles.bin')
+        self.assertEqual(0, save_profiles(self.path, self.letter_storage, self.language_detector))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_load_profiles_equals_trained(self):
+        for lazy in (False, True):
+            letter_storage = LetterStorage()
+            language_detector = ProbabilityLanguageDetector((3, 4, 5), 1000)
+            self.assertEqual(0, load_profiles(self.path, letter_storage, language_detector, lazy))
+            self.assertEqual(self.letter_storage.storage, letter_storage.storage)
+            for name, storages in self.language_detector.n_gram_storages.items():
+                self.assertEqual(set(storages), set(language_detector.n_gram_storages[name]))
+                for trie_level, expected in storages.items():
+                    actual = language_detector.n_gram_storages[name][trie_level]
+                    self.assertEqual(lazy, isinstance(actual, MappedNGramTrie))
+                    self.assertEqual(expected.n_gram_frequencies, dict(actual.n_gram_frequencies))
+                    self.assertEqual(expected.n_gram_log_probabilities, dict(actual.n_gram_log_probabilities))
+                    self.assertEqual(expected.top_n_grams(1000), actual.top_n_grams(1000))
+
+    def test_loaded_profiles_detect_language(self):
+        unknown_n_grams = NGramTrie(4)
+        unknown_n_grams.fill_n_grams(self.encoded_texts['unknown'])
+        expected = self.language_detector.detect_language(unknown_n_grams.n_grams)
+        for lazy in (False, True):
+            language_detector = ProbabilityLanguageDetector((3, 4, 5), 1000)
+            load_profiles(self.path, LetterStorage(), language_detector, lazy)
+            self.assertEqual(expected, language_detector.detect_language(unknown_n_grams.n_grams))
+
+            distance_detector = LanguageDetector((3, 4, 5), 100)
+            load_profiles(self.path, LetterStorage(), distance_detector, lazy)
+            expected_distances = LanguageDetector((3, 4, 5), 100)
+            expected_distances.n_gram_storages = self.language_detector.n_gram_storages
+            self.assertEqual(expected_distances.detect_language(self.encoded_texts['unknown']),
+                             distance_detector.detect_language(self.encoded_texts['unknown']))
+
+    def test_load_profiles_replaces_cached_ranks(self):
+        language_detector = LanguageDetector((3,), 10)
+        language_detector.new_language((((1, 2, 3, 4),),), 'english')
+        self.assertEqual(0, load_profiles(self.path, LetterStorage(), language_detector))
+        expected = self.language_detector.n_gram_storages['english'][3].top_n_grams(10)
+        language_detector.detect_language(self.encoded_texts['unknown'])
+        self.assertEqual(expected, language_detector.top_n_grams['english'][3])
+
+    def test_load_profiles_other_format(self):
+        with open(self.path, 'r+b') as file:
+            file.write(struct.pack('<8sI', PROFILE_MAGIC, 2))
+        self.assertEqual(1, load_profiles(self.path, LetterStorage(), LanguageDetector()))
+        with open(self.path, 'wb') as file:
+            file.write(b'not a profile')
+        for lazy in (False, True):
+            self.assertEqual(1, load_profiles(self.path, LetterStorage(), LanguageDetector(), lazy))
+        self.assertEqual(1, load_profiles(os.path.join(self.directory, 'missing.bin'), LetterStorage(),
+                                          LanguageDetector()))
+
+    def test_load_profiles_truncated_file(self):
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) // 2)
+        language_detector = LanguageDetector()
+        self.assertEqual(1, load_profiles(self.path, LetterStorage(), language_detector, True))
+        self.assertEqual({}, language_detector.n_gram_storages)
+
+    def test_load_profiles_different_letter_ids(self):
+        letter_storage = LetterStorage()
+        letter_storage.update(((('я',),),))
+        self.assertEqual(1, load_profiles(self.path, letter_storage, LanguageDetector()))
+
+    def test_profiles_incorrect_inputs(self):
+        bad_inputs = [None, 123, [], {}, ()]
+        for bad_input in bad_inputs:
+            self.assertEqual(1, save_profiles(bad_input, self.letter_storage, self.language_detector))
+            self.assertEqual(1, save_profiles(self.path, bad_input, self.language_detector))
+            self.assertEqual(1, save_profiles(self.path, self.letter_storage, bad_input))
+            self.assertEqual(1, load_profiles(bad_input, LetterStorage(), LanguageDetector()))
+            self.assertEqual(1, load_profiles(self.path, bad_input, LanguageDetector()))
+            self.assertEqual(1, load_profiles(self.path, LetterStorage(), bad_input))
+            self.assertEqual(1, load_profiles(self.path, LetterStorage(), LanguageDetector(), bad_input))
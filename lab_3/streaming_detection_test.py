@@ -0,0 +1,93 @@
+# pylint: skip-file
+"""
+Tests for the smoothed streaming detection of languages
+"""
+
+import unittest
+from math import exp
+from lab_3.main import tokenize_by_sentence
+from lab_3.main import encode_corpus
+from lab_3.main import NGramTrie
+from lab_3.main import LetterStorage
+from lab_3.main import ProbabilityLanguageDetector
+
+
+class StreamingDetectionTest(unittest.TestCase):
+    """
+    Checks smoothed probabilities and early stopping of detect_language_stream
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        letter_storage = LetterStorage()
+        texts = {}
+        for name, path in (('english', 'lab_3/Frank_Baum.txt'), ('german', 'lab_3/Thomas_Mann.txt'),
+                           ('unknown', 'lab_3/unknown_Arthur_Conan_Doyle.txt')):
+            with open(path, encoding='utf-8') as file:
+                texts[name] = tokenize_by_sentence(file.read())
+            letter_storage.update(texts[name])
+        cls.encoded_texts = {name: encode_corpus(letter_storage, text) for name, text in texts.items()}
+        cls.language_detector = ProbabilityLanguageDetector((2, 3, 4), 100)
+        cls.language_detector.new_language(cls.encoded_texts['english'], 'english')
+        cls.language_detector.new_language(cls.encoded_texts['german'], 'german')
+
+    def test_smoothed_probabilities_sum_to_one(self):
+        language_detector = ProbabilityLanguageDetector((1, 2), 10)
+        language_detector.new_language((((1, 2, 3, 2, 1),), ((1, 3, 3, 2),)), 'first')
+        letters, levels = language_detector._get_smoothing_levels('first')
+        self.assertEqual(4, letters)
+        for history in (1, 2, 3, 7):
+            total = sum(exp(language_detector._calculate_token_log_probability((history, letter), letters, levels,
+                                                                               0.5))
+                        for letter in (1, 2, 3, -1))
+            self.assertAlmostEqual(1.0, total)
+
+    def test_detect_language_stream_whole_text(self):
+        expected = {'english': 0.0, 'german': 0.0}
+        for sentence in self.encoded_texts['unknown'][:30]:
+            for name, log_probability in self.language_detector.detect_language_stream((sentence,), 1.0).items():
+                expected[name] += log_probability
+        actual = self.language_detector.detect_language_stream(iter(self.encoded_texts['unknown'][:30]), 1.0)
+        for name in expected:
+            self.assertAlmostEqual(expected[name], actual[name], places=6)
+        self.assertTrue(actual['english'] > actual['german'])
+
+    def test_detect_language_stream_stops_early(self):
+        for name in ('english', 'german'):
+            sentences = iter(self.encoded_texts['unknown' if name == 'english' else 'german'])
+            actual = self.language_detector.detect_language_stream(sentences, 0.999)
+            self.assertEqual(name, max(actual, key=actual.get))
+            self.assertTrue(next(sentences, None))
+
+    def test_detect_language_stream_replaced_storage(self):
+        language_detector = ProbabilityLanguageDetector((2,), 10)
+        language_detector.new_language((((1, 2, 1, 2),),), 'first')
+        before = language_detector.detect_language_stream((((1, 2),),), 1.0)
+        n_gram_trie = NGramTrie(2)
+        n_gram_trie.n_gram_frequencies = {(1, 3): 3}
+        language_detector.n_gram_storages['first'] = {2: n_gram_trie}
+        after = language_detector.detect_language_stream((((1, 2),),), 1.0)
+        self.assertTrue(before['first'] > after['first'])
+
+    def test_detect_language_stream_replaced_frequencies(self):
+        language_detector = ProbabilityLanguageDetector((2,), 10)
+        language_detector.new_language((((1, 2, 1, 2),),), 'first')
+        before = language_detector.detect_language_stream((((1, 2),),), 1.0)
+        language_detector.n_gram_storages['first'][2].n_gram_frequencies = {(1, 3): 3}
+        after = language_detector.detect_language_stream((((1, 2),),), 1.0)
+        expected = ProbabilityLanguageDetector((2,), 10)
+        expected.n_gram_storages['first'] = language_detector.n_gram_storages['first']
+        self.assertTrue(before['first'] > after['first'])
+        self.assertAlmostEqual(expected.detect_language_stream((((1, 2),),), 1.0)['first'], after['first'])
+
+    def test_detect_language_stream_incorrect_inputs(self):
+        bad_inputs = [None, 123, 'text', [], {}]
+        for bad_input in bad_inputs:
+            self.assertEqual({}, self.language_detector.detect_language_stream(bad_input))
+        for bad_confidence in (0.0, -0.5, 1.5, 1, None, 'high'):
+            self.assertEqual({}, self.language_detector.detect_language_stream(self.encoded_texts['unknown'],
+                                                                               bad_confidence))
+        for bad_smoothing in (0, -1.0, None, True, '1'):
+            self.assertEqual({}, self.language_detector.detect_language_stream(self.encoded_texts['unknown'],
+                                                                               0.9, bad_smoothing))
+        self.assertEqual({}, ProbabilityLanguageDetector((2,), 10).detect_language_stream(((),)))
@@ -0,0 +1,88 @@
+# pylint: skip-file
+"""
+Tests for streaming extraction of n-grams
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from lab_3.main import tokenize_by_sentence
+from lab_3.main import iterate_sentences
+from lab_3.main import encode_corpus
+from lab_3.main import encode_sentences
+from lab_3.main import NGramTrie
+from lab_3.main import LetterStorage
+from lab_3.main import LanguageDetector
+
+
+class StreamingNGramsTest(unittest.TestCase):
+    """
+    Checks that n-grams counted from a stream of sentences equal the ones of the whole text
+    """
+
+    def test_iterate_sentences_equals_tokenize_by_sentence(self):
+        with open('lab_3/Frank_Baum.txt', encoding='utf-8') as file:
+            expected = tokenize_by_sentence(file.read())
+        for chunk_size in (1, 7, 1000, 1 << 16):
+            self.assertEqual(expected, tuple(iterate_sentences('lab_3/Frank_Baum.txt', chunk_size)))
+
+    def test_iterate_sentences_without_sentence_ends(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'text.txt')
+        try:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write('the cat\nsleeps ' * 20000)
+            expected = tokenize_by_sentence('the cat\nsleeps ' * 20000)
+            actual = tuple(iterate_sentences(path, 1000, 10000))
+            self.assertTrue(len(actual) > 20)
+            self.assertTrue(all(len(sentence) <= 3000 for sentence in actual))
+            self.assertEqual(expected[0], tuple(token for sentence in actual for token in sentence))
+            self.assertEqual(expected, tuple(iterate_sentences(path, 1000)))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_count_n_grams_from_generator(self):
+        letter_storage = LetterStorage()
+        with open('lab_3/Frank_Baum.txt', encoding='utf-8') as file:
+            text = tokenize_by_sentence(file.read())
+        letter_storage.update(text)
+        expected = NGramTrie(3)
+        expected.fill_n_grams(encode_corpus(letter_storage, text))
+        expected.calculate_n_grams_frequencies()
+
+        actual = NGramTrie(3)
+        self.assertEqual(0, actual.count_n_grams(encode_sentences(letter_storage,
+                                                                  iterate_sentences('lab_3/Frank_Baum.txt'))))
+        self.assertEqual(expected.n_gram_frequencies, actual.n_gram_frequencies)
+        self.assertEqual((), actual.n_grams)
+
+    def test_encode_sentences_fills_storage(self):
+        letter_storage = LetterStorage()
+        sentences = ((('_', 'a', 'b', '_'),), (('_', 'c', 'a', '_'),))
+        self.assertEqual([((1, 2, 3, 1),), ((1, 4, 2, 1),)], list(encode_sentences(letter_storage, sentences)))
+
+    def test_new_language_from_generator(self):
+        letter_storage = LetterStorage()
+        with open('lab_3/Frank_Baum.txt', encoding='utf-8') as file:
+            text = tokenize_by_sentence(file.read())
+        letter_storage.update(text)
+        expected = LanguageDetector((2, 3), 10)
+        expected.new_language(encode_corpus(letter_storage, text), 'english')
+        actual = LanguageDetector((2, 3), 10)
+        self.assertEqual(0, actual.new_language(encode_sentences(letter_storage,
+                                                                 iterate_sentences('lab_3/Frank_Baum.txt')),
+                                                'english'))
+        for trie_level in (2, 3):
+            self.assertEqual(expected.n_gram_storages['english'][trie_level].n_gram_log_probabilities,
+                             actual.n_gram_storages['english'][trie_level].n_gram_log_probabilities)
+
+    def test_count_n_grams_incorrect_input(self):
+        n_gram_trie = NGramTrie(2)
+        for bad_input in [[], {}, '', 123, None, True]:
+            self.assertEqual(1, n_gram_trie.count_n_grams(bad_input))
+        self.assertEqual({}, n_gram_trie.n_gram_frequencies)
+
+
+if __name__ == "__main__":
+    unittest.main()
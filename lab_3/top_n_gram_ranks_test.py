@@ -0,0 +1,102 @@
+# pylint: skip-file
+"""
+Tests for cached ranks of top n-grams of languages
+"""
+
+import random
+import unittest
+from lab_3.main import tokenize_by_sentence
+from lab_3.main import encode_corpus
+from lab_3.main import NGramTrie
+from lab_3.main import LetterStorage
+from lab_3.main import LanguageDetector
+
+
+def calculate_distance_by_index(first_n_grams: tuple, second_n_grams: tuple) -> int:
+    total_distance = 0
+    for ind, n_gram in enumerate(first_n_grams):
+        if n_gram in second_n_grams:
+            total_distance += abs(second_n_grams.index(n_gram) - ind)
+        else:
+            total_distance += len(second_n_grams)
+    return total_distance
+
+
+class TopNGramRanksTest(unittest.TestCase):
+    """
+    Checks the distance by ranks and the ranks cached by new_language
+    """
+
+    def test_calculate_distance_by_ranks_equals_by_index(self):
+        generator = random.Random(7)
+        for _ in range(200):
+            first_n_grams = tuple((number,) for number in generator.sample(range(30), generator.randint(0, 15)))
+            second_n_grams = tuple((generator.choice(range(30)),) for _ in range(generator.randint(0, 15)))
+            first_ranks = {n_gram: rank for rank, n_gram in enumerate(first_n_grams)}
+            expected = calculate_distance_by_index(first_n_grams, second_n_grams)
+            self.assertEqual(expected, LanguageDetector._calculate_distance(first_n_grams, second_n_grams))
+            self.assertEqual(expected, LanguageDetector._calculate_distance(first_n_grams, second_n_grams,
+                                                                            first_ranks))
+
+    def test_calculate_distance_repeated_n_grams(self):
+        first_n_grams = ((1, 2), (3, 4), (1, 2))
+        second_n_grams = ((3, 4), (1, 2), (3, 4))
+        self.assertEqual(calculate_distance_by_index(first_n_grams, second_n_grams),
+                         LanguageDetector._calculate_distance(first_n_grams, second_n_grams))
+
+    def test_new_language_caches_ranks(self):
+        letter_storage = LetterStorage()
+        with open('lab_3/Frank_Baum.txt', encoding='utf-8') as file:
+            text = tokenize_by_sentence(file.read())
+        letter_storage.update(text)
+        language_detector = LanguageDetector((2, 3), 50)
+        language_detector.new_language(encode_corpus(letter_storage, text), 'english')
+
+        for trie_level, n_gram_trie in language_detector.n_gram_storages['english'].items():
+            top_n_grams = n_gram_trie.top_n_grams(50)
+            self.assertEqual(top_n_grams, language_detector.top_n_grams['english'][trie_level])
+            self.assertEqual({n_gram: rank for rank, n_gram in enumerate(top_n_grams)},
+                             language_detector.top_n_gram_ranks['english'][trie_level])
+
+    def test_detect_language_ranks_storages_put_directly(self):
+        n_gram_trie = NGramTrie(2)
+        n_gram_trie.fill_n_grams((((1, 2, 3, 1, 2),),))
+        n_gram_trie.calculate_n_grams_frequencies()
+        language_detector = LanguageDetector((2,), 2)
+        language_detector.n_gram_storages['first'] = {2: n_gram_trie}
+
+        text_to_detect = (((2, 3, 1, 2),),)
+        text_storage = NGramTrie(2)
+        text_storage.count_n_grams(text_to_detect)
+        expected = calculate_distance_by_index(n_gram_trie.top_n_grams(2), text_storage.top_n_grams(2))
+        self.assertEqual({'first': expected}, language_detector.detect_language(text_to_detect))
+        self.assertEqual({2: {(1, 2): 0, (2, 3): 1}}, language_detector.top_n_gram_ranks['first'])
+
+    def test_detect_language_ranks_again_after_changes(self):
+        language_detector = LanguageDetector((2,), 1)
+        language_detector.new_language((((1, 2, 1, 2, 3),),), 'first')
+        text_to_detect = (((2, 3, 2, 3),),)
+        self.assertEqual({'first': 1.0}, language_detector.detect_language(text_to_detect))
+
+        language_detector.top_k = 3
+        text_storage = NGramTrie(2)
+        text_storage.count_n_grams(text_to_detect)
+        top_n_grams = language_detector.n_gram_storages['first'][2].top_n_grams(3)
+        expected = calculate_distance_by_index(top_n_grams, text_storage.top_n_grams(3))
+        self.assertEqual({'first': expected}, language_detector.detect_language(text_to_detect))
+        self.assertEqual(top_n_grams, language_detector.top_n_grams['first'][2])
+
+        n_gram_trie = NGramTrie(2)
+        n_gram_trie.count_n_grams(text_to_detect)
+        language_detector.n_gram_storages['first'][2] = n_gram_trie
+        self.assertEqual({'first': 0.0}, language_detector.detect_language(text_to_detect))
+        self.assertEqual(({'first': 0.0},), language_detector.detect_languages((text_to_detect,)))
+
+    def test_detect_language_ranks_again_after_frequencies_replaced(self):
+        language_detector = LanguageDetector((2,), 10)
+        language_detector.new_language((((1, 2, 3, 1, 2),),), 'first')
+        language_detector.n_gram_storages['first'][2].n_gram_frequencies = {(7, 8): 10, (8, 9): 5}
+        expected = LanguageDetector((2,), 10)
+        expected.n_gram_storages['first'] = language_detector.n_gram_storages['first']
+        self.assertEqual({'first': 0.0}, expected.detect_language((((7, 8, 9),),)))
+        self.assertEqual({'first': 0.0}, language_detector.detect_language((((7, 8, 9),),)))